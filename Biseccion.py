@@ -7,100 +7,52 @@ from datetime import datetime
 import random
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-import re
-
-def insert_implicit_multiplication(func_str):
-    """
-    Inserta multiplicaciones implícitas en la cadena de la función.
-    Por ejemplo, convierte '3x' en '3*x' y 'x sin(x)' en 'x*sin(x)'.
-    """
-    # Insertar '*' entre un número y una variable o función (e.g., 3x -> 3*x)
-    func_str = re.sub(r'(\d)([a-zA-Z\(])', r'\1*\2', func_str)
-    # Insertar '*' entre una variable o cierre de paréntesis y una variable o función (e.g., x sin(x) -> x*sin(x))
-    func_str = re.sub(r'([a-zA-Z\)])([a-zA-Z\(])', r'\1*\2', func_str)
-    return func_str
-
-def translate_function(func_str):
-    """
-    Traduce las funciones matemáticas ingresadas por el usuario a las correspondientes
-    funciones del módulo math de Python. También maneja exponentes y multiplicaciones implícitas.
-    """
-    func_mappings = {
-        'sen': 'math.sin',
-        'cos': 'math.cos',
-        'tan': 'math.tan',
-        'asin': 'math.asin',
-        'acos': 'math.acos',
-        'atan': 'math.atan',
-        'exp': 'math.exp',
-        'log': 'math.log',
-        'raiz': 'math.sqrt',
-        # Puedes agregar más funciones si es necesario
-    }
-
-    # Reemplazar las funciones usando expresiones regulares
-    for func, math_func in func_mappings.items():
-        # Buscar la función seguida de un paréntesis
-        pattern = r'\b' + re.escape(func) + r'\s*\('
-        replacement = math_func + '('
-        func_str = re.sub(pattern, replacement, func_str, flags=re.IGNORECASE)
-
-    # Reemplazar '^' por '**' para exponentes
-    func_str = func_str.replace('^', '**')
-
-    # Insertar multiplicaciones implícitas
-    func_str = insert_implicit_multiplication(func_str)
-
-    return func_str
+from function_evaluator import compile_function, sample_function
+from expression_parser import expression_hash
+from root_scan import polish_brackets, scan_brackets
+from adaptive_precision import compile_adaptive_function
+from iteration_trace import BISECTION_COLUMNS, IterationTrace, encode_trace
+from solver_stream import CancellationToken, is_cancelled, run_steps, stream_to_tk
+from convergence import ConvergenceMonitor, monitored_steps
 
 def evaluate_function(func_str, x):
     """
     Evalúa la función proporcionada como string en el punto x después de traducirla.
     """
-    try:
-        # Traduce la función ingresada
-        translated_func = translate_function(func_str)
-        # Define un entorno seguro para la evaluación
-        allowed_names = {"x": x, "math": math, "np": np}
-        return eval(translated_func, {"__builtins__": None}, allowed_names)
-    except Exception as e:
-        raise ValueError(f"Error al evaluar la función: {e}")
-
-def bisection_method(func_str, a, b, tol, max_iter=100):
+    return compile_function(func_str)(x)
+
+def bisection_steps(func_str, a, b, tol, max_iter=100, adaptive=False, token=None):
     """
-    Implementa el método de bisección para encontrar la raíz de una función.
-    Retorna la raíz, el número de iteraciones y un historial de las iteraciones.
+    Generador del método de bisección: produce una tupla por iteración (columnas de
+    BISECTION_COLUMNS) y termina devolviendo la raíz como valor de StopIteration.
+    Si el token de cancelación se activa, termina sin raíz (None).
+    Con adaptive=True los puntos donde el signo de f no es confiable en float64 se
+    reevalúan con mayor precisión.
     """
-    fa = evaluate_function(func_str, a)
-    fb = evaluate_function(func_str, b)
+    f = compile_adaptive_function(func_str) if adaptive else compile_function(func_str)
+    fa = f(a)
+    fb = f(b)
 
     if fa * fb > 0:
         raise ValueError("La función debe tener signos opuestos en los extremos del intervalo.")
 
-    history = []
     xr_prev = None
 
     for iteration in range(1, max_iter + 1):
+        if is_cancelled(token):
+            return None
         c = (a + b) / 2
-        fc = evaluate_function(func_str, c)
+        fc = f(c)
 
         if xr_prev is not None:
             relative_error = abs((c - xr_prev) / c) * 100
         else:
             relative_error = None
 
-        history.append({
-            'iteration': iteration,
-            'a': a,
-            'b': b,
-            'c': c,
-            'f(c)': fc,
-            'relative_error': relative_error
-        })
+        yield iteration, a, b, c, fc, relative_error
 
         if fc == 0 or (b - a) / 2 < tol or (relative_error is not None and relative_error < tol):
-            return c, iteration, history
+            return c
 
         if fa * fc < 0:
             b = c
@@ -113,6 +65,20 @@ def bisection_method(func_str, a, b, tol, max_iter=100):
 
     raise ValueError("El método de bisección no convergió dentro del número máximo de iteraciones.")
 
+def bisection_method(func_str, a, b, tol, max_iter=100, adaptive=False, monitor=None):
+    """
+    Implementa el método de bisección para encontrar la raíz de una función.
+    Retorna la raíz, el número de iteraciones y un historial de las iteraciones (IterationTrace).
+    Con un ConvergenceMonitor se aplican además sus criterios de parada y, al terminar,
+    monitor.reason y monitor.order informan por qué se detuvo y el orden observado.
+    """
+    history = IterationTrace(BISECTION_COLUMNS)
+    steps = bisection_steps(func_str, a, b, tol, max_iter, adaptive)
+    if monitor is not None:
+        steps = monitored_steps(steps, monitor, BISECTION_COLUMNS)
+    root = run_steps(steps, history)
+    return root, len(history), history
+
 class BiseccionApp:
     def __init__(self, master):
         self.master = master
@@ -241,6 +207,11 @@ class BiseccionApp:
         self.tol_entry.grid(row=3, column=1, padx=5, pady=5, sticky='w')
         self.tol_entry.bind("<Key>", self.on_manual_entry_change)
 
+        # Precisión adaptativa: reevalúa con mpmath los puntos donde el signo de f es dudoso
+        self.adaptive_var = tk.BooleanVar(value=False)
+        adaptive_check = ttk.Checkbutton(input_frame, text="Precisión adaptativa", variable=self.adaptive_var)
+        adaptive_check.grid(row=4, column=1, padx=5, pady=5, sticky='w')
+
         # Botones
         button_frame = tk.Frame(self.main_frame, bg="#f0f0f0")
         button_frame.pack(pady=20)
@@ -256,6 +227,12 @@ class BiseccionApp:
         self.plot_button = ttk.Button(button_frame, text="Mostrar Gráfica", command=self.show_plot, state='disabled')  # Inicialmente deshabilitado
         self.plot_button.grid(row=0, column=2, padx=10)
 
+        # Detiene un cálculo en curso (las iteraciones se muestran a medida que se calculan)
+        self.stop_button = ttk.Button(button_frame, text="Detener", command=self.stop_calculation)
+        self.stop_button.grid(row=0, column=3, padx=10)
+        self.stop_button.state(['disabled'])
+        self.token = None
+
         # Resultados
         result_label = ttk.Label(self.main_frame, text="Resultados:", background="#f0f0f0")
         result_label.pack(anchor='nw', padx=5, pady=5)
@@ -341,13 +318,49 @@ class BiseccionApp:
             messagebox.showerror("Error", "El valor de 'a' debe ser menor que 'b'.")
             return
 
+        if self.token is not None:
+            return  # Ya hay un cálculo en curso
+
+        # Ejecutar el método de bisección para una raíz: cada iteración se agrega a la
+        # Treeview apenas se calcula, sin bloquear la ventana
+        self.clear_treeview()
+        history = IterationTrace(BISECTION_COLUMNS)
+        self.token = CancellationToken()
+        self.stop_button.state(['!disabled'])
+        monitor = ConvergenceMonitor()
+        steps = monitored_steps(bisection_steps(func_str, a, b, tol, adaptive=self.adaptive_var.get(), token=self.token),
+                                monitor, BISECTION_COLUMNS)
+
+        def on_record(record):
+            history.append(*record)
+            self.tree.see(self.insert_iteration_row(*record))
+
+        def on_finish(root):
+            self.finish_calculation()
+            if root is None:
+                messagebox.showinfo("Cálculo Detenido", f"El cálculo se detuvo después de {len(history)} iteraciones.")
+            else:
+                self.show_bisection_result(func_str, a, b, tol, root, history, monitor)
+
+        def on_error(e):
+            self.finish_calculation()
+            messagebox.showerror("Error", f"Error al ejecutar el método: {e}")
+
+        stream_to_tk(self.master, steps, on_record, on_finish, on_error)
+
+    def stop_calculation(self):
+        if self.token is not None:
+            self.token.cancel()
+
+    def finish_calculation(self):
+        self.token = None
+        self.stop_button.state(['disabled'])
+
+    def show_bisection_result(self, func_str, a, b, tol, root, history, monitor):
+        iterations = len(history)
         try:
-            # Ejecutar el método de bisección para una raíz
-            root, iterations, history = bisection_method(func_str, a, b, tol)
-            result = f"Raíz encontrada: {root}\nNúmero de iteraciones: {iterations}"
+            result = f"Raíz encontrada: {root}\nNúmero de iteraciones: {iterations}\n{monitor.summary()}"
             messagebox.showinfo("Éxito", result)
-            # Mostrar resultados en la Treeview
-            self.display_results(history)
             # Guardar detalles para la ventana de detalles
             self.current_details = {
                 'function': func_str,
@@ -356,6 +369,8 @@ class BiseccionApp:
                 'tolerance': tol,
                 'root': root,
                 'iterations': iterations,
+                'stop_reason': monitor.reason,
+                'convergence_order': monitor.order,
                 'history': history,
                 'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
@@ -369,7 +384,7 @@ class BiseccionApp:
             # Preguntar si desea encontrar todas las raíces en el intervalo
             response = messagebox.askyesno("Buscar Todas las Raíces", "¿Deseas encontrar todas las raíces existentes en el intervalo seleccionado?")
             if response:
-                all_roots, all_histories = self.find_all_roots(func_str, a, b, tol)
+                all_roots, all_histories = self.find_all_roots(func_str, a, b, tol, adaptive=self.adaptive_var.get())
                 if all_roots:
                     roots_info = "\n".join([f"Raíz {i+1}: {root}" for i, root in enumerate(all_roots)])
                     messagebox.showinfo("Todas las Raíces Encontradas", f"Se encontraron {len(all_roots)} raíz(s):\n{roots_info}")
@@ -395,30 +410,23 @@ class BiseccionApp:
         except Exception as e:
             messagebox.showerror("Error", f"Error al ejecutar el método: {e}")
 
-    def find_all_roots(self, func_str, a, b, tol):
+    def find_all_roots(self, func_str, a, b, tol, adaptive=False):
         """
         Encuentra todas las raíces en el intervalo [a, b] utilizando el método de bisección.
+        Los subintervalos con raíces se obtienen con un muestreo vectorizado que solo se refina
+        donde puede haber raíces ocultas, y se refinan todos a la vez con bisección vectorizada.
         """
+        brackets = scan_brackets(func_str, a, b, min_width=tol)
+        # Con precisión adaptativa solo los puntos medios dudosos se reevalúan con mpmath
+        found = zip(*polish_brackets(func_str, brackets, tol, adaptive=adaptive))
+
         roots = []
         histories = []
-        step = 1  # Tamaño del paso para escanear el intervalo
-        sub_a = a
-        while sub_a < b:
-            sub_b = sub_a + step
-            if sub_b > b:
-                sub_b = b
-            try:
-                fa = evaluate_function(func_str, sub_a)
-                fb = evaluate_function(func_str, sub_b)
-                if fa * fb < 0:
-                    root, iterations, history = bisection_method(func_str, sub_a, sub_b, tol)
-                    # Verificar si la raíz ya está registrada (evitar duplicados)
-                    if not any(math.isclose(root, existing_root, rel_tol=1e-5) for existing_root in roots):
-                        roots.append(root)
-                        histories.append(history)
-            except:
-                pass  # Ignorar errores y continuar
-            sub_a += step / 2  # Superponer pasos para detectar raíces cercanas
+        for root, history in found:
+            # Verificar si la raíz ya está registrada (evitar duplicados)
+            if not any(math.isclose(root, existing_root, rel_tol=1e-5) for existing_root in roots):
+                roots.append(root)
+                histories.append(history)
         return roots, histories
 
     def display_results(self, history):
@@ -427,13 +435,11 @@ class BiseccionApp:
             self.tree.delete(item)
         # Insertar nuevas filas
         for record in history:
-            iteracion = record['iteration']
-            a = record['a']
-            b = record['b']
-            c = record['c']
-            fc = record['f(c)']
-            error = f"{record['relative_error']:.6f}" if record['relative_error'] is not None else "N/A"
-            self.tree.insert("", "end", values=(iteracion, f"{a:.6f}", f"{b:.6f}", f"{c:.6f}", f"{fc:.6f}", error))
+            self.insert_iteration_row(*record.values())
+
+    def insert_iteration_row(self, iteracion, a, b, c, fc, relative_error):
+        error = f"{relative_error:.6f}" if relative_error is not None else "N/A"
+        return self.tree.insert("", "end", values=(iteracion, f"{a:.6f}", f"{b:.6f}", f"{c:.6f}", f"{fc:.6f}", error))
 
     def display_multiple_results(self, histories):
         # Limpiar Treeview
@@ -563,13 +569,18 @@ class BiseccionApp:
         else:
             history = []
 
+        # El hash canónico identifica la función aunque se haya escrito de otra forma
+        if 'function' in details:
+            details = {**details, 'function_hash': expression_hash(details['function'])}
+
         history.append({
             'type': exercise_type,
             'details': details
         })
 
         with open(history_file, 'w') as f:
-            json.dump(history, f, indent=4)
+            # Las trazas de iteraciones se guardan en su forma compacta
+            json.dump(history, f, indent=4, default=encode_trace)
 
     def on_function_selected(self, event):
         selected_func = self.func_combobox.get()
@@ -662,8 +673,7 @@ class BiseccionApp:
 
         # Generar puntos para la gráfica
         try:
-            x_vals = np.linspace(a, b, 400)
-            y_vals = [evaluate_function(func_str, x) for x in x_vals]
+            x_vals, y_vals = sample_function(func_str, a, b, 400)
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo generar la gráfica:\n{e}")
             return
@@ -803,13 +813,18 @@ class BiseccionApp:
         else:
             history = []
 
+        # El hash canónico identifica la función aunque se haya escrito de otra forma
+        if 'function' in details:
+            details = {**details, 'function_hash': expression_hash(details['function'])}
+
         history.append({
             'type': exercise_type,
             'details': details
         })
 
         with open(history_file, 'w') as f:
-            json.dump(history, f, indent=4)
+            # Las trazas de iteraciones se guardan en su forma compacta
+            json.dump(history, f, indent=4, default=encode_trace)
 
     def on_function_selected(self, event):
         selected_func = self.func_combobox.get()
@@ -902,8 +917,7 @@ class BiseccionApp:
 
         # Generar puntos para la gráfica
         try:
-            x_vals = np.linspace(a, b, 400)
-            y_vals = [evaluate_function(func_str, x) for x in x_vals]
+            x_vals, y_vals = sample_function(func_str, a, b, 400)
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo generar la gráfica:\n{e}")
             return
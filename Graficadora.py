@@ -8,6 +8,8 @@ import numpy as np
 import mplcursors  # Para anotaciones interactivas
 from matplotlib.widgets import Slider
 import math  # Necesario para evaluar funciones matemáticas en bisección
+from function_evaluator import sample_function
+from iteration_trace import decode_history
 
 axcolor = 'lightgoldenrodyellow'  # Define el color que desees
 
@@ -284,28 +286,20 @@ def graficar_biseccion(detalles, ax, fig):
     """
     # Obtener detalles
     func_str = detalles.get('function', '')
-    history = detalles.get('history', [])
+    # El historial puede estar guardado como lista de diccionarios o como traza compacta
+    history = decode_history(detalles.get('history', []))
     a_initial = detalles.get('a', 0)
     b_initial = detalles.get('b', 1)
 
     if not func_str or not history:
         raise ValueError("Detalles insuficientes para graficar el método de bisección.")
 
-    # Crear una función segura para evaluar f(x)
-    def evaluate_function(func, x):
-        try:
-            allowed_names = {"x": x, "math": math}
-            return eval(func, {"__builtins__": None}, allowed_names)
-        except Exception as e:
-            raise ValueError(f"Error al evaluar la función: {e}")
-
     # Crear datos para graficar f(x)
     # Determinar el rango de x basado en los valores a y b
     buffer = (b_initial - a_initial) * 0.1  # 10% de buffer
     x_min = a_initial - buffer
     x_max = b_initial + buffer
-    x = np.linspace(x_min, x_max, 1000)
-    y = [evaluate_function(func_str, xi) for xi in x]
+    x, y = sample_function(func_str, x_min, x_max, 1000)  # Evaluación vectorizada, en caché por forma canónica
     ax.plot(x, y, label=f"f(x) = {func_str}", color='blue')
 
     # Dibujar el eje y=0
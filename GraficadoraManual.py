@@ -8,6 +8,8 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from mpl_toolkits.mplot3d import Axes3D
 import sympy as sp
 import numpy as np
+from expression_parser import parse_expression, to_sympy
+from nonlinear_systems import SYSTEM_METHODS, parse_equation, solve_system
 
 class GraficadoraManual:
     def __init__(self, master):
@@ -185,7 +187,7 @@ class GraficadoraManual:
 
         elif selected.startswith("4. Graficacion por Newton - Raphson"):
             self.add_entry("Funcion", "Ingrese la función f(x):")
-            self.add_entry("Derivada", "Ingrese la derivada f'(x):")
+            self.add_entry("Derivada", "Ingrese la derivada f'(x) (opcional):")
             self.add_entry("Inicial", "Ingrese el valor inicial x₀:")
             self.add_entry("Tolerancia", "Ingrese la tolerancia (e.g., 1e-5):")
             self.add_entry("Max Iteraciones", "Ingrese el máximo de iteraciones:")
@@ -232,16 +234,17 @@ class GraficadoraManual:
         
         elif selected.startswith("3. Sistemas de ecuaciones"):
             help_message = (
-                "Para graficar sistemas de ecuaciones lineales:\n"
+                "Para graficar sistemas de ecuaciones lineales o no lineales:\n"
                 "- Utiliza el botón **Resolver Sistema de Ecuaciones** para ingresar y resolver un sistema de 2 ecuaciones con 2 incógnitas.\n"
-                "- La solución se mostrará en la gráfica donde se intersectan las líneas correspondientes a las ecuaciones."
+                "- El sistema se resuelve con Newton o Broyden a partir del valor inicial (x, y); si el sistema tiene varias soluciones, cambia el valor inicial para encontrar otra.\n"
+                "- La solución se mostrará en la gráfica donde se intersectan las curvas correspondientes a las ecuaciones."
             )
         
         elif selected.startswith("4. Graficacion por Newton - Raphson"):
             help_message = (
                 "Para graficar el método de Newton-Raphson:\n"
                 "- **Función f(x):** Ingrese la función cuya raíz desea encontrar.\n"
-                "- **Derivada f'(x):** Ingrese la derivada de la función.\n"
+                "- **Derivada f'(x):** Opcional. Si se deja vacía se calcula automáticamente.\n"
                 "- **Inicial x₀:** Ingrese el valor inicial para el método.\n"
                 "- **Tolerancia:** Ingrese la tolerancia para la convergencia (por ejemplo, 1e-5).\n"
                 "- **Max Iteraciones:** Ingrese el número máximo de iteraciones permitidas.\n\n"
@@ -561,7 +564,7 @@ class GraficadoraManual:
 
     def graficar_newton_raphson(self):
         funcion_str = self.labels_entries.get("Funcion")[1].get()
-        derivada_str = self.labels_entries.get("Derivada")[1].get()
+        derivada_str = self.labels_entries.get("Derivada")[1].get().strip()
         inicial_str = self.labels_entries.get("Inicial")[1].get()
         tolerancia_str = self.labels_entries.get("Tolerancia")[1].get()
         max_iter_str = self.labels_entries.get("Max Iteraciones")[1].get()
@@ -579,14 +582,15 @@ class GraficadoraManual:
 
         # Convertir las cadenas a expresiones simbólicas
         try:
-            funcion = sp.sympify(funcion_str)
-            derivada = sp.sympify(derivada_str)
-        except sp.SympifyError:
+            funcion = to_sympy(parse_expression(funcion_str))
+            # Si no se ingresó la derivada, se obtiene simbólicamente
+            derivada = to_sympy(parse_expression(derivada_str)) if derivada_str else sp.diff(funcion, x)
+        except ValueError:
             raise ValueError("La función y su derivada deben estar correctamente definidas.")
 
-        # Convertir a funciones lambda
+        # Convertir a funciones lambda; f y f' se evalúan juntas compartiendo los términos comunes
         f = sp.lambdify(x, funcion, modules=['numpy'])
-        f_prime = sp.lambdify(x, derivada, modules=['numpy'])
+        f_y_derivada = sp.lambdify(x, (funcion, derivada), modules=['numpy'], cse=True)
 
         # Inicializar variables para Newton-Raphson
         iteraciones = 0
@@ -598,7 +602,8 @@ class GraficadoraManual:
         # Ejecutar el método de Newton-Raphson
         while error > tolerancia and iteraciones < max_iter:
             try:
-                x1 = x0 - f(x0)/f_prime(x0)
+                f_x0, f_prime_x0 = f_y_derivada(x0)
+                x1 = x0 - f_x0/f_prime_x0
             except ZeroDivisionError:
                 messagebox.showerror("Error", "La derivada se volvió cero. Método de Newton-Raphson falla.")
                 return
@@ -720,14 +725,14 @@ class GraficadoraManual:
         # Ventana para ingresar el sistema de ecuaciones
         sistema_window = tk.Toplevel(self.master)
         sistema_window.title("Resolver Sistema de Ecuaciones")
-        sistema_window.geometry("500x400")
+        sistema_window.geometry("500x480")
         sistema_window.resizable(False, False)
 
         frame = tk.Frame(sistema_window, padx=20, pady=20, bg="#f0f0f0")
         frame.pack(expand=True, fill='both')
 
         # Instrucciones
-        instruccion = tk.Label(frame, text="Ingrese un sistema de 2 ecuaciones lineales con 2 incógnitas (x y):", wraplength=460, justify="left", bg="#f0f0f0")
+        instruccion = tk.Label(frame, text="Ingrese un sistema de 2 ecuaciones (lineales o no lineales) con 2 incógnitas (x y), por ejemplo x^2 + y^2 = 4:", wraplength=460, justify="left", bg="#f0f0f0")
         instruccion.pack(pady=10)
 
         # Entrada para la primera ecuación
@@ -746,6 +751,18 @@ class GraficadoraManual:
         self.eq2_entry = ttk.Entry(eq2_frame, width=40)
         self.eq2_entry.pack(side='left', padx=5)
 
+        # Valor inicial y método iterativo (Newton con jacobiana o Broyden)
+        opciones_frame = tk.Frame(frame, bg="#f0f0f0")
+        opciones_frame.pack(pady=5)
+        x0_label = tk.Label(opciones_frame, text="Valor inicial (x, y):", bg="#f0f0f0")
+        x0_label.pack(side='left')
+        self.x0_sistema_entry = ttk.Entry(opciones_frame, width=10)
+        self.x0_sistema_entry.pack(side='left', padx=5)
+        self.x0_sistema_entry.insert(0, "1, 1")
+        self.metodo_sistema_var = tk.StringVar(value=SYSTEM_METHODS[0])
+        metodo_combobox = ttk.Combobox(opciones_frame, textvariable=self.metodo_sistema_var, values=SYSTEM_METHODS, state="readonly", width=10)
+        metodo_combobox.pack(side='left', padx=5)
+
         # Botón para resolver
         btn_resolver = ttk.Button(frame, text="Resolver", command=lambda: self.resolver(eq1_window=sistema_window))
         btn_resolver.pack(pady=10)
@@ -761,50 +778,52 @@ class GraficadoraManual:
         try:
             # Definir las variables
             x, y = sp.symbols('x y')
+            x0 = [float(valor) for valor in self.x0_sistema_entry.get().split(',')]
+            metodo = self.metodo_sistema_var.get()
 
-            # Convertir las ecuaciones de string a sympy
-            ecuacion1 = sp.sympify(eq1)
-            ecuacion2 = sp.sympify(eq2)
+            # Convertir las ecuaciones a sympy (f = g se interpreta como f - g = 0)
+            ecuacion1 = parse_equation(eq1, ('x', 'y'))
+            ecuacion2 = parse_equation(eq2, ('x', 'y'))
 
-            # Resolver el sistema
-            solucion = sp.solve((ecuacion1, ecuacion2), (x, y))
-
-            if solucion:
-                solucion_str = f"Solución:\n{x} = {solucion[x]}\n{y} = {solucion[y]}"
+            # Resolver el sistema de forma iterativa (sp.solve es lento o no termina con ecuaciones no lineales)
+            try:
+                raiz, iteraciones, historial = solve_system([eq1, eq2], ('x', 'y'), x0, method=metodo)
+            except ValueError as e:
                 self.solucion_text.config(state='normal')
                 self.solucion_text.delete('1.0', tk.END)
-                self.solucion_text.insert(tk.END, solucion_str)
+                self.solucion_text.insert(tk.END, f"No se encontró solución desde ({self.x0_sistema_entry.get()}):\n{e}")
                 self.solucion_text.config(state='disabled')
+                return
 
-                # Graficar las ecuaciones y la solución
-                self.graficar_sistema(ecuacion1, ecuacion2, solucion)
-            else:
-                self.solucion_text.config(state='normal')
-                self.solucion_text.delete('1.0', tk.END)
-                self.solucion_text.insert(tk.END, "El sistema no tiene solución única.")
-                self.solucion_text.config(state='disabled')
+            solucion = {x: float(raiz[0]), y: float(raiz[1])}
+            solucion_str = (f"Solución ({metodo}, {iteraciones} iteraciones):\n{x} = {solucion[x]}\n{y} = {solucion[y]}\n"
+                            f"||F|| = {historial[-1]['residual']:.2e}")
+            self.solucion_text.config(state='normal')
+            self.solucion_text.delete('1.0', tk.END)
+            self.solucion_text.insert(tk.END, solucion_str)
+            self.solucion_text.config(state='disabled')
+
+            # Graficar las ecuaciones y la solución
+            self.graficar_sistema(ecuacion1, ecuacion2, solucion)
 
         except Exception as e:
             messagebox.showerror("Error", f"Ocurrió un error al resolver el sistema:\n{e}")
 
     def graficar_sistema(self, eq1, eq2, solucion):
-        # Crear un rango de valores para x
-        x_vals = np.linspace(-10, 10, 400)
-        y_vals_eq1 = []
-        y_vals_eq2 = []
+        # Cada ecuación se dibuja como la curva de nivel cero de f(x, y) sobre una malla,
+        # lo que sirve también para curvas no lineales (circunferencias, elipses, etc.)
+        x_sol, y_sol = solucion[sp.Symbol('x')], solucion[sp.Symbol('y')]
+        x_vals = np.linspace(min(-10, x_sol - 1), max(10, x_sol + 1), 400)
+        y_vals = np.linspace(min(-10, y_sol - 1), max(10, y_sol + 1), 400)
+        X, Y = np.meshgrid(x_vals, y_vals)
 
         try:
-            expr_eq1 = sp.solve(eq1, sp.Symbol('y'))
-            expr_eq2 = sp.solve(eq2, sp.Symbol('y'))
-            if expr_eq1:
-                y_vals_eq1 = [float(expr_eq1[0].subs(sp.Symbol('x'), val)) for val in x_vals]
-            else:
-                y_vals_eq1 = [np.nan]*len(x_vals)
-
-            if expr_eq2:
-                y_vals_eq2 = [float(expr_eq2[0].subs(sp.Symbol('x'), val)) for val in x_vals]
-            else:
-                y_vals_eq2 = [np.nan]*len(x_vals)
+            Z = []
+            for ecuacion in (eq1, eq2):
+                f = sp.lambdify((sp.Symbol('x'), sp.Symbol('y')), ecuacion, modules='numpy')
+                with np.errstate(all='ignore'):
+                    valores = np.broadcast_to(np.asarray(f(X, Y), dtype=float), X.shape)
+                Z.append(np.where(np.isfinite(valores), valores, np.nan))
         except Exception as e:
             messagebox.showerror("Error", f"Ocurrió un error al graficar las ecuaciones:\n{e}")
             return
@@ -818,20 +837,22 @@ class GraficadoraManual:
         if is_3d:
             self.ax = self.figure.add_subplot(111, projection='3d')
             # Graficar las ecuaciones como líneas en el plano XY
-            self.ax.plot(x_vals, y_vals_eq1, zs=0, zdir='z', label='Ecuación 1')
-            self.ax.plot(x_vals, y_vals_eq2, zs=0, zdir='z', label='Ecuación 2')
-            self.ax.scatter(solucion[sp.Symbol('x')], solucion[sp.Symbol('y')], zs=0, color='r', marker='o', label='Solución')
+            self.ax.contour(X, Y, Z[0], levels=[0], zdir='z', offset=0, colors='C0')
+            self.ax.contour(X, Y, Z[1], levels=[0], zdir='z', offset=0, colors='C1')
+            self.ax.scatter(x_sol, y_sol, zs=0, color='r', marker='o', label='Solución')
             self.ax.set_zlim(-1, 1)  # Limitar Z para mejor visualización
             self.ax.set_xlabel("X", fontsize=12)
             self.ax.set_ylabel("Y", fontsize=12)
             self.ax.set_zlabel("Z", fontsize=12)
         else:
             # Graficar las ecuaciones
-            self.ax.plot(x_vals, y_vals_eq1, label='Ecuación 1')
-            self.ax.plot(x_vals, y_vals_eq2, label='Ecuación 2')
+            self.ax.contour(X, Y, Z[0], levels=[0], colors='C0')
+            self.ax.contour(X, Y, Z[1], levels=[0], colors='C1')
+            self.ax.plot([], [], color='C0', label='Ecuación 1')
+            self.ax.plot([], [], color='C1', label='Ecuación 2')
 
             # Graficar la solución
-            self.ax.plot(solucion[sp.Symbol('x')], solucion[sp.Symbol('y')], 'ro', label='Solución')
+            self.ax.plot(x_sol, y_sol, 'ro', label='Solución')
 
             # Configurar el gráfico
             self.ax.set_title("Sistema de Ecuaciones Resuelto", fontsize=16)
@@ -4,6 +4,26 @@ from tkinter import ttk, messagebox, scrolledtext
 from sympy import symbols, sympify, integrate, Matrix, lambdify
 from sympy.vector import CoordSys3D
 import numpy as np
+from functools import lru_cache
+from expression_parser import expression_key, parse_expression, to_sympy
+
+@lru_cache(maxsize=128)
+def _integrate_canonical(key, variables, limits):
+    expr = to_sympy(parse_expression(key, variables))
+    return integrate(expr, *[(symbols(var), lo, hi) for var, lo, hi in limits])
+
+def cached_integrate(func_str, variables, limits):
+    """
+    Integral definida de func_str con límites ((variable, inferior, superior), ...).
+    Los resultados se guardan indexados por la forma canónica del integrando, así que
+    repetir el cálculo o escribir la misma función de otra forma no vuelve a integrar.
+    Si el parser no reconoce la expresión, se integra directamente con SymPy.
+    """
+    try:
+        key = expression_key(func_str, tuple(variables))
+    except ValueError:
+        return integrate(sympify(func_str), *[(symbols(var), lo, hi) for var, lo, hi in limits])
+    return _integrate_canonical(key, tuple(variables), tuple(limits))
 
 class IntegralesApp:
     def __init__(self, master):
@@ -188,10 +208,10 @@ class IntegralesApp:
             g = sympify(g_str)
             
             # Producto interno ⟨f, g⟩ = ∫ₐᵇ f(t)*g(t) dt
-            inner_product = integrate(f * g, (t, a, b))
+            inner_product = cached_integrate(f"({f_str})*({g_str})", ('t',), (('t', a, b),))
             
             # Norma de f: ⟨f, f⟩ = ∫ₐᵇ f(t)**2 dt
-            norm_f = integrate(f**2, (t, a, b))
+            norm_f = cached_integrate(f"({f_str})^2", ('t',), (('t', a, b),))
             if norm_f == 0:
                 raise ValueError("La norma de f(t) es cero, no se puede proyectar.")
             
@@ -587,11 +607,8 @@ class IntegralesApp:
                 
                 t = symbols('t')  # No se utiliza en este contexto
                 
-                # Parsear f(x, y, z)
-                f = sympify(f_str)
-                
-                # Integrar sobre x, y, z
-                integral = integrate(f, (symbols('x'), x_a, x_b), (symbols('y'), y_c, y_d), (symbols('z'), z_e, z_f))
+                # Integrar f(x, y, z) sobre x, y, z
+                integral = cached_integrate(f_str, ('x', 'y', 'z'), (('x', x_a, x_b), ('y', y_c, y_d), ('z', z_e, z_f)))
                 
                 # Mostrar el resultado
                 result_str = f"Integral de Volumen ∫∫∫ f(x, y, z) dx dy dz = {integral}"
@@ -1,22 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import random
+from functools import lru_cache
 import matplotlib
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 import sympy as sp
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application
-)
 from matplotlib.figure import Figure
+from expression_parser import parse_expression, to_sympy
+from polynomial_roots import REAL_TOLERANCE, polynomial_roots
+from iteration_trace import DEFLATION_COLUMNS, NEWTON_COLUMNS, IterationTrace
+from solver_stream import CancellationToken, is_cancelled, run_steps, stream_to_tk
+from convergence import ConvergenceMonitor, monitored_steps
+from newton_basins import DEFAULT_RESOLUTION, ROOT_MERGE_TOLERANCE, basin_map, plot_basins
 
 # Importar proyecciones 3D para gráficos 3D
 from mpl_toolkits.mplot3d import Axes3D
 
-# Habilitar interactividad en matplotlib
-matplotlib.use('TkAgg')
+# Habilitar interactividad en matplotlib (sin pantalla, como en batch_solver, se ignora)
+matplotlib.use('TkAgg', force=False)
 
 # Constantes de configuración
 BG_COLOR = "#1e1e1e"
@@ -39,6 +41,247 @@ OPERATIONS = [
 ]
 NUMBERS = ['7', '8', '9', '4', '5', '6', '1', '2', '3', '0', '.']
 VARIABLES = ['x', 'y']
+MODULES = ('numpy', 'sympy')
+
+@lru_cache(maxsize=64)
+def cached_lambdify(expr, variables, modules=MODULES, cse=False):
+    """
+    Devuelve la función numérica de una expresión de SymPy, reutilizando las ya generadas.
+    La caché está acotada y se indexa por (expresión canónica de SymPy, variables, módulos),
+    así que el cálculo de la raíz, las gráficas 2D/3D y los redibujados comparten el mismo callable.
+    Si expr es una tupla y cse=True, las salidas comparten las subexpresiones comunes.
+    """
+    return sp.lambdify(variables, expr, modules=list(modules), cse=cse)
+
+@lru_cache(maxsize=64)
+def parse_sympy_functions(func_str, deriv_str):
+    """
+    Expresiones de SymPy de f y f' (derivada simbólica si deriv_str está vacío).
+    Se guardan indexadas por el texto ingresado, así que repetir un ejercicio en la misma
+    sesión no vuelve a analizar ni derivar, y cached_lambdify recibe el mismo objeto.
+    """
+    variables = ('x', 'y')
+    f_sympy = to_sympy(parse_expression(func_str, variables))
+    if deriv_str:
+        f_prime_sympy = to_sympy(parse_expression(deriv_str, variables))
+    else:
+        f_prime_sympy = sp.diff(f_sympy, sp.Symbol('x'))
+    return f_sympy, f_prime_sympy
+
+def newton_steps(f_and_prime, x0, tol, max_iter=100, token=None):
+    """
+    Generador del método de Newton-Raphson. f_and_prime(x) devuelve (f(x), f'(x)).
+    Produce una tupla (iteración, x, f(x), siguiente iterado) por iteración y devuelve la
+    raíz al converger, o None si el token se cancela. Los fallos se informan con ValueError.
+    """
+    xi = x0
+    for i in range(1, max_iter + 1):
+        if is_cancelled(token):
+            return None
+        try:
+            f_xi, f_prime_xi = f_and_prime(xi)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar las funciones en x = {xi}:\n{e}")
+
+        if f_prime_xi == 0:
+            raise ValueError(f"La derivada de f(x) en x = {xi} es cero. El método no puede continuar.")
+
+        xi_next = xi - f_xi / f_prime_xi
+        yield i, xi, f_xi, xi_next
+
+        # Verificar convergencia
+        if abs(xi_next - xi) < tol:
+            return xi_next
+
+        xi = xi_next
+
+    raise ValueError(f"El método no convergió después de {max_iter} iteraciones.")
+
+def newton_raphson(f_and_prime, x0, tol, max_iter=100, monitor=None):
+    """
+    Método de Newton-Raphson sin interfaz. Retorna la raíz, el número de iteraciones y el
+    historial de iteraciones (IterationTrace con x, f(x) y el siguiente iterado).
+    Con un ConvergenceMonitor se detectan antes los ciclos y la divergencia, y monitor.reason
+    y monitor.order informan por qué se detuvo y el orden observado.
+    """
+    history = IterationTrace(NEWTON_COLUMNS)
+    steps = newton_steps(f_and_prime, x0, tol, max_iter)
+    if monitor is not None:
+        steps = monitored_steps(steps, monitor, NEWTON_COLUMNS)
+    root = run_steps(steps, history)
+    return root, len(history), history
+
+# Variantes del método que se pueden elegir en la interfaz
+NEWTON_VARIANTS = ("Newton-Raphson", "Newton con salvaguarda", "Halley")
+# Búsqueda del intervalo inicial de la variante con salvaguarda: factor de ampliación e intentos
+BRACKET_GROWTH = 1.6
+BRACKET_TRIES = 50
+
+def bracket_around(f_and_prime, x0, growth=BRACKET_GROWTH, tries=BRACKET_TRIES):
+    """
+    Busca un intervalo [a, b] alrededor de x0 en el que f cambie de signo, ampliándolo
+    geométricamente por el extremo donde |f| es menor. Lanza ValueError si no lo encuentra.
+    """
+    step = 0.1 * max(1.0, abs(x0))
+    a, b = x0 - step, x0 + step
+    try:
+        fa, fb = f_and_prime(a)[0], f_and_prime(b)[0]
+        for _ in range(tries):
+            if fa * fb <= 0:
+                return a, b
+            if abs(fa) < abs(fb):
+                a += growth * (a - b)
+                fa = f_and_prime(a)[0]
+            else:
+                b += growth * (b - a)
+                fb = f_and_prime(b)[0]
+    except Exception as e:
+        raise ValueError(f"Error al buscar un intervalo con cambio de signo alrededor de x₀ = {x0}:\n{e}")
+    raise ValueError(f"No se encontró un intervalo con cambio de signo alrededor de x₀ = {x0}.")
+
+def rtsafe_steps(f_and_prime, x0, a, b, tol, max_iter=100, token=None):
+    """
+    Generador de Newton con salvaguarda (rtsafe): mantiene un intervalo [a, b] con cambio de
+    signo y da un paso de bisección cuando el de Newton saldría del intervalo, no lo reduce
+    a la mitad o f'(x) = 0. Converge siempre que f cambie de signo en [a, b] y conserva la
+    convergencia cuadrática cerca de la raíz. Produce las mismas tuplas que newton_steps.
+    """
+    def evaluate(x):
+        try:
+            return f_and_prime(x)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar las funciones en x = {x}:\n{e}")
+
+    fa, fb = evaluate(a)[0], evaluate(b)[0]
+    if fa * fb > 0:
+        raise ValueError(f"f(x) no cambia de signo en [{a}, {b}].")
+    # low es el extremo con f < 0 y high el extremo con f > 0
+    low, high = (a, b) if fa < 0 else (b, a)
+    xi = x0 if min(a, b) < x0 < max(a, b) else (a + b) / 2
+    dx_old = dx = abs(b - a)
+    for i in range(1, max_iter + 1):
+        if is_cancelled(token):
+            return None
+        f_xi, f_prime_xi = evaluate(xi)
+        if f_xi == 0:
+            yield i, xi, f_xi, xi
+            return xi
+        if f_xi < 0:
+            low = xi
+        else:
+            high = xi
+
+        # El paso de Newton cae fuera de [low, high] si el producto es positivo
+        outside = ((xi - high) * f_prime_xi - f_xi) * ((xi - low) * f_prime_xi - f_xi) > 0
+        if outside or abs(2 * f_xi) > abs(dx_old * f_prime_xi):
+            dx_old, dx = dx, (high - low) / 2
+            xi_next = low + dx
+        else:
+            dx_old, dx = dx, f_xi / f_prime_xi
+            xi_next = xi - dx
+        yield i, xi, f_xi, xi_next
+
+        if abs(dx) < tol:
+            return xi_next
+
+        xi = xi_next
+
+    raise ValueError(f"El método no convergió después de {max_iter} iteraciones.")
+
+def halley_steps(f_derivatives, x0, tol, max_iter=100, token=None):
+    """
+    Generador del método de Halley (orden tres). f_derivatives(x) devuelve (f, f', f'') y
+    cada paso es x - 2ff' / (2f'² - ff''); si el denominador se anula se da el paso de
+    Newton. Produce las mismas tuplas que newton_steps.
+    """
+    xi = x0
+    for i in range(1, max_iter + 1):
+        if is_cancelled(token):
+            return None
+        try:
+            f_xi, f_prime_xi, f_second_xi = f_derivatives(xi)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar las funciones en x = {xi}:\n{e}")
+
+        denominator = 2 * f_prime_xi ** 2 - f_xi * f_second_xi
+        if denominator != 0:
+            xi_next = xi - 2 * f_xi * f_prime_xi / denominator
+        elif f_prime_xi != 0:
+            xi_next = xi - f_xi / f_prime_xi
+        else:
+            raise ValueError(f"La derivada de f(x) en x = {xi} es cero. El método no puede continuar.")
+        yield i, xi, f_xi, xi_next
+
+        if abs(xi_next - xi) < tol:
+            return xi_next
+
+        xi = xi_next
+
+    raise ValueError(f"El método no convergió después de {max_iter} iteraciones.")
+
+def deflate(f_and_prime, roots):
+    """
+    Devuelve la función (g(x), g'(x)) con g(x) = f(x) / ∏(x - r_i), que ya no se anula en las
+    raíces conocidas. La derivada se obtiene de g'/g = f'/f - Σ 1/(x - r_i), es decir,
+    g'(x) = (f'(x) - f(x)·Σ 1/(x - r_i)) / ∏(x - r_i).
+    """
+    def deflated(x):
+        f_x, f_prime_x = f_and_prime(x)
+        product, inverse_sum = 1.0, 0.0
+        for r in roots:
+            product *= x - r
+            inverse_sum += 1 / (x - r)
+        return f_x / product, (f_prime_x - f_x * inverse_sum) / product
+    return deflated
+
+def _tagged_steps(steps, root_index, deflated):
+    # Antepone a cada registro de Newton el número de la raíz y la fase (columnas de DEFLATION_COLUMNS)
+    while True:
+        try:
+            record = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield (root_index, deflated, *record)
+
+def deflation_steps(f_and_prime, x0, tol, count, max_iter=100, token=None):
+    """
+    Generador de Newton con deflación: busca hasta count raíces partiendo siempre de x0. La
+    corrida k itera sobre f(x)/∏(x - r_i) con las k-1 raíces ya halladas, así que no vuelve a
+    converger a ellas, y la aproximación obtenida se pule con Newton sobre f original (quita
+    el error que arrastran las raíces deflactadas). Cada corrida usa un ConvergenceMonitor
+    para cortar pronto los ciclos y la divergencia. Produce tuplas con DEFLATION_COLUMNS y
+    devuelve la lista de raíces, que tiene menos de count si una corrida falla o el pulido
+    vuelve a una raíz conocida; None si el token se cancela. Si falla la primera corrida
+    se lanza ValueError.
+    """
+    roots = []
+    for k in range(1, count + 1):
+        monitor = ConvergenceMonitor()
+        try:
+            steps = monitored_steps(newton_steps(deflate(f_and_prime, roots), x0, tol, max_iter, token), monitor, NEWTON_COLUMNS)
+            approximation = yield from _tagged_steps(steps, k, 1)
+            if approximation is None:
+                return None
+            root = yield from _tagged_steps(newton_steps(f_and_prime, approximation, tol, max_iter, token), k, 0)
+        except ValueError:
+            if not roots:
+                raise
+            break
+        if root is None:
+            return None
+        if any(abs(root - r) <= ROOT_MERGE_TOLERANCE * max(1.0, abs(r)) for r in roots):
+            break
+        roots.append(float(root))
+    return roots
+
+def newton_deflation(f_and_prime, x0, tol, count, max_iter=100):
+    """
+    Newton con deflación sin interfaz. Retorna la lista de raíces encontradas (hasta count)
+    y el historial de todas las corridas (IterationTrace con DEFLATION_COLUMNS).
+    """
+    history = IterationTrace(DEFLATION_COLUMNS)
+    roots = run_steps(deflation_steps(f_and_prime, x0, tol, count, max_iter), history)
+    return roots, history
 
 class NewtonRaphsonApp:
     def __init__(self, master):
@@ -49,9 +292,6 @@ class NewtonRaphsonApp:
         self.op_buttons = []
         self.button_positions = {}
         self.drag_data = {"x": 0, "y": 0, "item": None}
-        self.transformations = (
-            standard_transformations + (implicit_multiplication_application,)
-        )
         self.graph_button = None
         self.tol_value = 0.0001  # Cambiar a valor de tolerancia directo
         self.create_widgets()
@@ -116,7 +356,7 @@ class NewtonRaphsonApp:
         self.create_label_entry(
             parent=constructor_frame,
             row=1,
-            label_text="Derivada f'(x):",
+            label_text="Derivada f'(x) (opcional):",
             display_text="f'(x) = ",
             entry_variable='deriv_entry'
         )
@@ -245,6 +485,37 @@ class NewtonRaphsonApp:
             column=0
         )
 
+        # Variante del método
+        method_label = tk.Label(
+            params_frame,
+            text="Método:",
+            font=FONT,
+            fg=FG_COLOR,
+            bg=BG_COLOR
+        )
+        method_label.grid(row=1, column=2, sticky='e', padx=5, pady=2)
+
+        self.method_var = tk.StringVar(value=NEWTON_VARIANTS[0])
+        self.method_combobox = ttk.Combobox(
+            params_frame,
+            textvariable=self.method_var,
+            values=NEWTON_VARIANTS,
+            state="readonly",
+            width=22,
+            font=FONT
+        )
+        self.method_combobox.grid(row=1, column=3, padx=5, pady=2)
+
+        # Con más de una raíz se usa Newton con deflación
+        self.create_parameter_entry(
+            parent=params_frame,
+            row=2,
+            label_text="Raíces (deflación):",
+            entry_variable='roots_entry',
+            default="1",
+            column=0
+        )
+
     def create_parameter_entry(self, parent, row, label_text, entry_variable, default="", column=0):
         """Crea una etiqueta y entrada para un parámetro."""
         label = tk.Label(
@@ -305,13 +576,34 @@ class NewtonRaphsonApp:
         )
         clear_button.grid(row=1, column=1, padx=5, pady=2)
 
+        # Detiene un cálculo en curso (las iteraciones se muestran a medida que se calculan)
+        stop_button = ttk.Button(
+            actions_frame,
+            text="⏹ Detener",
+            command=self.stop_calculation,
+            width=20,
+            state='disabled'
+        )
+        stop_button.grid(row=2, column=0, padx=5, pady=2)
+        self.stop_button = stop_button
+        self.token = None
+
+        # Newton desde muchos puntos iniciales a la vez, con el mapa de cuencas de atracción
+        basins_button = ttk.Button(
+            actions_frame,
+            text="🌐 Multi-inicio",
+            command=self.show_basins,
+            width=20
+        )
+        basins_button.grid(row=2, column=1, padx=5, pady=2)
+
         close_button = ttk.Button(
             actions_frame,
             text="🔙 Volver",
             command=self.master.destroy,
             width=42
         )
-        close_button.grid(row=2, column=0, columnspan=2, padx=5, pady=2)
+        close_button.grid(row=3, column=0, columnspan=2, padx=5, pady=2)
 
     def create_result_display(self):
         """Crea el área para mostrar los resultados."""
@@ -369,11 +661,15 @@ class NewtonRaphsonApp:
             self.reset_drag_data()
 
     def compute_root(self):
-        """Calcula la raíz utilizando el método de Newton-Raphson."""
+        """Calcula la raíz con la variante elegida del método de Newton-Raphson."""
+        if self.token is not None:
+            return  # Ya hay un cálculo en curso
+
         # Obtener y validar entradas
         try:
             func_str, deriv_str = self.get_function_inputs()
             x0, tol, max_iter = self.get_parameters()
+            count = self.get_root_count()
         except ValueError as e:
             messagebox.showerror("Error de Entrada", str(e))
             return
@@ -385,55 +681,110 @@ class NewtonRaphsonApp:
             messagebox.showerror("Error en la Función", f"Error al interpretar las funciones:\n{e}")
             return
 
-        # Convertir a funciones lambdify
+        # Convertir a funciones lambdify: f y f' se evalúan juntas y comparten los términos comunes
+        method = self.method_var.get()
+        x = sp.Symbol('x')
         try:
-            f = sp.lambdify(sp.symbols('x'), f_sympy, modules=['numpy', 'sympy'])
-            f_prime = sp.lambdify(sp.symbols('x'), f_prime_sympy, modules=['numpy', 'sympy'])
+            f = cached_lambdify(f_sympy, (x,))
+            f_and_prime = cached_lambdify((f_sympy, f_prime_sympy), (x,), cse=True)
+            if method == "Halley":
+                # La segunda derivada se obtiene derivando f' simbólicamente
+                f_derivatives = cached_lambdify((f_sympy, f_prime_sympy, sp.diff(f_prime_sympy, x)), (x,), cse=True)
         except Exception as e:
             messagebox.showerror("Error en la Función", f"Error al convertir funciones para evaluación numérica:\n{e}")
             return
 
-        # Inicializar variables para la gráfica
-        self.x_values = []
-        self.f_values = []
-        self.roots = []
+        if count > 1:
+            self.compute_roots_with_deflation(func_str, f, f_sympy, f_prime_sympy, f_and_prime, x0, tol, max_iter, count)
+            return
+
+        token = CancellationToken()
+        try:
+            if method == "Halley":
+                steps = halley_steps(f_derivatives, x0, tol, max_iter, token)
+            elif method == "Newton con salvaguarda":
+                a, b = bracket_around(f_and_prime, x0)
+                steps = rtsafe_steps(f_and_prime, x0, a, b, tol, max_iter, token)
+            else:
+                steps = newton_steps(f_and_prime, x0, tol, max_iter, token)
+        except ValueError as e:
+            messagebox.showerror("Error en el Método", str(e))
+            return
 
-        # Método de Newton-Raphson
-        xi = x0
-        for i in range(1, max_iter + 1):
-            try:
-                f_xi = f(xi)
-                f_prime_xi = f_prime(xi)
-            except Exception as e:
-                messagebox.showerror("Error en la Evaluación", f"Error al evaluar las funciones en x = {xi}:\n{e}")
+        # Cada iteración se muestra apenas se calcula, sin bloquear la ventana; el monitor
+        # detiene antes los ciclos y la divergencia e informa el orden observado
+        monitor = ConvergenceMonitor()
+        steps = monitored_steps(steps, monitor, NEWTON_COLUMNS)
+        history = IterationTrace(NEWTON_COLUMNS)
+        self.token = token
+        self.stop_button['state'] = 'normal'
+
+        def on_record(record):
+            history.append(*record)
+            self.result_label.config(text=f"Iteración {record[0]}: x = {record[3]}")
+
+        def on_finish(xi):
+            self.finish_calculation()
+            if xi is None:
+                self.result_label.config(text=f"Cálculo detenido después de {len(history)} iteraciones.")
                 return
-
-            if f_prime_xi == 0:
-                messagebox.showerror(
-                    "Derivada Cero",
-                    f"La derivada de f(x) en x = {xi} es cero. El método no puede continuar."
-                )
+            self.show_result(func_str, f, f_sympy, f_prime_sympy, xi, history, method, monitor)
+
+        def on_error(e):
+            self.finish_calculation()
+            self.result_label.config(text="")
+            messagebox.showerror("Error en el Método", str(e))
+
+        stream_to_tk(self.master, steps, on_record, on_finish, on_error)
+
+    def compute_roots_with_deflation(self, func_str, f, f_sympy, f_prime_sympy, f_and_prime, x0, tol, max_iter, count):
+        """
+        Extrae count raíces con Newton-Raphson y deflación: cada corrida parte de x₀, itera
+        sobre f(x)/∏(x - r_i) y pule la raíz sobre f (deflation_steps).
+        """
+        token = CancellationToken()
+        steps = deflation_steps(f_and_prime, x0, tol, count, max_iter, token)
+        history = IterationTrace(DEFLATION_COLUMNS)
+        self.token = token
+        self.stop_button['state'] = 'normal'
+
+        def on_record(record):
+            history.append(*record)
+            phase = "" if record[1] else " (pulido)"
+            self.result_label.config(text=f"Raíz {record[0]}{phase}, iteración {record[2]}: x = {record[5]}")
+
+        def on_finish(roots):
+            self.finish_calculation()
+            if roots is None:
+                self.result_label.config(text=f"Cálculo detenido después de {len(history)} iteraciones.")
                 return
+            self.show_deflation_result(func_str, f, f_sympy, f_prime_sympy, x0, roots, history, count)
 
-            xi_next = xi - f_xi / f_prime_xi
+        def on_error(e):
+            self.finish_calculation()
+            self.result_label.config(text="")
+            messagebox.showerror("Error en el Método", str(e))
 
-            # Guardar valores para la gráfica
-            self.x_values.append(xi)
-            self.f_values.append(f_xi)
-            self.roots.append(xi_next)
+        stream_to_tk(self.master, steps, on_record, on_finish, on_error)
 
-            # Verificar convergencia
-            if abs(xi_next - xi) < tol:
-                xi = xi_next
-                break
+    def stop_calculation(self):
+        """Cancela el cálculo en curso."""
+        if self.token is not None:
+            self.token.cancel()
 
-            xi = xi_next
-        else:
-            messagebox.showwarning(
-                "No Convergencia",
-                f"El método no convergió después de {max_iter} iteraciones."
-            )
-            return
+    def finish_calculation(self):
+        self.token = None
+        self.stop_button['state'] = 'disabled'
+
+    def show_result(self, func_str, f, f_sympy, f_prime_sympy, xi, history, method, monitor):
+        """Muestra la raíz encontrada y habilita la gráfica."""
+        i = len(history)
+
+        # Guardar valores para la gráfica
+        self.x_values = history.column('x').tolist()
+        self.f_values = history.column('f(x)').tolist()
+        self.roots = history.column('x_next').tolist()
+        self.found_roots = [xi]
 
         # Verificación final
         try:
@@ -446,7 +797,12 @@ class NewtonRaphsonApp:
             return
 
         # Mostrar resultados en ventana emergente
-        result_message = f"Raíz encontrada: {xi}\nNúmero de iteraciones: {i}\nf(x) = {final_f}"
+        result_message = f"Método: {method}\nRaíz encontrada: {xi}\nNúmero de iteraciones: {i}\nf(x) = {final_f}"
+        result_message += f"\n{monitor.summary()}"
+        # Si f es un polinomio, se muestran además todas sus raíces (reales y complejas)
+        all_roots = polynomial_roots(func_str)
+        if all_roots is not None:
+            result_message += "\nRaíces del polinomio: " + ", ".join(self.format_root(z) for z in all_roots)
         messagebox.showinfo("Resultados", result_message)
 
         # Mostrar resultados en la interfaz
@@ -462,13 +818,55 @@ class NewtonRaphsonApp:
         self.f_sympy = f_sympy
         self.f_prime_sympy = f_prime_sympy
 
+    def show_deflation_result(self, func_str, f, f_sympy, f_prime_sympy, x0, roots, history, count):
+        """Muestra las raíces extraídas con deflación y las iteraciones de cada corrida."""
+        # En la gráfica los iterados se dibujan sobre f (la traza guarda el valor deflactado)
+        self.x_values = history.column('x').tolist()
+        self.roots = history.column('x_next').tolist()
+        try:
+            self.f_values = [float(f(x)) for x in self.x_values]
+            final_f = [float(f(r)) for r in roots]
+        except Exception as e:
+            messagebox.showerror("Error en la Evaluación Final", f"Error al evaluar f(x):\n{e}")
+            return
+        self.found_roots = roots
+
+        root_index = history.column('root_index')
+        deflated = history.column('deflated')
+        lines = [f"Método: Newton-Raphson con deflación", f"Raíces encontradas: {len(roots)} de {count}"]
+        for k, (r, f_r) in enumerate(zip(roots, final_f), start=1):
+            run = root_index == k
+            lines.append(f"  x = {r} ({int((run & (deflated == 1)).sum())} iteraciones + "
+                         f"{int((run & (deflated == 0)).sum())} de pulido), f(x) = {f_r}")
+        if len(roots) < count:
+            lines.append(f"No se encontraron más raíces partiendo de x₀ = {x0}.")
+        lines.append(f"Total de iteraciones: {len(history)}")
+        result_message = "\n".join(lines)
+        all_roots = polynomial_roots(func_str)
+        if all_roots is not None:
+            result_message += "\nRaíces del polinomio: " + ", ".join(self.format_root(z) for z in all_roots)
+        messagebox.showinfo("Resultados", result_message)
+
+        self.result_label.config(text=result_message)
+        self.final_result = result_message
+        self.graph_button['state'] = 'normal'
+        self.f_sympy = f_sympy
+        self.f_prime_sympy = f_prime_sympy
+
+    def format_root(self, z):
+        """Da formato a una raíz del polinomio; las casi reales se muestran como reales."""
+        if abs(z.imag) <= REAL_TOLERANCE * max(1.0, abs(z)):
+            return f"{z.real:.6f}"
+        sign = '+' if z.imag > 0 else '-'
+        return f"{z.real:.6f} {sign} {abs(z.imag):.6f}i"
+
     def get_function_inputs(self):
         """Obtiene y valida las entradas de las funciones."""
         func_str = self.func_entry.get().strip()
         deriv_str = self.deriv_entry.get().strip()
 
-        if not all([func_str, deriv_str]):
-            raise ValueError("Por favor, completa las entradas de las funciones.")
+        if not func_str:
+            raise ValueError("Por favor, ingresa la función f(x).")
 
         # Reemplazar ^ por ** para manejar exponentes
         func_str = func_str.replace('^', '**')
@@ -498,12 +896,22 @@ class NewtonRaphsonApp:
 
         return x0, tol, max_iter
 
+    def get_root_count(self):
+        """Obtiene y valida cuántas raíces se buscan con deflación."""
+        try:
+            count = int(self.roots_entry.get().strip())
+            if count < 1:
+                raise ValueError
+        except ValueError:
+            raise ValueError("El número de raíces debe ser un entero positivo.")
+        return count
+
     def parse_functions(self, func_str, deriv_str):
-        """Parsea las funciones usando SymPy."""
-        x, y = sp.symbols('x y')
-        f_sympy = parse_expr(func_str, transformations=self.transformations)
-        f_prime_sympy = parse_expr(deriv_str, transformations=self.transformations)
-        return f_sympy, f_prime_sympy
+        """
+        Parsea las funciones con el parser compartido y las convierte a SymPy.
+        Si no se ingresó la derivada, se calcula simbólicamente.
+        """
+        return parse_sympy_functions(func_str, deriv_str)
 
     def show_graph(self):
         """Muestra la gráfica de la función y permite interacción en tiempo real."""
@@ -566,6 +974,86 @@ class NewtonRaphsonApp:
         except Exception as e:
             messagebox.showerror("Error en la Graficación", f"Hubo un error al graficar:\n{e}")
 
+    def show_basins(self):
+        """
+        Abre la ventana de multi-inicio: Newton desde una malla de puntos iniciales de la recta
+        real o del plano complejo, con las raíces distintas encontradas y sus cuencas de atracción.
+        """
+        try:
+            func_str, _ = self.get_function_inputs()
+            _, tol, max_iter = self.get_parameters()
+        except ValueError as e:
+            messagebox.showerror("Error de Entrada", str(e))
+            return
+
+        basins_window = tk.Toplevel(self.master)
+        basins_window.title("Multi-inicio - Cuencas de atracción de Newton")
+        basins_window.geometry("900x750")
+        basins_window.configure(bg=BG_COLOR)
+
+        options_frame = tk.Frame(basins_window, bg=BG_COLOR)
+        options_frame.pack(fill='x', pady=5)
+
+        domain_var = tk.StringVar(value="Plano complejo")
+        ttk.OptionMenu(options_frame, domain_var, "Plano complejo", "Plano complejo", "Recta real").grid(
+            row=0, column=0, padx=5, pady=2)
+
+        entries = {}
+        for column, (label_text, default) in enumerate(
+                [("Re mín:", "-2"), ("Re máx:", "2"), ("Im mín:", "-2"), ("Im máx:", "2"),
+                 ("Resolución:", str(DEFAULT_RESOLUTION))]):
+            tk.Label(options_frame, text=label_text, font=FONT, fg=FG_COLOR, bg=BG_COLOR).grid(
+                row=column // 3, column=1 + 2 * (column % 3), sticky='e', padx=5, pady=2)
+            entry = ttk.Entry(options_frame, width=8, font=FONT)
+            entry.grid(row=column // 3, column=2 + 2 * (column % 3), padx=5, pady=2)
+            entry.insert(0, default)
+            entries[label_text] = entry
+
+        figure = Figure(figsize=(8, 6), dpi=100)
+        ax = figure.add_subplot(111)
+        canvas = FigureCanvasTkAgg(figure, master=basins_window)
+        canvas.get_tk_widget().pack(fill='both', expand=True)
+
+        roots_label = tk.Label(basins_window, text="", font=FONT, fg=FG_COLOR, bg=BG_COLOR, justify='left')
+        roots_label.pack(fill='x', pady=5)
+
+        def compute():
+            try:
+                x_range = (float(entries["Re mín:"].get()), float(entries["Re máx:"].get()))
+                y_range = (float(entries["Im mín:"].get()), float(entries["Im máx:"].get()))
+                resolution = int(entries["Resolución:"].get())
+                if x_range[0] >= x_range[1] or y_range[0] >= y_range[1] or resolution < 2:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error de Entrada", "Los límites deben ser números (mín < máx) y la resolución un entero mayor que 1.", parent=basins_window)
+                return
+
+            if domain_var.get() == "Recta real":
+                y_range = None
+            try:
+                basins = basin_map(func_str, x_range, y_range, resolution, tol, max_iter)
+            except ValueError as e:
+                messagebox.showerror("Error en la Función", str(e), parent=basins_window)
+                return
+
+            ax.clear()
+            plot_basins(ax, basins, max_iter)
+            canvas.draw()
+
+            # Raíces distintas, de la que atrae más puntos iniciales a la que atrae menos
+            found = sorted(zip(basins['counts'], basins['roots']), key=lambda item: -item[0])
+            total = basins['labels'].size
+            lines = [f"{self.format_root(complex(root))}: {count / total:.1%} de los puntos" for count, root in found[:8]]
+            if len(found) > 8:
+                lines.append(f"... y {len(found) - 8} raíces más")
+            not_converged = int((basins['labels'] < 0).sum())
+            roots_label.config(
+                text=f"Raíces distintas: {len(found)} (sin converger: {not_converged / total:.1%})\n" + "\n".join(lines))
+
+        ttk.Button(options_frame, text="Calcular", command=compute, width=12).grid(
+            row=1, column=0, padx=5, pady=2)
+        compute()
+
     def plot_graph(self):
         """Realiza la gráfica según el tipo seleccionado."""
         self.ax.clear()
@@ -590,9 +1078,9 @@ class NewtonRaphsonApp:
         # Graficar las iteraciones de Newton-Raphson
         self.ax.plot(self.x_values, self.f_values, 'ro-', label='Iteraciones')
 
-        # Graficar la raíz encontrada
+        # Graficar las raíces encontradas
         self.ax.axhline(0, color='black', linewidth=0.5)
-        self.ax.plot(self.roots[-1], 0, 'go', label='Raíz')
+        self.ax.plot(self.found_roots, [0] * len(self.found_roots), 'go', label='Raíz' if len(self.found_roots) == 1 else 'Raíces')
 
         # Configurar la gráfica
         self.ax.set_xlabel('x')
@@ -621,22 +1109,18 @@ class NewtonRaphsonApp:
         self.ax.set_title('Método de Newton-Raphson (3D)')
 
     def f(self, x_val):
-        """Evalúa f(x) usando SymPy."""
+        """Evalúa f(x) con la función calculada en compute_root (sin volver a parsear)."""
         try:
-            func_str = self.func_entry.get().replace('^', '**')
-            f_sympy = parse_expr(func_str, transformations=self.transformations)
-            f_lambdified = sp.lambdify(sp.symbols('x'), f_sympy, modules=['numpy', 'sympy'])
+            f_lambdified = cached_lambdify(self.f_sympy, (sp.Symbol('x'),))
             return f_lambdified(x_val)
         except Exception as e:
             messagebox.showerror("Error en la Evaluación de f(x)", f"Hubo un error al evaluar f(x):\n{e}")
             return None
 
     def f_3d(self, x_val, y_val):
-        """Evalúa f(x, y) para gráficas 3D usando SymPy."""
+        """Evalúa f(x, y) para gráficas 3D con la función calculada en compute_root."""
         try:
-            func_str = self.func_entry.get().replace('^', '**')
-            f_sympy = parse_expr(func_str, transformations=self.transformations)
-            f_lambdified = sp.lambdify((sp.symbols('x'), sp.symbols('y')), f_sympy, modules=['numpy', 'sympy'])
+            f_lambdified = cached_lambdify(self.f_sympy, (sp.Symbol('x'), sp.Symbol('y')))
             return f_lambdified(x_val, y_val)
         except Exception as e:
             messagebox.showerror("Error en la Evaluación de f(x, y)", f"Hubo un error al evaluar f(x, y):\n{e}")
@@ -673,13 +1157,15 @@ class NewtonRaphsonApp:
         defaults = {
             'x0_entry': "1.5",
             'max_iter_entry': "100",
-            'tol_entry': "0.0001"
+            'tol_entry': "0.0001",
+            'roots_entry': "1"
         }
         for var, default in defaults.items():
             entry = getattr(self, var, None)
             if entry:
                 entry.delete(0, tk.END)
                 entry.insert(0, default)
+        self.method_var.set(NEWTON_VARIANTS[0])
 
     def reset_drag_data(self):
         """Resetea los datos de arrastre."""
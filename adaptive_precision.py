@@ -0,0 +1,239 @@
+# adaptive_precision.py
+
+import math
+from functools import lru_cache
+
+import mpmath
+import numpy as np
+
+from expression_derivative import outer_derivative
+from expression_optimizer import children, generate_function_source, load_function, rebuild
+from expression_parser import canonical_expression, to_source
+from function_evaluator import generated_source, shared_function
+
+# Unidad de redondeo de float64
+UNIT_ROUNDOFF = 2.0 ** -53
+
+# Dígitos decimales con los que se reevalúan los puntos dudosos; se duplican hasta que
+# dos evaluaciones sucesivas coinciden o se alcanza MAX_MP_DIGITS
+MP_DIGITS = 30
+MAX_MP_DIGITS = 960
+
+ZERO = ('num', 0)
+
+MPMATH_NAMESPACE = {
+    'sin': mpmath.sin, 'cos': mpmath.cos, 'tan': mpmath.tan,
+    'asin': mpmath.asin, 'acos': mpmath.acos, 'atan': mpmath.atan,
+    'sinh': mpmath.sinh, 'cosh': mpmath.cosh, 'tanh': mpmath.tanh,
+    'asinh': mpmath.asinh, 'acosh': mpmath.acosh, 'atanh': mpmath.atanh,
+    'sec': mpmath.sec, 'csc': mpmath.csc, 'cot': mpmath.cot,
+    'exp': mpmath.exp, 'log': mpmath.log,
+    'log10': lambda x: mpmath.log(x, 10), 'log2': lambda x: mpmath.log(x, 2),
+    'sqrt': mpmath.sqrt, 'abs': mpmath.fabs,
+    'pi': mpmath.pi, 'e': mpmath.e,
+}
+
+
+def _abs(node):
+    return ('call', 'abs', node)
+
+
+def _sum(*terms):
+    terms = [term for term in terms if term != ZERO]
+    if not terms:
+        return ZERO
+    total = terms[0]
+    for term in terms[1:]:
+        total = ('add', total, term)
+    return total
+
+
+def _scaled(node, factor):
+    return ('mul', ('num', factor), _abs(node))
+
+
+def error_bound(node):
+    """
+    Construye el AST de una cota del error de redondeo acumulado al evaluar node en float64
+    (análisis de error en ejecución): cada operación aporta u·|resultado| más el error de sus
+    operandos amplificado por la sensibilidad de la operación.
+    """
+    kind = node[0]
+    if kind == 'num':
+        return ZERO if isinstance(node[1], int) else ('num', abs(node[1]) * UNIT_ROUNDOFF)
+    if kind == 'var':
+        return ZERO
+    if kind == 'const':
+        return ('num', (math.pi if node[1] == 'pi' else math.e) * UNIT_ROUNDOFF)
+    if kind == 'neg':
+        return error_bound(node[1])
+    if kind == 'call':
+        argument = node[2]
+        e_arg = error_bound(argument)
+        propagated = ZERO if e_arg == ZERO else ('mul', _abs(outer_derivative(node[1], argument)), e_arg)
+        return _sum(_scaled(node, 2 * UNIT_ROUNDOFF), propagated)
+
+    a, b = node[1], node[2]
+    e_a, e_b = error_bound(a), error_bound(b)
+    # Las potencias enteras pequeñas se expanden en hasta tres multiplicaciones
+    own = _scaled(node, (3 if kind == 'pow' else 1) * UNIT_ROUNDOFF)
+    if kind in ('add', 'sub'):
+        return _sum(own, e_a, e_b)
+    if kind == 'mul':
+        return _sum(
+            own,
+            ZERO if e_b == ZERO else ('mul', _abs(a), e_b),
+            ZERO if e_a == ZERO else ('mul', _abs(b), e_a),
+        )
+    if kind == 'div':
+        numerator = _sum(e_a, ZERO if e_b == ZERO else ('mul', _abs(node), e_b))
+        return _sum(own, ZERO if numerator == ZERO else ('div', numerator, _abs(b)))
+    # Potencia: d(a^b)/da = b·a^(b-1), d(a^b)/db = a^b·log|a|
+    return _sum(
+        own,
+        ZERO if e_a == ZERO else ('mul', _abs(('mul', b, ('pow', a, ('sub', b, ('num', 1))))), e_a),
+        ZERO if e_b == ZERO else ('mul', _abs(('mul', node, ('call', 'log', _abs(a)))), e_b),
+    )
+
+
+def _mp_literals(node, literals):
+    """
+    Sustituye los literales decimales por nombres que se resuelven como mpf exactos
+    ('0.1' -> mpf('0.1')), para no arrastrar el error de su representación en float.
+    """
+    if node[0] == 'num':
+        if isinstance(node[1], int):
+            return node
+        name = f"_c{len(literals)}"
+        with mpmath.workdps(MAX_MP_DIGITS):
+            literals[name] = mpmath.mpf(repr(node[1]))
+        return ('tmp', name)
+    if node[0] in ('var', 'const', 'tmp'):
+        return node
+    return rebuild(node, [_mp_literals(child, literals) for child in children(node)])
+
+
+@lru_cache(maxsize=128)
+def compile_mpmath_function(func_str):
+    """
+    Compila la función para evaluarla con mpmath (sin plegar constantes en float).
+    """
+    try:
+        literals = {}
+        tree = _mp_literals(canonical_expression(func_str), literals)
+        # Sin optimizar: el plegado de constantes se haría en float64
+        source = f"def f(x):\n    return {to_source(tree)}"
+        compiled_func = load_function(source, {**MPMATH_NAMESPACE, **literals})
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def evaluate(x, digits):
+        with mpmath.workdps(digits):
+            try:
+                value = compiled_func(mpmath.mpf(x))
+            except Exception as e:
+                raise ValueError(f"Error al evaluar la función: {e}")
+            if isinstance(value, mpmath.mpc):
+                if value.imag != 0:
+                    raise ValueError("Error al evaluar la función: resultado complejo.")
+                value = value.real
+            return float(value)
+
+    def f(x):
+        # Se duplica la precisión hasta que el resultado deja de cambiar (la cancelación
+        # puede consumir más dígitos de los disponibles y dar 0 o un signo equivocado)
+        digits = MP_DIGITS
+        value = evaluate(x, digits)
+        while digits < MAX_MP_DIGITS:
+            digits *= 2
+            refined = evaluate(x, digits)
+            if refined != 0 and abs(refined - value) <= 1e-15 * abs(refined):
+                return refined
+            value = refined
+        return value
+
+    return f
+
+
+def _value_and_error_source(func_str):
+    # Código de una función que devuelve (f(x), cota del error de redondeo de f(x))
+    def build():
+        tree = canonical_expression(func_str)
+        return generate_function_source([tree, error_bound(tree)])
+
+    return generated_source('value_and_error', func_str, ('x',), build)
+
+
+@lru_cache(maxsize=128)
+def vectorize_value_and_error(func_str):
+    """
+    Versión vectorizada (NumPy) de f junto con su cota de error: devuelve dos arreglos
+    (valores, cotas) con la forma de x. Donde f no está definida ambos son NaN.
+    """
+    try:
+        fused = shared_function(_value_and_error_source(func_str), 'numpy')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def f(x_vals):
+        x_vals = np.asarray(x_vals, dtype=float)
+        try:
+            with np.errstate(all='ignore'):
+                value, bound = fused(x_vals)
+        except Exception as e:
+            raise ValueError(f"Error en la expresión: {e}")
+        value = np.array(np.broadcast_to(value, x_vals.shape), dtype=float)
+        bound = np.array(np.broadcast_to(bound, x_vals.shape), dtype=float)
+        return value, bound
+
+    return f
+
+
+@lru_cache(maxsize=128)
+def _compile_value_and_error(func_str):
+    try:
+        return shared_function(_value_and_error_source(func_str), 'math')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+
+def compile_adaptive_function(func_str):
+    """
+    Devuelve un callable f(x) que evalúa en float64 junto con una cota del error de redondeo.
+    Solo cuando |f(x)| no supera esa cota (el signo no es confiable, típicamente cerca de
+    una raíz) el punto se reevalúa con mpmath a MP_DIGITS dígitos. El atributo 'escalations'
+    cuenta cuántas veces fue necesario. Las partes compiladas se reutilizan, pero cada
+    llamada devuelve un callable nuevo, así que el contador es propio de cada ejecución.
+    """
+    fused = _compile_value_and_error(func_str)
+    precise = compile_mpmath_function(func_str)
+
+    def f(x):
+        try:
+            value, bound = fused(x)
+            # Se duplica la cota para cubrir los términos de segundo orden
+            if abs(value) > 2 * bound:
+                return value
+        except (ValueError, ArithmeticError, TypeError):
+            pass
+        f.escalations += 1
+        return precise(x)
+
+    f.escalations = 0
+    return f
+
+
+if __name__ == "__main__":
+    # (x-1)^7 expandido: en float64 la cancelación hace que el signo cerca de x = 1 sea aleatorio
+    import numpy as np
+
+    from Biseccion import bisection_method
+
+    expression = "x^7 - 7x^6 + 21x^5 - 35x^4 + 35x^3 - 21x^2 + 7x - 1"
+    for adaptive in (False, True):
+        root, iterations, _ = bisection_method(expression, 0.5, 1.6, 1e-12, adaptive=adaptive)
+        print(f"adaptativa={adaptive}: raíz = {root!r} en {iterations} iteraciones")
+    f = compile_adaptive_function(expression)
+    for x in np.linspace(0.9, 1.1, 201):
+        f(float(x))
+    print(f"reevaluaciones con mpmath en 201 puntos de [0.9, 1.1]: {f.escalations}")
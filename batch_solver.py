@@ -0,0 +1,253 @@
+# batch_solver.py
+
+import importlib.machinery
+import importlib.util
+import math
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from convergence import STOP_FAILURE, STOP_TIMEOUT, ConvergenceMonitor
+
+# Tiempo máximo por ejercicio (segundos) y ejercicios que un proceso resuelve por envío
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CHUNK_SIZE = 64
+
+# Métodos disponibles: nombre -> (módulo, función). Los módulos se cargan en cada proceso
+# solo cuando se usa uno de sus métodos (Newton importa SymPy, que tarda en cargar).
+METHODS = {
+    'biseccion': ('Biseccion', 'bisection_method'),
+    'falsa_posicion': ('BúsquedaRaíces', 'falsa_posicion'),
+    'brent': ('BúsquedaRaíces', 'brent'),
+    'itp': ('BúsquedaRaíces', 'itp'),
+    'secante': ('BúsquedaRaíces', 'secante'),
+    'punto_fijo': ('BúsquedaRaíces', 'punto_fijo'),
+    'steffensen': ('BúsquedaRaíces', 'steffensen'),
+    'newton': ('Newton', 'newton_raphson'),
+    'newton_seguro': ('Newton', 'rtsafe_steps'),
+    'halley': ('Newton', 'halley_steps'),
+}
+
+_modules = {}
+
+
+def _load_module(name):
+    """
+    Importa un módulo de la aplicación una sola vez por proceso. BúsquedaRaíces.PY no
+    se puede importar con 'import' (extensión .PY), así que se carga desde su ruta.
+    """
+    if name not in _modules:
+        if name == 'BúsquedaRaíces':
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'BúsquedaRaíces.PY')
+            loader = importlib.machinery.SourceFileLoader('busqueda_raices', path)
+            spec = importlib.util.spec_from_loader('busqueda_raices', loader)
+            module = importlib.util.module_from_spec(spec)
+            loader.exec_module(module)
+        else:
+            module = importlib.import_module(name)
+        _modules[name] = module
+    return _modules[name]
+
+
+def _newton(func, x0, tol, max_iter=100, derivative='', monitor=None):
+    # Sin derivada escrita se usa la derivada automática del parser compartido
+    from function_evaluator import compile_function, compile_value_and_derivative
+
+    if derivative:
+        f, f_prime = compile_function(func), compile_function(derivative)
+        f_and_prime = lambda x: (f(x), f_prime(x))
+    else:
+        f_and_prime = compile_value_and_derivative(func)
+    return _load_module('Newton').newton_raphson(f_and_prime, x0, tol, max_iter, monitor)
+
+
+def _newton_variant(method):
+    # Newton con salvaguarda busca su intervalo alrededor de x0; Halley usa f''
+    from convergence import monitored_steps
+    from function_evaluator import compile_value_and_derivative, compile_value_and_derivatives
+    from iteration_trace import NEWTON_COLUMNS, IterationTrace
+    from solver_stream import run_steps
+
+    newton = _load_module('Newton')
+
+    def solve(func, x0, tol, max_iter=100, monitor=None):
+        history = IterationTrace(NEWTON_COLUMNS)
+        if method == 'halley':
+            steps = newton.halley_steps(compile_value_and_derivatives(func, 2), x0, tol, max_iter)
+        else:
+            f_and_prime = compile_value_and_derivative(func)
+            a, b = newton.bracket_around(f_and_prime, x0)
+            steps = newton.rtsafe_steps(f_and_prime, x0, a, b, tol, max_iter)
+        if monitor is not None:
+            steps = monitored_steps(steps, monitor, NEWTON_COLUMNS)
+        root = run_steps(steps, history)
+        return root, len(history), history
+
+    return solve
+
+
+def resolve_method(method):
+    """
+    Devuelve la función que resuelve un ejercicio del método dado.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método desconocido: {method}. Opciones: {', '.join(METHODS)}.")
+    if method == 'newton':
+        return _newton
+    if method in ('newton_seguro', 'halley'):
+        return _newton_variant(method)
+    module_name, function_name = METHODS[method]
+    return getattr(_load_module(module_name), function_name)
+
+
+class _Timeout(BaseException):
+    # Deriva de BaseException para que los 'except Exception' del parser y de los métodos
+    # (que convierten cualquier error en ValueError) no la traten como un error de la función
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise _Timeout
+
+
+def _solve_one(index, method, func, params, timeout, include_history):
+    """
+    Resuelve un ejercicio y devuelve su resultado; nunca propaga excepciones.
+    """
+    result = {
+        'index': index,
+        'method': method,
+        'func': func,
+        'params': params,
+        'root': None,
+        'iterations': None,
+        'history': None,
+        'error': None,
+        'stop_reason': None,
+        'order': None,
+        'elapsed': 0.0,
+    }
+    monitor = ConvergenceMonitor()
+    # El límite de tiempo usa SIGALRM, que no existe en Windows; ahí solo limita max_iter
+    use_alarm = timeout is not None and hasattr(signal, 'setitimer')
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        try:
+            solver = resolve_method(method)
+            # La primera carga del módulo del método no cuenta como tiempo del ejercicio
+            start = time.perf_counter()
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            # El monitor detecta ciclos y divergencia y registra por qué se detuvo cada ejercicio
+            if isinstance(params, dict):
+                root, iterations, history = solver(func, **params, monitor=monitor)
+            else:
+                root, iterations, history = solver(func, *params, monitor=monitor)
+        finally:
+            # La alarma se desactiva antes de manejar el resultado, para que no llegue
+            # dentro de los bloques except
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        result['root'] = float(root)
+        result['iterations'] = iterations
+        if include_history:
+            result['history'] = history
+    except _Timeout:
+        timed_out = True
+        result['error'] = f"Tiempo límite excedido ({timeout} s)."
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    # Los errores anteriores a la primera iteración (por ejemplo, sin cambio de signo) no pasan por el monitor
+    if timed_out:
+        result['stop_reason'] = STOP_TIMEOUT
+    else:
+        result['stop_reason'] = monitor.reason or (STOP_FAILURE if result['error'] else None)
+    result['order'] = monitor.order
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def _solve_chunk(chunk, timeout, include_history):
+    if timeout is not None and hasattr(signal, 'setitimer'):
+        signal.signal(signal.SIGALRM, _raise_timeout)
+    return [_solve_one(*job, timeout, include_history) for job in chunk]
+
+
+def _chunks(jobs, size):
+    chunk = []
+    for index, job in enumerate(jobs):
+        method, func, params = job
+        chunk.append((index, method, func, params))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_batch(jobs, max_workers=None, timeout=DEFAULT_TIMEOUT, chunk_size=DEFAULT_CHUNK_SIZE,
+                include_history=False):
+    """
+    Resuelve un conjunto de ejercicios (method, func, params) en varios procesos y
+    devuelve sus resultados a medida que terminan (no en el orden de entrada; cada
+    resultado lleva su 'index'). params es una tupla o un diccionario con los argumentos
+    del método después de la función, por ejemplo ('biseccion', 'x^2 - 2', (0, 2, 1e-6)).
+    Los errores y los tiempos excedidos se informan en el campo 'error' del resultado;
+    'stop_reason' distingue los tiempos excedidos (STOP_TIMEOUT) de los fallos del método.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_solve_chunk, chunk, timeout, include_history): chunk
+            for chunk in _chunks(jobs, chunk_size)
+        }
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except BrokenProcessPool as e:
+                # Un proceso terminó abruptamente: se informa el error en todo su bloque
+                results = [
+                    {'index': index, 'method': method, 'func': func, 'params': params,
+                     'root': None, 'iterations': None, 'history': None,
+                     'error': f"El proceso de cálculo terminó inesperadamente: {e}",
+                     'stop_reason': None, 'order': None, 'elapsed': 0.0}
+                    for index, method, func, params in futures[future]
+                ]
+            yield from results
+
+
+def solve_all(jobs, **options):
+    """
+    Igual que solve_batch, pero espera a todos los ejercicios y los devuelve en orden.
+    """
+    return sorted(solve_batch(jobs, **options), key=lambda result: result['index'])
+
+
+if __name__ == "__main__":
+    import random
+
+    functions = ["x^3 - 4x + 1", "sin x - x/2", "exp x - 3x", "x^2 - 5", "cos x - x", "x^5 - x - 1"]
+    rng = random.Random(0)
+    jobs = []
+    for _ in range(2000):
+        func = rng.choice(functions)
+        # Las funciones del ejemplo son f(x); los métodos de punto fijo necesitan g(x)
+        method = rng.choice([m for m in METHODS if m not in ('punto_fijo', 'steffensen')])
+        x0, x1 = rng.uniform(-3, 0), rng.uniform(0.1, 3)
+        params = (x1, 1e-8) if method in ('newton', 'newton_seguro', 'halley') else (x0, x1, 1e-8, 100)
+        jobs.append((method, func, params))
+
+    start = time.perf_counter()
+    results = solve_all(jobs)
+    elapsed = time.perf_counter() - start
+    solved = [result for result in results if result['error'] is None]
+    print(f"{len(jobs)} ejercicios en {elapsed:.2f} s con {os.cpu_count()} núcleos: "
+          f"{len(solved)} resueltos, {len(jobs) - len(solved)} con error")
+    print("ejemplo de error:", next((r['error'] for r in results if r['error']), None))
+    reasons = {}
+    for result in results:
+        reasons[result['stop_reason']] = reasons.get(result['stop_reason'], 0) + 1
+    print("razones de parada:", reasons)
+    assert all(math.isfinite(result['root']) for result in solved)
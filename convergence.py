@@ -0,0 +1,268 @@
+# convergence.py
+
+import math
+
+from iteration_trace import ITERATE_COLUMNS
+
+# Razones de parada que informa el monitor
+STOP_METHOD = "criterio de parada del método"
+STOP_TOLERANCE = "tolerancia del monitor"
+STOP_EXACT = "raíz exacta (f(x) = 0)"
+STOP_ROUNDOFF = "límite del redondeo (los iterados ya no cambian)"
+STOP_STAGNATION = "estancamiento"
+STOP_CYCLE = "ciclo"
+STOP_DIVERGENCE = "divergencia"
+STOP_FAILURE = "error del método"
+STOP_CANCELLED = "cancelado"
+STOP_TIMEOUT = "tiempo límite excedido"
+# Razones con las que el último iterado se acepta como raíz
+CONVERGED_REASONS = (STOP_METHOD, STOP_TOLERANCE, STOP_EXACT, STOP_ROUNDOFF)
+
+# Los pasos menores que este múltiplo del redondeo no se usan para estimar el orden
+ORDER_NOISE_FACTOR = 64
+EPSILON = 2.0 ** -52
+# Detección temprana de fallos
+STAGNATION_WINDOW = 10
+# Hay estancamiento si además los iterados de la ventana caben en este ancho relativo
+STAGNATION_SPREAD = 1e-3
+MAX_CYCLE_LENGTH = 4
+# Un ciclo se acepta si x_k repite a x_{k-p} con un error menor que esta fracción de su amplitud
+CYCLE_TOLERANCE = 1e-6
+DIVERGENCE_WINDOW = 5
+# La divergencia por crecimiento solo se declara si |x| ya supera este múltiplo de max(1, |x_1|)
+DIVERGENCE_ESCAPE = 1e6
+DIVERGENCE_BOUND = 1e12
+
+
+def _noise(x):
+    return ORDER_NOISE_FACTOR * EPSILON * max(1.0, abs(x))
+
+
+def _increasing(values):
+    return all(q > p for p, q in zip(values, values[1:]))
+
+
+def estimate_order(iterates):
+    """
+    Estima el orden de convergencia q y la constante asintótica C (e_{k+1} ≈ C·e_k^q) con los
+    tres últimos pasos e_k = |x_{k+1} - x_k| que están por encima del redondeo:
+    q ≈ log(e_{k+1}/e_k) / log(e_k/e_{k-1}). Devuelve (None, None) si no hay suficientes
+    pasos decrecientes.
+    """
+    steps = [abs(q - p) for p, q in zip(iterates, iterates[1:]) if abs(q - p) > _noise(q)]
+    if len(steps) < 3:
+        return None, None
+    e0, e1, e2 = steps[-3:]
+    if not e0 > e1 > e2:
+        return None, None
+    order = math.log(e2 / e1) / math.log(e1 / e0)
+    try:
+        constant = e2 / e1 ** order
+    except (OverflowError, ZeroDivisionError):
+        # e1^q fuera del rango de float64
+        constant = None
+    return order, constant
+
+
+class ConvergenceMonitor:
+    """
+    Vigila los iterados de un método de raíces y decide cuándo detenerlo con criterios
+    comunes a todos los métodos:
+    - tolerancias opcionales: xtol sobre el paso |x_k - x_{k-1}|, rtol sobre el paso relativo
+      y ftol sobre |f(x_k)|; con require_all=True deben cumplirse todas las que se den y, si
+      no, basta una. Sin tolerancias, el método conserva su propio criterio de parada;
+    - fallos detectados antes de agotar max_iter: divergencia (iterados no finitos o fuera de
+      divergence_bound, o |x|, los pasos y |f| que crecen durante DIVERGENCE_WINDOW
+      iteraciones con x ya lejos del primer iterado),
+      ciclos (x_k repite a x_{k-p} para p <= MAX_CYCLE_LENGTH) y estancamiento (los iterados
+      quedan en una región pequeña sin que |f| mejore ni el paso se reduzca a la mitad en
+      STAGNATION_WINDOW iteraciones). Un ciclo o un estancamiento a nivel del redondeo se
+      acepta como convergencia. Los iterados que vagan sin acercarse a una raíz no se cortan
+      (pueden converger más adelante): los detiene max_iter.
+    Al terminar, reason dice por qué se detuvo y order/constant estiman el orden observado.
+    """
+
+    def __init__(self, xtol=None, rtol=None, ftol=None, require_all=False,
+                 stagnation_window=STAGNATION_WINDOW, divergence_bound=DIVERGENCE_BOUND):
+        self.xtol = xtol
+        self.rtol = rtol
+        self.ftol = ftol
+        self.require_all = require_all
+        self.stagnation_window = stagnation_window
+        self.divergence_bound = divergence_bound
+        self.reset()
+
+    def reset(self):
+        self.iterates = []
+        self.residuals = []
+        self.reason = None
+        self.message = None
+
+    @property
+    def iterations(self):
+        return len(self.iterates)
+
+    @property
+    def converged(self):
+        return self.reason in CONVERGED_REASONS
+
+    def _stop(self, reason, message=None):
+        self.reason = reason
+        self.message = message
+        return reason
+
+    def finish(self, reason, message=None):
+        """
+        Registra la razón de parada si el monitor todavía no detuvo el método.
+        """
+        if self.reason is None:
+            self._stop(reason, message)
+
+    def update(self, x, fx=None):
+        """
+        Registra un nuevo iterado (y f en él, si se conoce). Devuelve la razón de parada
+        si el método debe detenerse, o None para continuar.
+        """
+        self.iterates.append(x)
+        self.residuals.append(None if fx is None else abs(fx))
+        if fx == 0:
+            return self._stop(STOP_EXACT)
+        if not math.isfinite(x) or (fx is not None and not math.isfinite(fx)):
+            return self._stop(STOP_DIVERGENCE, f"El iterado o f(x) dejó de ser finito (x = {x}).")
+        if len(self.iterates) < 2:
+            return None
+
+        step = abs(x - self.iterates[-2])
+        checks = []
+        if self.xtol is not None:
+            checks.append(step < self.xtol)
+        if self.rtol is not None:
+            checks.append(step < self.rtol * abs(x))
+        if self.ftol is not None:
+            checks.append(fx is not None and abs(fx) < self.ftol)
+        if checks and (all(checks) if self.require_all else any(checks)):
+            return self._stop(STOP_TOLERANCE)
+
+        return self._check_divergence() or self._check_cycle() or self._check_stagnation()
+
+    def _steps(self, count):
+        xs = self.iterates[-count - 1:]
+        return [abs(q - p) for p, q in zip(xs, xs[1:])]
+
+    def _check_divergence(self):
+        x = self.iterates[-1]
+        scale = max(1.0, abs(self.iterates[0]))
+        if abs(x) > self.divergence_bound * scale:
+            return self._stop(STOP_DIVERGENCE, f"Los iterados se alejan sin límite (x = {x}).")
+        if len(self.iterates) <= DIVERGENCE_WINDOW or abs(x) < DIVERGENCE_ESCAPE * scale:
+            return None
+        steps = self._steps(DIVERGENCE_WINDOW)
+        sizes = [abs(value) for value in self.iterates[-DIVERGENCE_WINDOW:]]
+        residuals = self.residuals[-DIVERGENCE_WINDOW:]
+        if _increasing(steps) and _increasing(sizes) and (None in residuals or _increasing(residuals)):
+            return self._stop(STOP_DIVERGENCE, f"|x|, los pasos y |f(x)| crecen en las últimas {DIVERGENCE_WINDOW} iteraciones (x = {x}).")
+        return None
+
+    def _check_cycle(self):
+        xs = self.iterates
+        for length in range(2, MAX_CYCLE_LENGTH + 1):
+            if len(xs) < 2 * length:
+                break
+            cycle = xs[-length:]
+            spread = max(cycle) - min(cycle)
+            tolerance = max(CYCLE_TOLERANCE * spread, _noise(xs[-1]))
+            if all(abs(xs[-1 - k] - xs[-1 - k - length]) <= tolerance for k in range(length)):
+                if spread <= _noise(xs[-1]):
+                    return self._stop(STOP_ROUNDOFF)
+                return self._stop(STOP_CYCLE, f"Los iterados repiten un ciclo de {length} valores: "
+                                              f"{', '.join(f'{value:.6g}' for value in cycle)}.")
+        return None
+
+    def _check_stagnation(self):
+        window = self.stagnation_window
+        if len(self.iterates) <= window + 1:
+            return None
+        steps = self._steps(window + 1)
+        if steps[-1] <= _noise(self.iterates[-1]) and steps[-2] <= _noise(self.iterates[-2]):
+            return self._stop(STOP_ROUNDOFF)
+        if min(steps[1:]) < steps[0] / 2:
+            return None
+        recent = self.iterates[-window:]
+        if max(recent) - min(recent) > STAGNATION_SPREAD * max(1.0, abs(recent[-1])):
+            return None
+        residuals = [r for r in self.residuals if r is not None]
+        if len(residuals) > window and min(residuals[-window:]) < min(residuals[:-window]):
+            return None
+        return self._stop(STOP_STAGNATION, f"El método no avanza en las últimas {window} iteraciones (x = {self.iterates[-1]}).")
+
+    @property
+    def order(self):
+        return estimate_order(self.iterates)[0]
+
+    @property
+    def constant(self):
+        return estimate_order(self.iterates)[1]
+
+    def failure_message(self):
+        return f"El método se detuvo por {self.reason}. {self.message or ''}".strip()
+
+    def summary(self):
+        """
+        Texto con la razón de parada y el orden estimado, para mostrarlo junto al resultado.
+        """
+        lines = [f"Criterio de parada: {self.reason or 'sin terminar'}"]
+        order, constant = estimate_order(self.iterates)
+        if order is not None:
+            line = f"Orden de convergencia estimado: {order:.2f}"
+            if constant is not None:
+                line += f" (constante asintótica ≈ {constant:.3g})"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def monitored_steps(steps, monitor, columns):
+    """
+    Recorre un generador de iteraciones cuyos registros tienen las columnas dadas y pasa a
+    monitor el iterado y f en él (ITERATE_COLUMNS) de cada registro. Si el monitor decide
+    parar, cierra el generador y devuelve el último iterado como raíz (o lanza ValueError si
+    la razón es un fallo); si el método termina antes, su raíz se devuelve sin cambios.
+    """
+    x_column, f_column = ITERATE_COLUMNS[tuple(columns)]
+    x_index, f_index = columns.index(x_column), columns.index(f_column)
+    while True:
+        try:
+            record = next(steps)
+        except StopIteration as stop:
+            monitor.finish(STOP_METHOD if stop.value is not None else STOP_CANCELLED)
+            return stop.value
+        except ValueError as e:
+            monitor.finish(STOP_FAILURE, str(e))
+            raise
+        yield record
+        reason = monitor.update(record[x_index], record[f_index])
+        if reason is not None:
+            steps.close()
+            if monitor.converged:
+                return record[x_index]
+            raise ValueError(monitor.failure_message())
+
+
+if __name__ == "__main__":
+    # Newton detectado en ciclo y en divergencia antes de agotar las iteraciones
+    from Newton import newton_raphson
+    from function_evaluator import compile_value_and_derivative
+    from Biseccion import bisection_method
+
+    for expression, x0 in [("x^3 - 2x + 2", 0.0), ("atan(x)", 1.5), ("x^3 - 2x - 5", 2.0), ("(x - 1)^2", 3.0)]:
+        monitor = ConvergenceMonitor()
+        try:
+            root, iterations, _ = newton_raphson(compile_value_and_derivative(expression), x0, 1e-14, monitor=monitor)
+            print(f"{expression}: raíz {root} en {iterations} iteraciones")
+        except ValueError as e:
+            print(f"{expression}: {e}")
+        print("  " + monitor.summary().replace("\n", "\n  "))
+
+    # Criterio combinado: paso relativo y residuo a la vez
+    monitor = ConvergenceMonitor(rtol=1e-6, ftol=1e-8, require_all=True)
+    root, iterations, _ = bisection_method("sen(2*x)-log(x)", 1, 2, 1e-15, monitor=monitor)
+    print(f"bisección con rtol y ftol: {root} en {iterations} iteraciones\n  " + monitor.summary().replace("\n", "\n  "))
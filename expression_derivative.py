@@ -0,0 +1,153 @@
+# expression_derivative.py
+
+ZERO = ('num', 0)
+ONE = ('num', 1)
+
+
+def _add(a, b):
+    if a == ZERO:
+        return b
+    if b == ZERO:
+        return a
+    return ('add', a, b)
+
+
+def _sub(a, b):
+    if b == ZERO:
+        return a
+    if a == ZERO:
+        return _neg(b)
+    return ('sub', a, b)
+
+
+def _neg(a):
+    if a == ZERO:
+        return ZERO
+    if a[0] == 'neg':
+        return a[1]
+    return ('neg', a)
+
+
+def _mul(a, b):
+    if a == ZERO or b == ZERO:
+        return ZERO
+    if a == ONE:
+        return b
+    if b == ONE:
+        return a
+    return ('mul', a, b)
+
+
+def _div(a, b):
+    if a == ZERO:
+        return ZERO
+    if b == ONE:
+        return a
+    return ('div', a, b)
+
+
+def _call(function, a):
+    return ('call', function, a)
+
+
+def _square(a):
+    return ('pow', a, ('num', 2))
+
+
+def depends_on(node, variable):
+    """
+    Indica si el subárbol contiene la variable.
+    """
+    kind = node[0]
+    if kind == 'var':
+        return node[1] == variable
+    if kind in ('num', 'const'):
+        return False
+    if kind == 'neg':
+        return depends_on(node[1], variable)
+    if kind == 'call':
+        return depends_on(node[2], variable)
+    return depends_on(node[1], variable) or depends_on(node[2], variable)
+
+
+def outer_derivative(function, u):
+    """
+    Derivada de cada función respecto a su argumento u (regla de la cadena).
+    """
+    if function == 'sin':
+        return _call('cos', u)
+    if function == 'cos':
+        return _neg(_call('sin', u))
+    if function == 'tan':
+        return _add(ONE, _square(_call('tan', u)))
+    if function == 'asin':
+        return _div(ONE, _call('sqrt', _sub(ONE, _square(u))))
+    if function == 'acos':
+        return _neg(_div(ONE, _call('sqrt', _sub(ONE, _square(u)))))
+    if function == 'atan':
+        return _div(ONE, _add(ONE, _square(u)))
+    if function == 'sinh':
+        return _call('cosh', u)
+    if function == 'cosh':
+        return _call('sinh', u)
+    if function == 'tanh':
+        return _sub(ONE, _square(_call('tanh', u)))
+    if function == 'asinh':
+        return _div(ONE, _call('sqrt', _add(_square(u), ONE)))
+    if function == 'acosh':
+        return _div(ONE, _call('sqrt', _sub(_square(u), ONE)))
+    if function == 'atanh':
+        return _div(ONE, _sub(ONE, _square(u)))
+    if function == 'sec':
+        return _mul(_call('sec', u), _call('tan', u))
+    if function == 'csc':
+        return _neg(_mul(_call('csc', u), _call('cot', u)))
+    if function == 'cot':
+        return _neg(_square(_call('csc', u)))
+    if function == 'exp':
+        return _call('exp', u)
+    if function == 'log':
+        return _div(ONE, u)
+    if function == 'log10':
+        return _div(ONE, _mul(u, _call('log', ('num', 10))))
+    if function == 'log2':
+        return _div(ONE, _mul(u, _call('log', ('num', 2))))
+    if function == 'sqrt':
+        return _div(ONE, _mul(('num', 2), _call('sqrt', u)))
+    if function == 'abs':
+        return _div(u, _call('abs', u))
+    raise ValueError(f"No se conoce la derivada de '{function}'.")
+
+
+def differentiate(node, variable='x'):
+    """
+    Deriva simbólicamente el AST del parser respecto a la variable.
+    El resultado reutiliza los mismos subárboles que la función original (por ejemplo sin(2x)
+    aparece en f y en f'), de modo que al compilarlos juntos se calculan una sola vez.
+    """
+    kind = node[0]
+    if kind in ('num', 'const'):
+        return ZERO
+    if kind == 'var':
+        return ONE if node[1] == variable else ZERO
+    if kind == 'neg':
+        return _neg(differentiate(node[1], variable))
+    if kind == 'call':
+        return _mul(outer_derivative(node[1], node[2]), differentiate(node[2], variable))
+
+    a, b = node[1], node[2]
+    da, db = differentiate(a, variable), differentiate(b, variable)
+    if kind == 'add':
+        return _add(da, db)
+    if kind == 'sub':
+        return _sub(da, db)
+    if kind == 'mul':
+        return _add(_mul(da, b), _mul(a, db))
+    if kind == 'div':
+        return _div(_sub(_mul(da, b), _mul(a, db)), _square(b))
+    # Potencias
+    if not depends_on(b, variable):
+        return _mul(_mul(b, ('pow', a, _sub(b, ONE))), da)
+    if not depends_on(a, variable):
+        return _mul(_mul(node, _call('log', a)), db)
+    return _mul(node, _add(_mul(db, _call('log', a)), _div(_mul(b, da), a)))
@@ -0,0 +1,294 @@
+# expression_optimizer.py
+
+import ast
+import math
+from collections import Counter
+
+from expression_parser import CONSTANTS, FUNCTIONS, to_source
+
+LEAVES = ('num', 'var', 'const', 'tmp')
+
+# Potencias enteras pequeñas que se reescriben como multiplicaciones
+MAX_EXPANDED_POWER = 4
+
+FOLDABLE_FUNCTIONS = {
+    'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+    'asin': math.asin, 'acos': math.acos, 'atan': math.atan,
+    'sinh': math.sinh, 'cosh': math.cosh, 'tanh': math.tanh,
+    'asinh': math.asinh, 'acosh': math.acosh, 'atanh': math.atanh,
+    'sec': lambda v: 1 / math.cos(v), 'csc': lambda v: 1 / math.sin(v), 'cot': lambda v: 1 / math.tan(v),
+    'exp': math.exp, 'log': math.log, 'log10': math.log10, 'log2': math.log2,
+    'sqrt': math.sqrt, 'abs': abs,
+}
+
+
+def children(node):
+    """
+    Devuelve los subárboles de un nodo del AST.
+    """
+    kind = node[0]
+    if kind in LEAVES:
+        return ()
+    if kind == 'neg':
+        return (node[1],)
+    if kind == 'call':
+        return (node[2],)
+    return (node[1], node[2])
+
+
+def rebuild(node, new_children):
+    """
+    Reconstruye un nodo con nuevos subárboles, conservando su tipo.
+    """
+    kind = node[0]
+    if kind == 'neg':
+        return ('neg', new_children[0])
+    if kind == 'call':
+        return ('call', node[1], new_children[0])
+    return (kind, new_children[0], new_children[1])
+
+
+def _number(value):
+    # Solo se pliegan resultados finitos, para que el código generado siga siendo válido
+    if isinstance(value, complex) or not math.isfinite(value):
+        raise ArithmeticError
+    return ('num', value)
+
+
+def fold_constants(node):
+    """
+    Evalúa por adelantado las operaciones cuyos operandos son constantes y aplica
+    identidades simples (x*1, x+0, x^1, --x). Si una operación fallaría (1/0, log(-1)),
+    se deja intacta para que el error aparezca al evaluar, como antes.
+    """
+    kind = node[0]
+    if kind == 'const':
+        return ('num', math.pi if node[1] == 'pi' else math.e)
+    if kind in LEAVES:
+        return node
+    args = [fold_constants(child) for child in children(node)]
+    try:
+        if all(arg[0] == 'num' for arg in args):
+            values = [arg[1] for arg in args]
+            if kind == 'neg':
+                return _number(-values[0])
+            if kind == 'call':
+                return _number(FOLDABLE_FUNCTIONS[node[1]](values[0]))
+            if kind == 'add':
+                return _number(values[0] + values[1])
+            if kind == 'sub':
+                return _number(values[0] - values[1])
+            if kind == 'mul':
+                return _number(values[0] * values[1])
+            if kind == 'div':
+                return _number(values[0] / values[1])
+            return _number(float(values[0]) ** values[1])
+    except (ArithmeticError, ValueError, OverflowError):
+        pass
+
+    if kind == 'neg' and args[0][0] == 'neg':
+        return args[0][1]
+    if kind in ('add', 'sub') and args[1] == ('num', 0):
+        return args[0]
+    if kind == 'add' and args[0] == ('num', 0):
+        return args[1]
+    if kind in ('mul', 'div') and args[1] == ('num', 1):
+        return args[0]
+    if kind == 'mul' and args[0] == ('num', 1):
+        return args[1]
+    if kind == 'pow' and args[1] == ('num', 1):
+        return args[0]
+    return rebuild(node, args)
+
+
+def expand_powers(node):
+    """
+    Reescribe potencias enteras pequeñas como multiplicaciones (x^3 -> (x*x)*x, x^-2 -> 1/(x*x)).
+    Los factores repetidos se comparten y la eliminación de subexpresiones los calcula una sola vez.
+    """
+    if node[0] in LEAVES:
+        return node
+    node = rebuild(node, [expand_powers(child) for child in children(node)])
+    if node[0] == 'pow' and node[2][0] == 'num':
+        exponent = node[2][1]
+        if exponent == int(exponent) and 2 <= abs(exponent) <= MAX_EXPANDED_POWER:
+            base = node[1]
+            square = ('mul', base, base)
+            n = abs(int(exponent))
+            product = {2: square, 3: ('mul', square, base), 4: ('mul', square, square)}[n]
+            return product if exponent > 0 else ('div', ('num', 1.0), product)
+    return node
+
+
+def optimize(node):
+    """
+    Aplica el plegado de constantes y la expansión de potencias al AST.
+    """
+    return fold_constants(expand_powers(fold_constants(node)))
+
+
+def eliminate_common_subexpressions(outputs):
+    """
+    Detecta los subárboles repetidos (dentro de una salida o entre varias) y los extrae a
+    variables temporales. Devuelve la lista de asignaciones (nombre, subárbol) en orden de
+    dependencia y las expresiones finales de cada salida.
+    """
+    counts = Counter()
+
+    def count(subtree):
+        if subtree[0] in LEAVES:
+            return
+        counts[subtree] += 1
+        if counts[subtree] == 1:
+            for child in children(subtree):
+                count(child)
+
+    for node in outputs:
+        count(node)
+
+    temporaries = {}
+    assignments = []
+
+    def emit(subtree):
+        if subtree[0] in LEAVES:
+            return subtree
+        if subtree in temporaries:
+            return temporaries[subtree]
+        rebuilt = rebuild(subtree, [emit(child) for child in children(subtree)])
+        if counts[subtree] > 1:
+            name = f"_t{len(assignments)}"
+            assignments.append((name, rebuilt))
+            temporaries[subtree] = ('tmp', name)
+            return temporaries[subtree]
+        return rebuilt
+
+    results = [emit(node) for node in outputs]
+    return assignments, results
+
+
+def generate_function_source(node, variables=('x',), name='f'):
+    """
+    Genera el código de una función de Python optimizada a partir del AST.
+    Si node es una lista de AST, la función devuelve una tupla con todas las salidas
+    y comparte entre ellas las subexpresiones comunes.
+    """
+    outputs = node if isinstance(node, list) else [node]
+    assignments, results = eliminate_common_subexpressions([optimize(output) for output in outputs])
+    lines = [f"def {name}({', '.join(variables)}):"]
+    for temp_name, expression in assignments:
+        lines.append(f"    {temp_name} = {to_source(expression)}")
+    if isinstance(node, list):
+        lines.append(f"    return ({', '.join(to_source(result) for result in results)},)")
+    else:
+        lines.append(f"    return {to_source(results[0])}")
+    return "\n".join(lines)
+
+
+# Nodos de Python que puede producir generate_function_source
+_SOURCE_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+
+
+def is_generated_source(source, variables=('x',), name='f'):
+    """
+    Comprueba que source tenga exactamente la forma que produce generate_function_source:
+    una sola función name(variables) con asignaciones a temporales _tN y un return, cuyas
+    expresiones solo usan números, las variables, los temporales, las constantes y las
+    funciones del parser con un argumento, y los operadores + - * / ** y el signo menos.
+    Sirve para no ejecutar código leído de disco que no haya salido del generador.
+    """
+    try:
+        module = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return False
+    if len(module.body) != 1 or not isinstance(module.body[0], ast.FunctionDef):
+        return False
+    function = module.body[0]
+    arguments = function.args
+    if (function.name != name or function.decorator_list or function.returns
+            or arguments.posonlyargs or arguments.vararg or arguments.kwonlyargs or arguments.kwarg
+            or arguments.defaults or [arg.arg for arg in arguments.args] != list(variables)
+            or any(arg.annotation for arg in arguments.args)):
+        return False
+    *assignments, result = function.body
+    if not isinstance(result, ast.Return) or result.value is None:
+        return False
+
+    names = set(variables) | set(CONSTANTS.values())
+
+    def valid(node):
+        if isinstance(node, ast.Constant):
+            return type(node.value) in (int, float)
+        if isinstance(node, ast.Name):
+            return node.id in names
+        if isinstance(node, ast.BinOp):
+            return isinstance(node.op, _SOURCE_OPERATORS) and valid(node.left) and valid(node.right)
+        if isinstance(node, ast.UnaryOp):
+            return isinstance(node.op, ast.USub) and valid(node.operand)
+        if isinstance(node, ast.Call):
+            return (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS
+                    and len(node.args) == 1 and not node.keywords and valid(node.args[0]))
+        return False
+
+    for index, statement in enumerate(assignments):
+        if not (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                and isinstance(statement.targets[0], ast.Name)
+                and statement.targets[0].id == f"_t{index}" and valid(statement.value)):
+            return False
+        # Cada temporal solo puede usarse después de asignarse
+        names.add(f"_t{index}")
+    if isinstance(result.value, ast.Tuple):
+        return bool(result.value.elts) and all(valid(element) for element in result.value.elts)
+    return valid(result.value)
+
+
+def load_function(source, namespace, name='f'):
+    """
+    Ejecuta el código generado y devuelve la función resuelta con el espacio de nombres dado.
+    """
+    scope = {"__builtins__": {}, **namespace}
+    exec(compile(source, "<función>", "exec"), scope)
+    return scope[name]
+
+
+def compile_optimized(node, namespace, variables=('x',)):
+    """
+    Compila el AST optimizado en una función usando el espacio de nombres dado (math o NumPy).
+    """
+    return load_function(generate_function_source(node, variables), namespace)
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: costo por evaluación con y sin optimización
+    import timeit
+
+    import numpy as np
+
+    from expression_parser import parse_expression
+    from function_evaluator import MATH_NAMESPACE, NUMPY_NAMESPACE, compile_source
+
+    expressions = [
+        "sen(2*x)-log(x)+sen(2*x)^2",
+        "x^4 - 2x^2 + 1",
+        "(x^2 + 1)^3 - exp(x^2 + 1) + 2*pi/4",
+        "sen(2*x)-log(x)",
+    ]
+    grid = np.linspace(0.5, 3, 1000)
+    for expression in expressions:
+        tree = parse_expression(expression)
+        naive_scalar = compile_source(to_source(tree), MATH_NAMESPACE)
+        optimized_scalar = compile_optimized(tree, MATH_NAMESPACE)
+        naive_vector = compile_source(to_source(tree), NUMPY_NAMESPACE)
+        optimized_vector = compile_optimized(tree, NUMPY_NAMESPACE)
+        assert math.isclose(naive_scalar(1.3), optimized_scalar(1.3), rel_tol=1e-12)
+
+        runs = 200000
+        t_naive = timeit.timeit(lambda: naive_scalar(1.3), number=runs) / runs * 1e9
+        t_optimized = timeit.timeit(lambda: optimized_scalar(1.3), number=runs) / runs * 1e9
+        runs = 2000
+        v_naive = timeit.timeit(lambda: naive_vector(grid), number=runs) / runs * 1e6
+        v_optimized = timeit.timeit(lambda: optimized_vector(grid), number=runs) / runs * 1e6
+
+        print(expression)
+        print(generate_function_source(tree))
+        print(f"  escalar:     {t_naive:8.1f} ns -> {t_optimized:8.1f} ns  (x{t_naive / t_optimized:.2f})")
+        print(f"  vectorizado: {v_naive:8.1f} µs -> {v_optimized:8.1f} µs  (x{v_naive / v_optimized:.2f}, 1000 puntos)")
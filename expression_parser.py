@@ -0,0 +1,412 @@
+# expression_parser.py
+
+import hashlib
+import re
+from functools import lru_cache
+
+# Funciones reconocidas (nombre canónico) y sus alias en español o de otras bibliotecas
+FUNCTIONS = (
+    'sin', 'cos', 'tan', 'asin', 'acos', 'atan',
+    'sinh', 'cosh', 'tanh', 'asinh', 'acosh', 'atanh',
+    'sec', 'csc', 'cot', 'exp', 'log', 'log10', 'log2', 'sqrt', 'abs',
+)
+
+FUNCTION_ALIASES = {
+    'sen': 'sin',
+    'arcsin': 'asin', 'arccos': 'acos', 'arctan': 'atan',
+    'arcsinh': 'asinh', 'arccosh': 'acosh', 'arctanh': 'atanh',
+    'ln': 'log',
+    'raiz': 'sqrt', '√': 'sqrt',
+    'fabs': 'abs', 'Abs': 'abs',
+}
+
+CONSTANTS = {
+    'pi': 'pi', 'π': 'pi',
+    'e': 'e', 'E': 'e',
+}
+
+# Prefijos de módulo que se ignoran (por ejemplo, 'math.cos(x)' guardado en el historial)
+MODULE_PREFIXES = ('math.', 'np.', 'numpy.', 'sp.', 'sympy.')
+
+TOKEN_PATTERN = re.compile(
+    r'(?P<space>\s+)'
+    r'|(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)'
+    r'|(?P<name>(?:(?:math|np|numpy|sp|sympy)\.)?[A-Za-z_π√][A-Za-z_0-9]*)'
+    r'|(?P<op>\*\*|[-+*/^×÷·])'
+    r'|(?P<lparen>\()'
+    r'|(?P<rparen>\))'
+    r'|(?P<comma>,)'
+)
+
+
+class Token:
+    """
+    Token de la expresión. 'spaced' indica si va precedido de espacios en blanco,
+    lo que permite distinguir 'sin 2x' (argumento 2x) de 'sin x cos x'.
+    """
+    __slots__ = ('kind', 'value', 'pos', 'spaced')
+
+    def __init__(self, kind, value, pos, spaced):
+        self.kind = kind
+        self.value = value
+        self.pos = pos
+        self.spaced = spaced
+
+
+def split_identifier(name, variables):
+    """
+    Separa identificadores pegados en funciones, constantes y variables conocidas,
+    por ejemplo 'xsin' -> ['x', 'sin'] o 'xy' -> ['x', 'y'], eligiendo siempre la coincidencia más larga.
+    """
+    for prefix in MODULE_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    known = set(FUNCTIONS) | set(FUNCTION_ALIASES) | set(CONSTANTS) | set(variables)
+    if name in known:
+        return [name]
+    parts = []
+    pos = 0
+    while pos < len(name):
+        for end in range(len(name), pos, -1):
+            if name[pos:end] in known:
+                parts.append(name[pos:end])
+                pos = end
+                break
+        else:
+            raise ValueError(f"Nombre desconocido en la expresión: '{name}'")
+    return parts
+
+
+def tokenize(func_str, variables=('x',)):
+    """
+    Recorre la expresión una sola vez y devuelve la lista de tokens.
+    """
+    tokens = []
+    pos = 0
+    spaced = False
+    length = len(func_str)
+    while pos < length:
+        match = TOKEN_PATTERN.match(func_str, pos)
+        if not match:
+            raise ValueError(f"Símbolo no reconocido en la posición {pos + 1}: '{func_str[pos]}'")
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'space':
+            spaced = True
+        elif kind == 'name':
+            for i, part in enumerate(split_identifier(text, variables)):
+                tokens.append(Token('name', part, pos, spaced and i == 0))
+            spaced = False
+        else:
+            if kind == 'op':
+                text = {'^': '**', '×': '*', '·': '*', '÷': '/'}.get(text, text)
+            elif kind == 'num':
+                text = int(text) if text.isdigit() else float(text)
+            tokens.append(Token(kind, text, pos, spaced))
+            spaced = False
+        pos = match.end()
+    tokens.append(Token('end', None, pos, spaced))
+    return tokens
+
+
+class Parser:
+    """
+    Parser descendente recursivo para la gramática de las funciones del usuario:
+
+        expr    := term (('+' | '-') term)*
+        term    := unary (('*' | '/') unary | <implícito> power)*
+        unary   := ('+' | '-') unary | power
+        power   := primary ('^' | '**') unary | primary
+        primary := número | constante | variable | función argumento | '(' expr ')'
+
+    El resultado es un AST hecho de tuplas:
+    ('num', v), ('var', nombre), ('const', nombre), ('neg', a), ('add'|'sub'|'mul'|'div'|'pow', a, b)
+    y ('call', función, a).
+    """
+
+    def __init__(self, func_str, variables=('x',)):
+        self.func_str = func_str
+        self.variables = tuple(variables)
+        self.tokens = tokenize(func_str, self.variables)
+        self.index = 0
+
+    @property
+    def current(self):
+        return self.tokens[self.index]
+
+    def advance(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def error(self, message):
+        token = self.current
+        where = f" en la posición {token.pos + 1}" if token.kind != 'end' else " al final de la expresión"
+        raise ValueError(f"{message}{where}.")
+
+    def parse(self):
+        if self.current.kind == 'end':
+            raise ValueError("La expresión está vacía.")
+        node = self.parse_expr()
+        if self.current.kind != 'end':
+            self.error("Símbolo inesperado")
+        return node
+
+    def parse_expr(self):
+        node = self.parse_term()
+        while self.current.kind == 'op' and self.current.value in ('+', '-'):
+            op = self.advance().value
+            node = ('add' if op == '+' else 'sub', node, self.parse_term())
+        return node
+
+    def starts_primary(self, token):
+        return token.kind in ('num', 'name', 'lparen')
+
+    def parse_term(self):
+        node = self.parse_unary()
+        while True:
+            token = self.current
+            if token.kind == 'op' and token.value in ('*', '/'):
+                self.advance()
+                node = ('mul' if token.value == '*' else 'div', node, self.parse_unary())
+            elif self.starts_primary(token):
+                # Multiplicación implícita: '3x', 'x sin(x)', '(x+1)(x-1)'
+                node = ('mul', node, self.parse_power())
+            else:
+                return node
+
+    def parse_unary(self):
+        token = self.current
+        if token.kind == 'op' and token.value in ('+', '-'):
+            self.advance()
+            operand = self.parse_unary()
+            return ('neg', operand) if token.value == '-' else operand
+        return self.parse_power()
+
+    def parse_power(self):
+        base = self.parse_primary()
+        if self.current.kind == 'op' and self.current.value == '**':
+            self.advance()
+            return ('pow', base, self.parse_unary())
+        return base
+
+    def parse_primary(self):
+        token = self.current
+        if token.kind == 'num':
+            self.advance()
+            return ('num', token.value)
+        if token.kind == 'lparen':
+            self.advance()
+            node = self.parse_expr()
+            if self.current.kind != 'rparen':
+                self.error("Falta cerrar un paréntesis")
+            self.advance()
+            return node
+        if token.kind == 'name':
+            name = token.value
+            if name in FUNCTIONS or name in FUNCTION_ALIASES:
+                self.advance()
+                return self.parse_call(FUNCTION_ALIASES.get(name, name))
+            self.advance()
+            if name in self.variables:
+                return ('var', name)
+            return ('const', CONSTANTS[name])
+        self.error("Se esperaba un número, una variable o una función")
+
+    def parse_call(self, function):
+        if self.current.kind == 'lparen':
+            self.advance()
+            argument = self.parse_expr()
+            if function == 'log' and self.current.kind == 'comma':
+                # log(x, base) = ln(x) / ln(base)
+                self.advance()
+                base = self.parse_expr()
+                argument = ('div', ('call', 'log', argument), ('call', 'log', base))
+                function = None
+            if self.current.kind != 'rparen':
+                self.error(f"Falta cerrar el paréntesis de '{function or 'log'}'")
+            self.advance()
+            return argument if function is None else ('call', function, argument)
+        return ('call', function, self.parse_function_argument())
+
+    def parse_function_argument(self):
+        """
+        Argumento de una función escrita sin paréntesis ('sin x', 'sen 2x', 'ln x^2').
+        Solo se extiende a los factores pegados sin espacios, así 'sin x cos x' es sin(x)*cos(x).
+        """
+        token = self.current
+        if token.kind == 'op' and token.value in ('+', '-'):
+            self.advance()
+            operand = self.parse_function_argument()
+            return ('neg', operand) if token.value == '-' else operand
+        if not self.starts_primary(token):
+            self.error("Falta el argumento de la función")
+        node = self.parse_power()
+        while self.starts_primary(self.current) and not self.current.spaced \
+                and self.current.value not in FUNCTIONS and self.current.value not in FUNCTION_ALIASES:
+            node = ('mul', node, self.parse_power())
+        return node
+
+
+@lru_cache(maxsize=256)
+def parse_expression(func_str, variables=('x',)):
+    """
+    Convierte la función escrita por el usuario en un AST.
+    Los resultados se guardan en caché porque el AST es inmutable.
+    """
+    return Parser(func_str, variables).parse()
+
+
+def _term_key(entry):
+    # Orden estable: primero los términos positivos, después por su código fuente
+    negative, node = entry
+    return negative, to_source(node)
+
+
+def _flatten(node, kind, negative, items):
+    """
+    Recoge los operandos de una cadena de sumas/restas (kind='add') o de productos (kind='mul')
+    junto con su signo, canonicalizando cada uno.
+    """
+    if kind == 'add' and node[0] in ('add', 'sub'):
+        _flatten(node[1], kind, negative, items)
+        _flatten(node[2], kind, negative != (node[0] == 'sub'), items)
+        return
+    if kind == 'mul' and node[0] == 'mul':
+        _flatten(node[1], kind, negative, items)
+        _flatten(node[2], kind, negative, items)
+        return
+    node = canonicalize(node)
+    # El signo de cada operando se extrae: x + (-2) es x - 2 y (-x)*2 es -(2*x)
+    if node[0] == 'neg':
+        negative, node = not negative, node[1]
+    elif node[0] == 'num' and node[1] < 0:
+        negative, node = not negative, ('num', -node[1])
+    if kind == 'mul' and node[0] == 'mul':
+        _flatten(node, kind, negative, items)
+        return
+    items.append((negative, node))
+
+
+def canonicalize(node):
+    """
+    Forma canónica del AST: las sumas y productos se aplanan y sus operandos se ordenan,
+    los signos se extraen de los productos y los literales enteros se escriben como enteros.
+    Así '2x + sen(x)', 'sin(x)+2*x' y 'x*2.0 + sin(x)' producen el mismo árbol.
+    """
+    kind = node[0]
+    if kind == 'num':
+        value = node[1]
+        if isinstance(value, float) and value.is_integer() and abs(value) <= 2 ** 53:
+            return ('num', int(value))
+        return node
+    if kind in ('var', 'const'):
+        return node
+    if kind == 'neg':
+        operand = canonicalize(node[1])
+        if operand[0] == 'neg':
+            return operand[1]
+        if operand[0] == 'num':
+            return ('num', -operand[1])
+        return ('neg', operand)
+    if kind == 'call':
+        return ('call', node[1], canonicalize(node[2]))
+    if kind in ('add', 'sub'):
+        items = []
+        _flatten(node, 'add', False, items)
+        items.sort(key=_term_key)
+        negative, result = items[0]
+        if negative:
+            result = ('num', -result[1]) if result[0] == 'num' else ('neg', result)
+        for negative, term in items[1:]:
+            result = ('sub' if negative else 'add', result, term)
+        return result
+    if kind == 'mul':
+        items = []
+        _flatten(node, 'mul', False, items)
+        negative = sum(sign for sign, _ in items) % 2 == 1
+        factors = sorted((factor for _, factor in items), key=to_source)
+        result = factors[0]
+        for factor in factors[1:]:
+            result = ('mul', result, factor)
+        return ('neg', result) if negative else result
+    return (kind, canonicalize(node[1]), canonicalize(node[2]))
+
+
+@lru_cache(maxsize=256)
+def canonical_expression(func_str, variables=('x',)):
+    """
+    Analiza la función y devuelve su AST en forma canónica.
+    """
+    return canonicalize(parse_expression(func_str, variables))
+
+
+def expression_key(func_str, variables=('x',)):
+    """
+    Clave canónica de la función: el código de su forma canónica. Es una expresión válida
+    para el parser, de modo que se puede volver a analizar a partir de la clave.
+    """
+    return to_source(canonical_expression(func_str, variables))
+
+
+def expression_hash(func_str, variables=('x',)):
+    """
+    Hash estable (independiente de la sesión) de la forma canónica, para usar como clave de caché.
+    """
+    text = f"{','.join(variables)}:{expression_key(func_str, variables)}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def to_source(node):
+    """
+    Genera código Python a partir del AST. Las funciones y constantes se emiten con su nombre
+    canónico ('sin', 'pi', ...) y se resuelven con el espacio de nombres del evaluador.
+    """
+    kind = node[0]
+    if kind == 'num':
+        # Los literales negativos (del plegado de constantes) van entre paréntesis: (-2.0) ** x
+        return repr(node[1]) if node[1] >= 0 else f"({node[1]!r})"
+    if kind in ('var', 'const', 'tmp'):
+        return node[1]
+    if kind == 'neg':
+        return f"(-{to_source(node[1])})"
+    if kind == 'call':
+        return f"{node[1]}({to_source(node[2])})"
+    op = {'add': '+', 'sub': '-', 'mul': '*', 'div': '/', 'pow': '**'}[kind]
+    return f"({to_source(node[1])} {op} {to_source(node[2])})"
+
+
+def to_sympy(node):
+    """
+    Convierte el AST en una expresión de SymPy (para derivar, simplificar o usar lambdify).
+    """
+    import sympy as sp
+
+    kind = node[0]
+    if kind == 'num':
+        return sp.Integer(node[1]) if isinstance(node[1], int) else sp.Float(node[1])
+    if kind == 'var':
+        return sp.Symbol(node[1])
+    if kind == 'const':
+        return sp.pi if node[1] == 'pi' else sp.E
+    if kind == 'neg':
+        return -to_sympy(node[1])
+    if kind == 'call':
+        argument = to_sympy(node[2])
+        if node[1] == 'log10':
+            return sp.log(argument, 10)
+        if node[1] == 'log2':
+            return sp.log(argument, 2)
+        function = {'abs': sp.Abs}.get(node[1]) or getattr(sp, node[1])
+        return function(argument)
+    a, b = to_sympy(node[1]), to_sympy(node[2])
+    if kind == 'add':
+        return a + b
+    if kind == 'sub':
+        return a - b
+    if kind == 'mul':
+        return a * b
+    if kind == 'div':
+        return a / b
+    return a ** b
@@ -0,0 +1,142 @@
+# function_cache.py
+
+import hashlib
+import json
+import os
+import sys
+
+
+def _user_cache_dir():
+    # Carpeta de caché del usuario (no la del directorio de trabajo, donde otros podrían
+    # escribir): %LOCALAPPDATA% en Windows y $XDG_CACHE_HOME o ~/.cache en el resto
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'Algebrify', 'function_cache')
+
+
+# Carpeta donde se guardan las funciones compiladas
+CACHE_DIR = _user_cache_dir()
+MAX_CACHE_BYTES = 2 * 1024 * 1024  # Al superar este tamaño se eliminan las entradas menos usadas
+
+# Módulos cuyo código determina el resultado del análisis y de la generación de código,
+# incluidos los que arman las expresiones que se guardan (f y sus derivadas en
+# function_evaluator, la cota de error de redondeo en adaptive_precision)
+SOURCE_MODULES = ('expression_parser.py', 'expression_optimizer.py', 'expression_derivative.py',
+                  'function_evaluator.py', 'adaptive_precision.py')
+
+_parser_version = None
+# Tamaño de la caché como (carpeta, bytes): se mide recorriendo la carpeta una vez por
+# proceso (en evict) y después se actualiza con cada escritura, así que store no hace un
+# listdir + stat por entrada salvo cuando el total estimado supera MAX_CACHE_BYTES
+_tracked_size = None
+
+
+def parser_version():
+    """
+    Huella de la versión del parser y del generador de código. Si cualquiera de esos módulos
+    cambia, las entradas guardadas con una versión anterior dejan de ser válidas.
+    """
+    global _parser_version
+    if _parser_version is None:
+        digest = hashlib.sha256()
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in SOURCE_MODULES:
+            try:
+                with open(os.path.join(base_dir, name), 'rb') as file:
+                    digest.update(file.read())
+            except OSError:
+                digest.update(name.encode('utf-8'))
+        _parser_version = digest.hexdigest()[:16]
+    return _parser_version
+
+
+def _entry_path(kind, key):
+    # El nombre del archivo se obtiene de la cadena original, sin analizarla
+    raw = json.dumps([kind, key], ensure_ascii=False)
+    return os.path.join(CACHE_DIR, hashlib.sha256(raw.encode('utf-8')).hexdigest()[:24] + '.json')
+
+
+def load(kind, key):
+    """
+    Devuelve el contenido guardado para (kind, key) o None si no existe, está dañado o
+    fue generado por otra versión del parser. Los errores de disco nunca se propagan.
+    """
+    path = _entry_path(kind, key)
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if entry.get('version') != parser_version() or entry.get('kind') != kind or entry.get('key') != list(key):
+        return None
+    try:
+        os.utime(path)  # Marca la entrada como usada recientemente
+    except OSError:
+        pass
+    return entry.get('data')
+
+
+def store(kind, key, data):
+    """
+    Guarda 'data' (un diccionario serializable en JSON) para (kind, key) y recorta la caché
+    si supera MAX_CACHE_BYTES.
+    """
+    path = _entry_path(kind, key)
+    entry = {'version': parser_version(), 'kind': kind, 'key': list(key), 'data': data}
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file, ensure_ascii=False)
+        size = os.path.getsize(temp_path)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(temp_path, path)
+        _account(size - previous)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _account(delta):
+    # Suma la escritura al tamaño conocido y solo recorre la carpeta si no se conoce
+    # (primera escritura del proceso, o cambió CACHE_DIR) o si pasa del límite. Las
+    # escrituras de otros procesos se cuentan en su próxima medición.
+    global _tracked_size
+    if _tracked_size is None or _tracked_size[0] != CACHE_DIR or _tracked_size[1] + delta > MAX_CACHE_BYTES:
+        evict(MAX_CACHE_BYTES)
+    else:
+        _tracked_size = (CACHE_DIR, _tracked_size[1] + delta)
+
+
+def evict(max_bytes=MAX_CACHE_BYTES):
+    """
+    Elimina las entradas usadas hace más tiempo hasta que la caché ocupe como mucho max_bytes.
+    """
+    global _tracked_size
+    _tracked_size = None
+    try:
+        entries = []
+        for name in os.listdir(CACHE_DIR):
+            path = os.path.join(CACHE_DIR, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    _tracked_size = (CACHE_DIR, total)
+
+
+def clear():
+    """
+    Vacía la caché en disco.
+    """
+    evict(max_bytes=0)
@@ -0,0 +1,307 @@
+# function_evaluator.py
+
+import cmath
+import math
+from functools import lru_cache
+
+import numpy as np
+
+import function_cache
+from expression_derivative import differentiate
+from expression_optimizer import generate_function_source, is_generated_source, load_function
+from expression_parser import canonical_expression, expression_key
+
+# Espacio de nombres escalar: cada nombre canónico del parser apunta a su función de 'math'
+MATH_NAMESPACE = {
+    'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+    'asin': math.asin, 'acos': math.acos, 'atan': math.atan,
+    'sinh': math.sinh, 'cosh': math.cosh, 'tanh': math.tanh,
+    'asinh': math.asinh, 'acosh': math.acosh, 'atanh': math.atanh,
+    'sec': lambda x: 1 / math.cos(x),
+    'csc': lambda x: 1 / math.sin(x),
+    'cot': lambda x: 1 / math.tan(x),
+    'exp': math.exp, 'log': math.log, 'log10': math.log10, 'log2': math.log2,
+    'sqrt': math.sqrt, 'abs': abs,
+    'pi': math.pi, 'e': math.e,
+}
+
+# Espacio de nombres vectorizado: los mismos nombres resueltos con ufuncs de NumPy
+NUMPY_NAMESPACE = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'asinh': np.arcsinh, 'acosh': np.arccosh, 'atanh': np.arctanh,
+    'sec': lambda x: 1 / np.cos(x),
+    'csc': lambda x: 1 / np.sin(x),
+    'cot': lambda x: 1 / np.tan(x),
+    'exp': np.exp, 'log': np.log, 'log10': np.log10, 'log2': np.log2,
+    'sqrt': np.sqrt, 'abs': np.abs,
+    'pi': np.pi, 'e': np.e,
+}
+
+
+# Espacio de nombres complejo: los mismos nombres con las funciones de 'cmath', que aceptan
+# argumentos complejos y no rechazan, por ejemplo, sqrt o log de números negativos
+CMATH_NAMESPACE = {
+    'sin': cmath.sin, 'cos': cmath.cos, 'tan': cmath.tan,
+    'asin': cmath.asin, 'acos': cmath.acos, 'atan': cmath.atan,
+    'sinh': cmath.sinh, 'cosh': cmath.cosh, 'tanh': cmath.tanh,
+    'asinh': cmath.asinh, 'acosh': cmath.acosh, 'atanh': cmath.atanh,
+    'sec': lambda x: 1 / cmath.cos(x),
+    'csc': lambda x: 1 / cmath.sin(x),
+    'cot': lambda x: 1 / cmath.tan(x),
+    'exp': cmath.exp, 'log': cmath.log, 'log10': cmath.log10, 'log2': lambda x: cmath.log(x) / math.log(2),
+    'sqrt': cmath.sqrt, 'abs': abs,
+    'pi': math.pi, 'e': math.e,
+}
+
+
+def compile_source(source, namespace, variables=('x',)):
+    """
+    Compila una expresión de Python (sin optimizar) en una función con los argumentos dados.
+    """
+    code = compile(f"lambda {', '.join(variables)}: {source}", "<función>", "eval")
+    return eval(code, {"__builtins__": {}, **namespace})
+
+
+NAMESPACES = {'math': MATH_NAMESPACE, 'numpy': NUMPY_NAMESPACE, 'cmath': CMATH_NAMESPACE}
+
+
+@lru_cache(maxsize=256)
+def shared_function(source, namespace_name):
+    """
+    Carga el código generado con el espacio de nombres indicado ('math', 'numpy' o 'cmath').
+    Como el código se genera a partir de la forma canónica, las expresiones equivalentes
+    ('2x + sen(x)', 'sin(x) + 2*x') producen el mismo código y comparten el mismo callable.
+    """
+    return load_function(source, NAMESPACES[namespace_name])
+
+
+def generated_source(kind, func_str, variables, build):
+    """
+    Devuelve el código generado para la función. Se busca primero en la caché en disco, indexada
+    por la cadena original, así que una función ya resuelta en otra sesión no se vuelve a analizar;
+    si no está, build() lo genera y se guarda. Como el código se ejecuta, una entrada que no
+    tenga la forma exacta del generador (is_generated_source) se descarta y se regenera.
+    """
+    key = (func_str, *variables)
+    data = function_cache.load(kind, key)
+    if data is not None and isinstance(data.get('source'), str) and is_generated_source(data['source'], variables):
+        return data['source']
+    source = build()
+    function_cache.store(kind, key, {'source': source})
+    return source
+
+
+@lru_cache(maxsize=128)
+def compile_function(func_str, variables=('x',)):
+    """
+    Analiza, optimiza y compila la función una sola vez y devuelve un callable escalar f(x).
+    Los callables se guardan en una caché LRU acotada, indexada por la cadena de la función,
+    de modo que las evaluaciones repetidas solo cuestan la aritmética de punto flotante.
+    """
+    try:
+        source = generated_source('function', func_str, variables,
+                                  lambda: generate_function_source(canonical_expression(func_str, variables), variables))
+        compiled_func = shared_function(source, 'math')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def f(*args):
+        try:
+            return compiled_func(*args)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar la función: {e}")
+
+    return f
+
+
+@lru_cache(maxsize=128)
+def compile_value_and_derivative(func_str, variable='x'):
+    """
+    Deriva la función automáticamente y compila f y f' juntas en un único callable que
+    devuelve (f(x), f'(x)). Los términos comunes (por ejemplo sin(2x) en f y cos(2x) en f')
+    se calculan una sola vez por evaluación.
+    """
+    try:
+        def build():
+            tree = canonical_expression(func_str, (variable,))
+            return generate_function_source([tree, differentiate(tree, variable)], (variable,))
+
+        compiled_func = shared_function(generated_source('value_and_derivative', func_str, (variable,), build), 'math')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def f_and_derivative(x):
+        try:
+            return compiled_func(x)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar la función: {e}")
+
+    return f_and_derivative
+
+
+@lru_cache(maxsize=128)
+def compile_value_and_derivatives(func_str, order=2, variable='x'):
+    """
+    Igual que compile_value_and_derivative, pero deriva 'order' veces y el callable devuelve
+    (f(x), f'(x), ..., f^(order)(x)); con order=2 sirve para el método de Halley.
+    """
+    try:
+        def build():
+            trees = [canonical_expression(func_str, (variable,))]
+            for _ in range(order):
+                trees.append(differentiate(trees[-1], variable))
+            return generate_function_source(trees, (variable,))
+
+        compiled_func = shared_function(generated_source(f'derivatives_{order}', func_str, (variable,), build), 'math')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def f_and_derivatives(x):
+        try:
+            return compiled_func(x)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar la función: {e}")
+
+    return f_and_derivatives
+
+
+@lru_cache(maxsize=128)
+def compile_complex_function(func_str, variables=('x',)):
+    """
+    Igual que compile_function, pero evalúa con aritmética compleja ('cmath'): f(x) acepta
+    números complejos y siempre devuelve un complejo. Comparte el código generado con
+    compile_function.
+    """
+    try:
+        source = generated_source('function', func_str, variables,
+                                  lambda: generate_function_source(canonical_expression(func_str, variables), variables))
+        compiled_func = shared_function(source, 'cmath')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def f(*args):
+        try:
+            return complex(compiled_func(*args))
+        except Exception as e:
+            raise ValueError(f"Error al evaluar la función: {e}")
+
+    return f
+
+
+@lru_cache(maxsize=128)
+def vectorize_function(func_str):
+    """
+    Convierte la función del usuario en un callable que evalúa un arreglo completo de NumPy
+    en una sola llamada. Los errores de dominio (log de negativos, divisiones entre cero, etc.)
+    se devuelven como NaN en lugar de excepciones por punto.
+    """
+    try:
+        source = generated_source('function', func_str, ('x',),
+                                  lambda: generate_function_source(canonical_expression(func_str)))
+        compiled_func = shared_function(source, 'numpy')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def f(x_vals):
+        x_vals = np.asarray(x_vals, dtype=float)
+        try:
+            with np.errstate(all='ignore'):
+                y_vals = np.asarray(compiled_func(x_vals))
+        except Exception as e:
+            raise ValueError(f"Error en la expresión: {e}")
+        if np.iscomplexobj(y_vals):
+            y_vals = np.where(y_vals.imag == 0, y_vals.real, np.nan)
+        y_vals = np.array(np.broadcast_to(y_vals, x_vals.shape), dtype=float)
+        # Los valores no finitos se enmascaran como NaN para que no se dibujen
+        y_vals[~np.isfinite(y_vals)] = np.nan
+        return y_vals
+
+    return f
+
+
+@lru_cache(maxsize=128)
+def vectorize_complex_function(func_str):
+    """
+    Como vectorize_function, pero sin convertir a float: evalúa un arreglo de puntos del
+    plano complejo y devuelve los valores complejos con la misma forma. Los puntos fuera
+    del dominio o no finitos quedan como NaN.
+    """
+    try:
+        source = generated_source('function', func_str, ('x',),
+                                  lambda: generate_function_source(canonical_expression(func_str)))
+        compiled_func = shared_function(source, 'numpy')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def f(z_vals):
+        z_vals = np.asarray(z_vals, dtype=complex)
+        try:
+            with np.errstate(all='ignore'):
+                values = np.array(np.broadcast_to(compiled_func(z_vals), z_vals.shape), dtype=complex)
+        except Exception as e:
+            raise ValueError(f"Error en la expresión: {e}")
+        values[~np.isfinite(values)] = np.nan
+        return values
+
+    return f
+
+
+@lru_cache(maxsize=128)
+def vectorize_value_and_derivative(func_str, variable='x'):
+    """
+    Versión vectorizada de compile_value_and_derivative: devuelve (f, f') sobre un arreglo
+    completo. Conserva el tipo del arreglo, así que también evalúa puntos del plano complejo;
+    los errores de dominio quedan como NaN.
+    """
+    try:
+        def build():
+            tree = canonical_expression(func_str, (variable,))
+            return generate_function_source([tree, differentiate(tree, variable)], (variable,))
+
+        fused = shared_function(generated_source('value_and_derivative', func_str, (variable,), build), 'numpy')
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def f_and_derivative(x_vals):
+        x_vals = np.asarray(x_vals)
+        try:
+            with np.errstate(all='ignore'):
+                value, slope = fused(x_vals)
+        except Exception as e:
+            raise ValueError(f"Error en la expresión: {e}")
+        # Las expresiones constantes (por ejemplo f' = 2) devuelven un escalar
+        return np.broadcast_to(value, x_vals.shape), np.broadcast_to(slope, x_vals.shape)
+
+    return f_and_derivative
+
+
+def evaluate_on_grid(func_str, x_vals):
+    """
+    Evalúa la función sobre todos los puntos de x_vals (por ejemplo, un np.linspace).
+    """
+    return vectorize_function(func_str)(x_vals)
+
+
+@lru_cache(maxsize=32)
+def _sample_canonical(key, x_min, x_max, num):
+    x_vals = np.linspace(x_min, x_max, num)
+    y_vals = vectorize_function(key)(x_vals)
+    # Los arreglos se comparten entre gráficas, así que se marcan como de solo lectura
+    x_vals.flags.writeable = False
+    y_vals.flags.writeable = False
+    return x_vals, y_vals
+
+
+def sample_function(func_str, x_min, x_max, num=400):
+    """
+    Devuelve (x, f(x)) sobre np.linspace(x_min, x_max, num). Los muestreos se guardan en caché
+    indexados por la clave canónica de la función, así que redibujar una gráfica o graficar una
+    expresión equivalente escrita de otra forma no vuelve a evaluarla.
+    """
+    try:
+        key = expression_key(func_str)
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+    return _sample_canonical(key, float(x_min), float(x_max), int(num))
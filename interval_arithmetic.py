@@ -0,0 +1,368 @@
+# interval_arithmetic.py
+
+import math
+from functools import lru_cache
+
+from expression_derivative import differentiate
+from expression_parser import canonical_expression
+
+INF = math.inf
+HALF_PI = math.pi / 2
+TWO_PI = 2 * math.pi
+
+
+def _down(value):
+    # Redondeo hacia afuera: el extremo inferior baja un ulp
+    return math.nextafter(value, -INF) if math.isfinite(value) else value
+
+
+def _up(value):
+    # Redondeo hacia afuera: el extremo superior sube un ulp
+    return math.nextafter(value, INF) if math.isfinite(value) else value
+
+
+def _product(a, b):
+    # En aritmética de intervalos 0 * inf se toma como 0
+    if a == 0 or b == 0:
+        return 0.0
+    return a * b
+
+
+def _call(function, value, overflow):
+    """
+    Evalúa una función de 'math' devolviendo 'overflow' si el resultado se desborda.
+    """
+    try:
+        return function(value)
+    except OverflowError:
+        return overflow
+
+
+class Interval:
+    """
+    Intervalo cerrado [lo, hi] con redondeo hacia afuera. Las operaciones devuelven siempre
+    un intervalo que contiene todos los valores posibles del resultado, de modo que si 0 no
+    está en f([lo, hi]) la función no tiene raíces en ese subintervalo.
+    """
+    __slots__ = ('lo', 'hi')
+
+    def __init__(self, lo, hi=None):
+        self.lo = float(lo)
+        self.hi = float(lo if hi is None else hi)
+
+    @classmethod
+    def point(cls, value):
+        """
+        Intervalo que contiene al número; si no es exacto en punto flotante se ensancha un ulp.
+        """
+        if isinstance(value, int) and abs(value) <= 2 ** 53:
+            return cls(value)
+        return cls(_down(float(value)), _up(float(value)))
+
+    @classmethod
+    def outward(cls, lo, hi):
+        return cls(_down(lo), _up(hi))
+
+    def contains(self, value):
+        return self.lo <= value <= self.hi
+
+    def intersect(self, other):
+        return Interval(max(self.lo, other.lo), min(self.hi, other.hi))
+
+    def is_bounded(self):
+        return math.isfinite(self.lo) and math.isfinite(self.hi)
+
+    @property
+    def width(self):
+        return self.hi - self.lo
+
+    def __repr__(self):
+        return f"Interval({self.lo!r}, {self.hi!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Interval) and self.lo == other.lo and self.hi == other.hi
+
+    def __hash__(self):
+        return hash((self.lo, self.hi))
+
+    def __neg__(self):
+        return Interval(-self.hi, -self.lo)
+
+    def __add__(self, other):
+        other = _as_interval(other)
+        return Interval.outward(self.lo + other.lo, self.hi + other.hi)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = _as_interval(other)
+        return Interval.outward(self.lo - other.hi, self.hi - other.lo)
+
+    def __rsub__(self, other):
+        return _as_interval(other) - self
+
+    def __mul__(self, other):
+        other = _as_interval(other)
+        products = (
+            _product(self.lo, other.lo), _product(self.lo, other.hi),
+            _product(self.hi, other.lo), _product(self.hi, other.hi),
+        )
+        return Interval.outward(min(products), max(products))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = _as_interval(other)
+        if other.lo == 0 and other.hi == 0:
+            raise ValueError("División entre cero en todo el intervalo.")
+        if other.contains(0):
+            return ENTIRE
+        return self * Interval.outward(1 / other.hi, 1 / other.lo)
+
+    def __rtruediv__(self, other):
+        return _as_interval(other) / self
+
+    def __pow__(self, other):
+        other = _as_interval(other)
+        if other.lo == other.hi and other.lo == int(other.lo):
+            return self._integer_power(int(other.lo))
+        if other.lo == other.hi:
+            return self._real_power(other.lo)
+        # Exponente variable: a^b = exp(b * log(a)), definido para a > 0
+        return interval_exp(other * interval_log(self))
+
+    def __rpow__(self, other):
+        return _as_interval(other) ** self
+
+    def _integer_power(self, n):
+        if n == 0:
+            return Interval(1.0)
+        if n < 0:
+            return 1 / self._integer_power(-n)
+        lo = _call(lambda v: v ** n, self.lo, math.copysign(INF, self.lo) if n % 2 else INF)
+        hi = _call(lambda v: v ** n, self.hi, INF)
+        if n % 2:
+            return Interval.outward(lo, hi)
+        if self.contains(0):
+            return Interval(0.0, _up(max(lo, hi)))
+        return Interval.outward(min(lo, hi), max(lo, hi))
+
+    def _real_power(self, p):
+        # Exponente no entero: solo está definido para bases no negativas
+        if self.hi < 0:
+            raise ValueError("Potencia no entera de una base negativa.")
+        lo = max(self.lo, 0.0)
+        if p > 0:
+            return Interval.outward(lo ** p, _call(lambda v: v ** p, self.hi, INF))
+        top = INF if lo == 0 else _call(lambda v: v ** p, lo, INF)
+        return Interval.outward(self.hi ** p, top)
+
+
+ENTIRE = Interval(-INF, INF)
+
+
+def _as_interval(value):
+    return value if isinstance(value, Interval) else Interval.point(value)
+
+
+def _monotone(function, lo_limit=-INF, hi_limit=INF, overflow=INF):
+    """
+    Extiende una función creciente a intervalos, recortando el argumento a su dominio.
+    """
+    def extension(x):
+        lo, hi = max(x.lo, lo_limit), min(x.hi, hi_limit)
+        if lo > hi:
+            raise ValueError(f"El intervalo está fuera del dominio de {function.__name__}.")
+        return Interval.outward(_call(function, lo, -overflow), _call(function, hi, overflow))
+    return extension
+
+
+def interval_log(x):
+    if x.hi <= 0:
+        raise ValueError("Logaritmo de un intervalo no positivo.")
+    lo = -INF if x.lo <= 0 else math.log(x.lo)
+    return Interval.outward(lo, math.log(x.hi) if math.isfinite(x.hi) else INF)
+
+
+def _log_base(base):
+    factor = Interval.point(math.log(base))
+    return lambda x: interval_log(x) / factor
+
+
+def interval_exp(x):
+    lo = 0.0 if x.lo == -INF else _call(math.exp, x.lo, INF)
+    return Interval(max(_down(lo), 0.0), _up(_call(math.exp, x.hi, INF)))
+
+
+def interval_sqrt(x):
+    if x.hi < 0:
+        raise ValueError("Raíz cuadrada de un intervalo negativo.")
+    return Interval(max(_down(math.sqrt(max(x.lo, 0.0))), 0.0), _up(math.sqrt(x.hi)))
+
+
+def _reaches(x, offset, period):
+    """
+    Indica si el intervalo contiene algún punto offset + k*period (con un margen de seguridad).
+    """
+    k = math.floor((x.lo - offset) / period)
+    for candidate in (k, k + 1):
+        point = offset + candidate * period
+        slack = 1e-12 * max(1.0, abs(point))
+        if x.lo - slack <= point <= x.hi + slack:
+            return True
+    return False
+
+
+def _periodic(function, peak, trough):
+    """
+    Extensión de sin/cos: entre los extremos se toma el mínimo y el máximo de los bordes,
+    y si el intervalo contiene un pico o un valle el resultado llega a 1 o -1.
+    """
+    def extension(x):
+        if not x.is_bounded() or x.width >= TWO_PI:
+            return Interval(-1.0, 1.0)
+        a, b = function(x.lo), function(x.hi)
+        lo = -1.0 if _reaches(x, trough, TWO_PI) else max(_down(min(a, b)), -1.0)
+        hi = 1.0 if _reaches(x, peak, TWO_PI) else min(_up(max(a, b)), 1.0)
+        return Interval(lo, hi)
+    return extension
+
+
+def interval_tan(x):
+    # Creciente entre polos; si el intervalo contiene un polo, el resultado es toda la recta
+    if not x.is_bounded() or x.width >= math.pi or _reaches(x, HALF_PI, math.pi):
+        return ENTIRE
+    return Interval.outward(math.tan(x.lo), math.tan(x.hi))
+
+
+def interval_cot(x):
+    # Decreciente entre los polos k*pi
+    if not x.is_bounded() or x.width >= math.pi or _reaches(x, 0.0, math.pi):
+        return ENTIRE
+    return Interval.outward(1 / math.tan(x.hi), 1 / math.tan(x.lo))
+
+
+def interval_cosh(x):
+    lo = 1.0 if x.contains(0) else _call(math.cosh, min(abs(x.lo), abs(x.hi)), INF)
+    hi = _call(math.cosh, max(abs(x.lo), abs(x.hi)), INF)
+    return Interval(max(_down(lo), 1.0), _up(hi))
+
+
+def interval_abs(x):
+    if x.lo >= 0:
+        return x
+    if x.hi <= 0:
+        return -x
+    return Interval(0.0, max(-x.lo, x.hi))
+
+
+interval_sin = _periodic(math.sin, HALF_PI, -HALF_PI)
+interval_cos = _periodic(math.cos, 0.0, math.pi)
+
+
+def interval_acos(x):
+    # Decreciente en [-1, 1]
+    lo, hi = max(x.lo, -1.0), min(x.hi, 1.0)
+    if lo > hi:
+        raise ValueError("El intervalo está fuera del dominio de acos.")
+    return Interval.outward(math.acos(hi), math.acos(lo))
+
+
+# Extensión a intervalos de cada función canónica del parser
+INTERVAL_FUNCTIONS = {
+    'sin': interval_sin, 'cos': interval_cos, 'tan': interval_tan,
+    'asin': _monotone(math.asin, -1.0, 1.0), 'acos': interval_acos, 'atan': _monotone(math.atan),
+    'sinh': _monotone(math.sinh), 'cosh': interval_cosh, 'tanh': _monotone(math.tanh),
+    'asinh': _monotone(math.asinh), 'acosh': _monotone(math.acosh, 1.0),
+    'atanh': _monotone(math.atanh, _up(-1.0), _down(1.0)),
+    'sec': lambda x: 1 / interval_cos(x),
+    'csc': lambda x: 1 / interval_sin(x),
+    'cot': interval_cot,
+    'exp': interval_exp, 'log': interval_log, 'log10': _log_base(10), 'log2': _log_base(2),
+    'sqrt': interval_sqrt, 'abs': interval_abs,
+}
+
+INTERVAL_CONSTANTS = {
+    'pi': Interval.point(math.pi),
+    'e': Interval.point(math.e),
+}
+
+
+def evaluate_interval(node, values):
+    """
+    Evalúa el AST del parser sobre intervalos. 'values' asocia cada variable con su Interval.
+    Lanza ValueError si la función no está definida en ningún punto del intervalo.
+    """
+    kind = node[0]
+    if kind == 'num':
+        return Interval.point(node[1])
+    if kind == 'var':
+        return values[node[1]]
+    if kind == 'const':
+        return INTERVAL_CONSTANTS[node[1]]
+    if kind == 'neg':
+        return -evaluate_interval(node[1], values)
+    if kind == 'call':
+        return INTERVAL_FUNCTIONS[node[1]](evaluate_interval(node[2], values))
+    a = evaluate_interval(node[1], values)
+    b = evaluate_interval(node[2], values)
+    if kind == 'add':
+        return a + b
+    if kind == 'sub':
+        return a - b
+    if kind == 'mul':
+        # x*x es un cuadrado: se evita el problema de dependencia ([-1,1]*[-1,1] = [-1,1])
+        return a ** 2 if node[1] == node[2] else a * b
+    if kind == 'div':
+        return a / b
+    return a ** b
+
+
+@lru_cache(maxsize=128)
+def interval_function(func_str, variable='x', derivative=False):
+    """
+    Devuelve un callable F(Interval) -> Interval que encierra f (o f' si derivative=True)
+    sobre el intervalo dado.
+    """
+    try:
+        tree = canonical_expression(func_str, (variable,))
+        if derivative:
+            tree = differentiate(tree, variable)
+    except Exception as e:
+        raise ValueError(f"Error en la expresión: {e}")
+
+    def F(x):
+        return evaluate_interval(tree, {variable: x})
+
+    return F
+
+
+def mean_value_enclosure(F, dF, box):
+    """
+    Intersección de la extensión natural F(box) con la forma de valor medio
+    F([m, m]) + dF(box)·(box - m). En cajas angostas la forma de valor medio es mucho más
+    ajustada, porque no sufre el problema de dependencia (por ejemplo tan(x) - x cerca de 0).
+    """
+    natural = F(box)
+    if not natural.contains(0) or not natural.is_bounded():
+        return natural
+    middle = (box.lo + box.hi) / 2
+    try:
+        centered = F(Interval(middle)) + dF(box) * (box - middle)
+    except (ValueError, ArithmeticError):
+        return natural
+    if not centered.is_bounded():
+        return natural
+    return natural.intersect(centered)
+
+
+if __name__ == "__main__":
+    # Forma natural frente a la de valor medio (la que usa root_scan para descartar celdas)
+    for expression in ["tan(x) - x", "sen(2*x)-log(x + 2)"]:
+        F = interval_function(expression)
+        dF = interval_function(expression, derivative=True)
+        for width in (0.5, 0.1, 0.01):
+            box = Interval(-width, width)
+            natural, centered = F(box), mean_value_enclosure(F, dF, box)
+            print(f"{expression} en [{-width}, {width}]: natural {natural.hi - natural.lo:.3g}, "
+                  f"valor medio {centered.hi - centered.lo:.3g}")
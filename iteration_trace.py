@@ -0,0 +1,230 @@
+# iteration_trace.py
+
+import base64
+import json
+from array import array
+import struct
+import zlib
+
+import numpy as np
+
+# Columnas de la traza de cada método (los nombres son los que usan las tablas de iteraciones)
+BISECTION_COLUMNS = ('iteration', 'a', 'b', 'c', 'f(c)', 'relative_error')
+BRACKETING_COLUMNS = ('Iteración', 'a', 'b', 'c', 'f(a)', 'f(b)', 'f(c)')
+SECANT_COLUMNS = ('Iteración', 'x0', 'x1', 'x2', 'f(x0)', 'f(x1)', 'f(x2)')
+NEWTON_COLUMNS = ('iteration', 'x', 'f(x)', 'x_next')
+FIXED_POINT_COLUMNS = ('Iteración', 'x', 'g(x)', 'x_next', 'g(g(x))', 'x - g(x)', 'Evaluaciones')
+# Müller trabaja con complejos: el iterado y f en él se guardan por partes real e imaginaria
+MULLER_COLUMNS = ('Iteración', 'Re(x)', 'Im(x)', 'Re(f(x))', 'Im(f(x))', '|f(x)|', '|Δx|')
+# Newton con deflación: número de la raíz buscada y si el paso es sobre la función deflactada
+# (1) o el pulido final sobre f (0); en el primer caso f(x) es el valor deflactado
+DEFLATION_COLUMNS = ('root_index', 'deflated', 'iteration', 'x', 'f(x)', 'x_next')
+
+# Columna del iterado actual y de f evaluada en él, por conjunto de columnas (las usa el
+# monitor de convergencia). En Newton f(x) corresponde al iterado anterior a x_next.
+ITERATE_COLUMNS = {
+    BISECTION_COLUMNS: ('c', 'f(c)'),
+    BRACKETING_COLUMNS: ('c', 'f(c)'),
+    SECANT_COLUMNS: ('x2', 'f(x2)'),
+    NEWTON_COLUMNS: ('x_next', 'f(x)'),
+    FIXED_POINT_COLUMNS: ('x_next', 'x - g(x)'),
+}
+
+# Columnas que se devuelven como int al leer una fila
+INTEGER_COLUMNS = ('iteration', 'Iteración', 'Evaluaciones', 'root_index', 'deflated')
+# Columnas que pueden no tener valor (None se guarda como NaN y se lee otra vez como None):
+# el error relativo de la primera iteración y g(g(x)) en la iteración de punto fijo simple.
+# En las demás un NaN es un valor real de f (por ejemplo inf - inf) y se lee como NaN.
+NULLABLE_COLUMNS = ('relative_error', 'g(g(x))')
+
+# Cabecera del formato binario: firma, longitud de la descripción (JSON) y datos float64
+BINARY_MAGIC = b'ITR1'
+
+
+class IterationTrace:
+    """
+    Historial de iteraciones guardado como un único buffer float64 (array.array, que
+    crece por bloques sin un objeto por valor) con columnas con nombre. Cada fila se lee
+    como un diccionario {columna: valor} (los NaN de NULLABLE_COLUMNS se leen como None),
+    así que se puede recorrer igual que la lista de diccionarios que reemplaza:
+    trace[i]['c'], for record in trace, trace[-1].
+    """
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self._index = {name: j for j, name in enumerate(self.columns)}
+        self._width = len(self.columns)
+        self._buffer = array('d')
+        self._size = 0
+
+    def append(self, *values):
+        """
+        Agrega una fila con un valor por columna, en el orden de self.columns (None -> NaN).
+        """
+        if len(values) != self._width:
+            raise ValueError(f"Se esperaban {self._width} valores y se recibieron {len(values)}.")
+        try:
+            # fromlist no modifica el buffer si algún valor no es numérico
+            self._buffer.fromlist(list(values))
+        except TypeError:
+            self._buffer.fromlist([np.nan if value is None else value for value in values])
+        self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    def _row(self, i):
+        row = {}
+        start = i * self._width
+        for name, value in zip(self.columns, self._buffer[start:start + self._width]):
+            if value != value and name in NULLABLE_COLUMNS:
+                row[name] = None
+            else:
+                row[name] = int(value) if name in INTEGER_COLUMNS else value
+        return row
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Índice de iteración fuera de rango.")
+        return self._row(index)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._row(i)
+
+    def __repr__(self):
+        return f"IterationTrace({list(self.columns)}, {self._size} iteraciones)"
+
+    def _matrix(self):
+        # Copia (filas x columnas); una vista bloquearía el crecimiento del buffer
+        return np.array(self._buffer, dtype=float).reshape(self._size, self._width)
+
+    def column(self, name):
+        """
+        Devuelve una copia de la columna como arreglo de NumPy.
+        """
+        return self._matrix()[:, self._index[name]]
+
+    def to_list(self):
+        """
+        Convierte la traza a la lista de diccionarios del formato anterior.
+        """
+        return list(self)
+
+    def _packed(self):
+        # Por columnas: los valores consecutivos de a, b, c se parecen y comprimen mejor
+        return np.ascontiguousarray(self._matrix().T, dtype='<f8').tobytes()
+
+    def to_bytes(self):
+        """
+        Serializa la traza en binario: firma, descripción JSON y columnas float64 contiguas.
+        """
+        header = json.dumps({'columns': self.columns, 'length': self._size}, ensure_ascii=False).encode('utf-8')
+        return BINARY_MAGIC + struct.pack('<I', len(header)) + header + self._packed()
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != BINARY_MAGIC:
+            raise ValueError("Los datos no son una traza de iteraciones.")
+        (header_length,) = struct.unpack('<I', data[4:8])
+        header = json.loads(data[8:8 + header_length].decode('utf-8'))
+        return cls._from_packed(header['columns'], header['length'], data[8 + header_length:])
+
+    @classmethod
+    def _from_packed(cls, columns, length, raw):
+        trace = cls(columns)
+        values = np.frombuffer(raw, dtype='<f8')
+        if values.size != trace._width * length:
+            raise ValueError("La traza de iteraciones está incompleta.")
+        trace._buffer.frombytes(values.reshape(trace._width, length).T.astype(float).tobytes())
+        trace._size = length
+        return trace
+
+    def to_dict(self):
+        """
+        Forma compacta para JSON: las columnas comprimidas con zlib y codificadas en base64.
+        """
+        return {
+            'columns': list(self.columns),
+            'length': self._size,
+            'data': base64.b64encode(zlib.compress(self._packed(), 9)).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls._from_packed(data['columns'], data['length'], zlib.decompress(base64.b64decode(data['data'])))
+
+    @classmethod
+    def from_rows(cls, rows, columns=None):
+        """
+        Construye la traza a partir de la lista de diccionarios del formato anterior.
+        """
+        rows = list(rows)
+        if columns is None:
+            columns = tuple(rows[0]) if rows else ()
+        trace = cls(columns)
+        for row in rows:
+            trace.append(*(row.get(name) for name in trace.columns))
+        return trace
+
+    def __getstate__(self):
+        # Al copiar o enviar a otro proceso solo viajan las filas usadas
+        return {'columns': self.columns, 'length': self._size, 'raw': self._packed()}
+
+    def __setstate__(self, state):
+        trace = IterationTrace._from_packed(state['columns'], state['length'], state['raw'])
+        self.__dict__.update(trace.__dict__)
+
+
+def encode_trace(obj):
+    """
+    Función 'default' para json.dump: guarda las trazas en su forma compacta.
+    """
+    if isinstance(obj, IterationTrace):
+        return obj.to_dict()
+    raise TypeError(f"Objeto de tipo {type(obj).__name__} no serializable en JSON.")
+
+
+def _is_encoded(data):
+    return isinstance(data, dict) and 'columns' in data and 'data' in data
+
+
+def decode_history(data):
+    """
+    Lee el campo 'history' de un ejercicio guardado, en cualquiera de los dos formatos
+    (lista de diccionarios o traza compacta). Devuelve una IterationTrace, o una lista de
+    ellas si el ejercicio tiene varias raíces.
+    """
+    if isinstance(data, IterationTrace):
+        return data
+    if _is_encoded(data):
+        return IterationTrace.from_dict(data)
+    if data and (_is_encoded(data[0]) or isinstance(data[0], (list, IterationTrace))):
+        return [decode_history(item) for item in data]
+    return IterationTrace.from_rows(data or [])
+
+
+if __name__ == "__main__":
+    # Comparación de memoria y tamaño en history.json frente a la lista de diccionarios
+    import sys
+
+    from Biseccion import bisection_method
+    # Biseccion crea las trazas con el módulo importado, no con este __main__
+    from iteration_trace import decode_history, encode_trace
+
+    def dict_bytes(rows):
+        return sum(sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values()) for row in rows) + sys.getsizeof(rows)
+
+    for tol, max_iter in ((1e-4, 100), (1e-300, 1100)):
+        root, iterations, trace = bisection_method("sen(2*x)-log(x)", 1, 2, tol, max_iter)
+        rows = trace.to_list()
+        legacy_json = len(json.dumps(rows, indent=4))
+        compact_json = len(json.dumps(trace, indent=4, default=encode_trace))
+        print(f"{iterations} iteraciones: memoria {dict_bytes(rows)} -> {trace._buffer.itemsize * len(trace._buffer)} bytes, "
+              f"JSON {legacy_json} -> {compact_json} caracteres, binario {len(trace.to_bytes())} bytes")
+        assert decode_history(json.loads(json.dumps(trace, default=encode_trace))).to_list() == rows
+        assert decode_history(rows).to_list() == rows
@@ -0,0 +1,175 @@
+# newton_basins.py
+
+import numpy as np
+
+from function_evaluator import vectorize_value_and_derivative
+
+# Dos raíces se consideran la misma si |z1 - z2| <= ROOT_MERGE_TOLERANCE·max(1, |z1|)
+ROOT_MERGE_TOLERANCE = 1e-6
+# Resolución por defecto de la malla de puntos iniciales (por eje)
+DEFAULT_RESOLUTION = 400
+# Las cuencas que tardan más se dibujan hasta con este porcentaje menos de brillo
+ITERATION_SHADING = 0.75
+BASIN_COLORS = 'tab10'
+
+
+def newton_multistart(func_str, starts, tol=1e-10, max_iter=100):
+    """
+    Método de Newton desde todos los puntos de starts a la vez (reales o complejos, con
+    cualquier forma): cada iteración evalúa f y f' sobre un solo arreglo de NumPy y los
+    puntos que ya convergieron se retiran con máscaras. Usa el mismo criterio de parada
+    que newton_steps (|x_{n+1} - x_n| < tol). Devuelve (final, iterations, converged) con
+    la forma de starts; los puntos que no convergen (derivada nula, fuera del dominio o
+    max_iter agotado) quedan con converged=False.
+    """
+    starts = np.asarray(starts)
+    f_and_prime = vectorize_value_and_derivative(func_str)
+    z = starts.astype(complex if np.iscomplexobj(starts) else float).ravel()
+
+    iterations = np.zeros(z.size, dtype=int)
+    converged = np.zeros(z.size, dtype=bool)
+    active = np.arange(z.size)
+    for iteration in range(1, max_iter + 1):
+        if not active.size:
+            break
+        value, slope = f_and_prime(z[active])
+        with np.errstate(all='ignore'):
+            step = value / slope
+        ok = np.isfinite(step)
+        z[active[ok]] -= step[ok]
+        iterations[active] = iteration
+
+        done = ok & (np.abs(step) < tol)
+        converged[active[done]] = True
+        active = active[ok & ~done]
+
+    return z.reshape(starts.shape), iterations.reshape(starts.shape), converged.reshape(starts.shape)
+
+
+def cluster_roots(values, tolerance=ROOT_MERGE_TOLERANCE):
+    """
+    Agrupa los valores casi iguales (raíces a las que convergieron distintos puntos).
+    Devuelve (roots, labels): las raíces distintas ordenadas por parte real e imaginaria y,
+    para cada valor, el índice de su raíz (-1 si el valor no es finito).
+    """
+    values = np.asarray(values).ravel()
+    labels = np.full(values.size, -1)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return [], labels
+    # Primero se redondea a celdas de la tolerancia (vectorizado) y después se unen las
+    # celdas vecinas, que son pocas, recorriéndolas en Python
+    z = values[finite].astype(complex)
+    cells = np.stack([np.round(z.real / tolerance), np.round(z.imag / tolerance)], axis=1)
+    cells, first, cell_of = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+    representatives = z[first]
+    roots, root_of_cell = [], np.empty(len(cells), dtype=int)
+    for k in np.lexsort((representatives.imag, representatives.real)):
+        r = representatives[k]
+        if roots and abs(r - roots[-1]) <= tolerance * max(1.0, abs(r)):
+            root_of_cell[k] = len(roots) - 1
+            continue
+        match = next((j for j, root in enumerate(roots) if abs(r - root) <= tolerance * max(1.0, abs(r))), None)
+        if match is None:
+            roots.append(complex(r))
+            match = len(roots) - 1
+        root_of_cell[k] = match
+    labels[finite] = root_of_cell[np.ravel(cell_of)]
+    if not np.iscomplexobj(values):
+        roots = [float(r.real) for r in roots]
+    return roots, labels
+
+
+def basin_map(func_str, x_range, y_range=None, resolution=DEFAULT_RESOLUTION, tol=1e-10, max_iter=100):
+    """
+    Cuencas de atracción de Newton. Sin y_range los puntos iniciales son resolution puntos
+    de la recta real en x_range; con y_range es una malla resolution x resolution del plano
+    complejo (x = parte real, y = parte imaginaria). Devuelve un diccionario con los puntos
+    iniciales ('starts'), la raíz de cada uno ('labels', -1 si no convergió), las
+    iteraciones ('iterations'), las raíces distintas ('roots') y cuántos puntos llegaron a
+    cada una ('counts').
+    """
+    x_vals = np.linspace(x_range[0], x_range[1], resolution)
+    if y_range is None:
+        starts = x_vals
+    else:
+        y_vals = np.linspace(y_range[0], y_range[1], resolution)
+        starts = x_vals[np.newaxis, :] + 1j * y_vals[:, np.newaxis]
+
+    final, iterations, converged = newton_multistart(func_str, starts, tol, max_iter)
+    roots, labels = cluster_roots(np.where(converged, final, np.nan))
+    labels = labels.reshape(starts.shape)
+    counts = np.bincount(labels[labels >= 0], minlength=len(roots)).tolist()
+    return {'starts': starts, 'labels': labels, 'iterations': iterations, 'roots': roots, 'counts': counts}
+
+
+def basin_image(labels, iterations, max_iter):
+    """
+    Imagen RGB de las cuencas: un color por raíz, más oscuro cuantas más iteraciones tardó
+    el punto en converger; los puntos que no convergen quedan en negro.
+    """
+    from matplotlib import colormaps
+
+    colors = colormaps[BASIN_COLORS](np.arange(max(labels.max() + 1, 1)) % colormaps[BASIN_COLORS].N)[:, :3]
+    image = colors[np.maximum(labels, 0)]
+    shade = 1 - ITERATION_SHADING * np.minimum(iterations / max(max_iter, 1), 1)
+    image *= shade[..., np.newaxis]
+    image[labels < 0] = 0
+    return image
+
+
+def plot_basins(ax, basins, max_iter):
+    """
+    Dibuja el resultado de basin_map en los ejes de Matplotlib: en el plano complejo como
+    imagen con las raíces marcadas, y en la recta real como una franja de colores.
+    """
+    starts, roots = basins['starts'], basins['roots']
+    image = basin_image(basins['labels'], basins['iterations'], max_iter)
+    if starts.ndim == 2:
+        extent = (starts.real.min(), starts.real.max(), starts.imag.min(), starts.imag.max())
+        ax.imshow(image, origin='lower', extent=extent, aspect='auto', interpolation='nearest')
+        ax.plot([np.real(r) for r in roots], [np.imag(r) for r in roots], 'wx', markersize=8, label='Raíces')
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_ylim(extent[2], extent[3])
+        ax.set_xlabel('Re(x₀)')
+        ax.set_ylabel('Im(x₀)')
+    else:
+        extent = (starts.min(), starts.max(), 0, 1)
+        ax.imshow(image[np.newaxis, :, :], extent=extent, aspect='auto', interpolation='nearest')
+        ax.plot(roots, [0.5] * len(roots), 'wx', markersize=8, label='Raíces')
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_yticks([])
+        ax.set_xlabel('x₀')
+    ax.set_title('Cuencas de atracción del método de Newton')
+
+
+if __name__ == "__main__":
+    # Malla de 1000 x 1000 puntos iniciales en el plano complejo
+    import time
+
+    from Newton import newton_raphson
+    from function_evaluator import compile_value_and_derivative
+
+    for expression in ["x^3 - 1", "x^5 - x - 1", "sin(x) - x/2", "exp(x) - 3x"]:
+        start = time.perf_counter()
+        basins = basin_map(expression, (-2, 2), (-2, 2), resolution=1000)
+        elapsed = time.perf_counter() - start
+        converged = basins['labels'] >= 0
+        print(f"{expression}: {elapsed:.2f} s, {converged.mean():.1%} convergen, "
+              f"iteraciones medias {basins['iterations'][converged].mean():.1f}")
+        # Las raíces que atraen más puntos
+        for count, root in sorted(zip(basins['counts'], basins['roots']), key=lambda item: -item[0])[:5]:
+            print(f"  {complex(root):.10f}: {count} puntos")
+
+    # En la recta real se obtiene lo mismo que newton_raphson desde cada punto
+    f_and_prime = compile_value_and_derivative("x^3 - 2x + 2")
+    starts = np.linspace(-3, 3, 301)
+    final, iterations, converged = newton_multistart("x^3 - 2x + 2", starts)
+    mismatches = 0
+    for x0, x, n, ok in zip(starts, final, iterations, converged):
+        try:
+            root, scalar_n, _ = newton_raphson(f_and_prime, x0, 1e-10)
+            mismatches += not ok or root != x or scalar_n != n
+        except ValueError:
+            mismatches += bool(ok)
+    print(f"recta real: {converged.sum()} de {len(starts)} convergen, diferencias con newton_raphson: {mismatches}")
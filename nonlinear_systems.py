@@ -0,0 +1,185 @@
+# nonlinear_systems.py
+
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+
+from expression_parser import canonical_expression, to_sympy
+from iteration_trace import IterationTrace
+from solver_stream import is_cancelled, run_steps
+
+SYSTEM_METHODS = ("Newton", "Broyden")
+
+
+def system_columns(variables):
+    """
+    Columnas de la traza de un sistema: la iteración, cada incógnita, la norma del residuo
+    ||F(x)|| en el nuevo iterado y la norma del paso ||Δx||.
+    """
+    return ('iteration', *variables, 'residual', 'step')
+
+
+def parse_equation(equation, variables):
+    """
+    Convierte una ecuación en una expresión de SymPy igualada a cero. Acepta 'f = g'
+    (se resuelve f - g = 0) o solo 'f' (se resuelve f = 0).
+    """
+    sides = equation.split('=')
+    if len(sides) > 2:
+        raise ValueError(f"La ecuación '{equation}' tiene más de un signo '='.")
+    expressions = [to_sympy(canonical_expression(side, variables)) for side in sides]
+    return expressions[0] - expressions[1] if len(expressions) == 2 else expressions[0]
+
+
+@lru_cache(maxsize=32)
+def compile_system(equations, variables):
+    """
+    Compila el sistema F(x) = 0 y su matriz jacobiana, construida simbólicamente y
+    convertida con lambdify (las subexpresiones comunes se calculan una vez). Devuelve
+    (residual, jacobian): residual(x) es un vector de n valores y jacobian(x) una matriz
+    n x n, ambos como arreglos de NumPy. equations y variables son tuplas de cadenas.
+    """
+    if len(equations) != len(variables):
+        raise ValueError(f"El sistema tiene {len(equations)} ecuaciones y {len(variables)} incógnitas; deben ser iguales.")
+    symbols = [sp.Symbol(name) for name in variables]
+    try:
+        system = sp.Matrix([parse_equation(equation, variables) for equation in equations])
+    except ValueError as e:
+        raise ValueError(f"Error en la expresión: {e}")
+    residual_func = sp.lambdify(symbols, list(system), modules='numpy', cse=True)
+    jacobian_func = sp.lambdify(symbols, system.jacobian(symbols), modules='numpy', cse=True)
+
+    def residual(x):
+        try:
+            with np.errstate(all='ignore'):
+                values = np.array(residual_func(*x), dtype=float)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar el sistema en x = {list(x)}:\n{e}")
+        if not np.all(np.isfinite(values)):
+            raise ValueError(f"El sistema no está definido en x = {list(x)}.")
+        return values
+
+    def jacobian(x):
+        try:
+            with np.errstate(all='ignore'):
+                return np.array(jacobian_func(*x), dtype=float)
+        except Exception as e:
+            raise ValueError(f"Error al evaluar la matriz jacobiana en x = {list(x)}:\n{e}")
+
+    return residual, jacobian
+
+
+def _solve_step(matrix, rhs, x):
+    try:
+        step = np.linalg.solve(matrix, rhs)
+    except np.linalg.LinAlgError:
+        step = None
+    if step is None or not np.all(np.isfinite(step)):
+        raise ValueError(f"La matriz jacobiana es singular en x = {list(x)}. El método no puede continuar.")
+    return step
+
+
+def newton_system_steps(residual, jacobian, x0, tol, max_iter=100, token=None):
+    """
+    Generador del método de Newton para sistemas: en cada iteración resuelve J(x) Δx = -F(x).
+    Produce una tupla (iteración, x_1, ..., x_n, ||F||, ||Δx||) con el nuevo iterado y
+    devuelve la solución cuando ||Δx|| < tol, o None si el token se cancela.
+    """
+    x = np.array(x0, dtype=float)
+    f_x = residual(x)
+    for i in range(1, max_iter + 1):
+        if is_cancelled(token):
+            return None
+        step = _solve_step(jacobian(x), -f_x, x)
+        x = x + step
+        f_x = residual(x)
+        step_norm = float(np.linalg.norm(step))
+        yield (i, *x.tolist(), float(np.linalg.norm(f_x)), step_norm)
+
+        if step_norm < tol or not f_x.any():
+            return x
+
+    raise ValueError(f"El método no convergió después de {max_iter} iteraciones.")
+
+
+def broyden_steps(residual, jacobian, x0, tol, max_iter=100, token=None):
+    """
+    Generador del método de Broyden (cuasi-Newton): la jacobiana se evalúa solo al inicio y
+    después se actualiza su inversa con la fórmula de Sherman-Morrison, que cuesta O(n²) por
+    iteración en lugar de evaluar la jacobiana y resolver un sistema lineal (O(n³)). Si la
+    actualización se vuelve inestable se recalcula la jacobiana. Produce las mismas tuplas
+    que newton_system_steps.
+    """
+    x = np.array(x0, dtype=float)
+    f_x = residual(x)
+    inverse = _solve_step(jacobian(x), np.eye(len(x)), x)
+    for i in range(1, max_iter + 1):
+        if is_cancelled(token):
+            return None
+        step = -inverse @ f_x
+        x = x + step
+        f_next = residual(x)
+        step_norm = float(np.linalg.norm(step))
+        yield (i, *x.tolist(), float(np.linalg.norm(f_next)), step_norm)
+
+        if step_norm < tol or not f_next.any():
+            return x
+
+        # Actualización de la inversa: H += (Δx - H Δf) Δxᵀ H / (Δxᵀ H Δf)
+        change = inverse @ (f_next - f_x)
+        denominator = step @ change
+        if denominator != 0 and np.isfinite(denominator):
+            inverse += np.outer(step - change, step @ inverse) / denominator
+        else:
+            inverse = _solve_step(jacobian(x), np.eye(len(x)), x)
+        f_x = f_next
+
+    raise ValueError(f"El método no convergió después de {max_iter} iteraciones.")
+
+
+def solve_system(equations, variables, x0, tol=1e-10, max_iter=100, method="Newton"):
+    """
+    Resuelve el sistema de ecuaciones no lineales sin interfaz. Retorna la solución (arreglo
+    con un valor por incógnita), el número de iteraciones y el historial (IterationTrace con
+    las columnas de system_columns).
+    """
+    if method not in SYSTEM_METHODS:
+        raise ValueError(f"Método desconocido: {method}. Opciones: {', '.join(SYSTEM_METHODS)}.")
+    variables = tuple(variables)
+    if len(x0) != len(variables):
+        raise ValueError(f"Se necesitan {len(variables)} valores iniciales y se recibieron {len(x0)}.")
+    residual, jacobian = compile_system(tuple(equations), variables)
+    steps = newton_system_steps if method == "Newton" else broyden_steps
+    history = IterationTrace(system_columns(variables))
+    root = run_steps(steps(residual, jacobian, x0, tol, max_iter), history)
+    return root, len(history), history
+
+
+if __name__ == "__main__":
+    import time
+
+    # Sistema 2 x 2: circunferencia y parábola
+    for method in SYSTEM_METHODS:
+        root, iterations, history = solve_system(["x^2 + y^2 = 4", "y = x^2 - 1"], ('x', 'y'), (1, 1), method=method)
+        print(f"{method}: {root} en {iterations} iteraciones, ||F|| = {history[-1]['residual']:.2e}")
+
+    # Sistema de Broyden tridiagonal con 40 incógnitas
+    n = 40
+    variables = tuple(f"x{i}" for i in range(1, n + 1))
+    equations = []
+    for i, name in enumerate(variables):
+        equation = f"(3 - 2*{name})*{name} + 1"
+        if i > 0:
+            equation += f" - {variables[i - 1]}"
+        if i < n - 1:
+            equation += f" - 2*{variables[i + 1]}"
+        equations.append(equation)
+    start = time.perf_counter()
+    compile_system(tuple(equations), variables)
+    print(f"jacobiana de {n} x {n} construida en {(time.perf_counter() - start) * 1e3:.0f} ms")
+    for method in SYSTEM_METHODS:
+        start = time.perf_counter()
+        root, iterations, history = solve_system(equations, variables, [-1.0] * n, method=method)
+        elapsed = (time.perf_counter() - start) * 1e3
+        print(f"{method}, {n} incógnitas: {iterations} iteraciones, ||F|| = {history[-1]['residual']:.2e}, {elapsed:.0f} ms")
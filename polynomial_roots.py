@@ -0,0 +1,192 @@
+# polynomial_roots.py
+
+from functools import lru_cache
+
+import numpy as np
+
+from expression_optimizer import fold_constants
+from expression_parser import canonical_expression
+
+# Grado máximo que se expande (por encima, el escaneo general es más confiable)
+MAX_DEGREE = 64
+# Pasos de Newton con los que se pulen los valores propios
+POLISH_STEPS = 3
+# Una raíz se considera real si |Im z| <= REAL_TOLERANCE·max(1, |z|); las raíces múltiples
+# salen de la matriz compañera como grupos de radio ~ eps^(1/m)
+REAL_TOLERANCE = 1e-6
+UNIT_ROUNDOFF = 2.0 ** -53
+
+
+class _NotPolynomial(Exception):
+    pass
+
+
+def _add(p, q):
+    if len(p) < len(q):
+        p, q = q, p
+    return [c + (q[i] if i < len(q) else 0.0) for i, c in enumerate(p)]
+
+
+def _scale(p, factor):
+    return [c * factor for c in p]
+
+
+def _multiply(p, q):
+    if len(p) + len(q) - 2 > MAX_DEGREE:
+        raise _NotPolynomial
+    product = [0.0] * (len(p) + len(q) - 1)
+    for i, a in enumerate(p):
+        for j, b in enumerate(q):
+            product[i + j] += a * b
+    return product
+
+
+def _coefficients(node, variable):
+    """
+    Coeficientes del polinomio representado por node, de menor a mayor grado.
+    Lanza _NotPolynomial si el AST no es un polinomio en la variable.
+    """
+    kind = node[0]
+    if kind == 'num':
+        return [float(node[1])]
+    if kind == 'var':
+        if node[1] != variable:
+            raise _NotPolynomial
+        return [0.0, 1.0]
+    if kind == 'neg':
+        return _scale(_coefficients(node[1], variable), -1.0)
+    if kind in ('add', 'sub'):
+        p, q = _coefficients(node[1], variable), _coefficients(node[2], variable)
+        return _add(p, _scale(q, -1.0) if kind == 'sub' else q)
+    if kind == 'mul':
+        return _multiply(_coefficients(node[1], variable), _coefficients(node[2], variable))
+    if kind == 'div':
+        denominator = _coefficients(node[2], variable)
+        if len(denominator) != 1 or denominator[0] == 0:
+            raise _NotPolynomial
+        return _scale(_coefficients(node[1], variable), 1.0 / denominator[0])
+    if kind == 'pow' and node[2][0] == 'num':
+        exponent = node[2][1]
+        if exponent != int(exponent) or exponent < 0:
+            raise _NotPolynomial
+        base = _coefficients(node[1], variable)
+        result = [1.0]
+        for _ in range(int(exponent)):
+            result = _multiply(result, base)
+        return result
+    raise _NotPolynomial
+
+
+@lru_cache(maxsize=128)
+def polynomial_coefficients(func_str, variable='x'):
+    """
+    Si la función es un polinomio de grado >= 1 en la variable, devuelve sus coeficientes
+    de mayor a menor grado (convención de np.polyval); si no, devuelve None.
+    """
+    try:
+        coefficients = _coefficients(fold_constants(canonical_expression(func_str, (variable,))), variable)
+    except (_NotPolynomial, ValueError):
+        return None
+    while len(coefficients) > 1 and coefficients[-1] == 0:
+        coefficients.pop()
+    if len(coefficients) < 2 or not all(np.isfinite(coefficients)):
+        return None
+    return tuple(reversed(coefficients))
+
+
+def polish_roots(coefficients, roots, steps=POLISH_STEPS):
+    """
+    Mejora las raíces con unos pasos de Newton en aritmética compleja. Un paso solo se
+    acepta si reduce |p(z)|, así que el pulido nunca empeora un valor propio.
+    """
+    derivative = np.polyder(coefficients)
+    roots = np.array(roots, dtype=complex)
+    values = np.polyval(coefficients, roots)
+    for _ in range(steps):
+        slopes = np.polyval(derivative, roots)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            candidates = roots - values / slopes
+        candidate_values = np.polyval(coefficients, candidates)
+        better = np.isfinite(candidates) & (np.abs(candidate_values) < np.abs(values))
+        if not better.any():
+            break
+        roots[better], values[better] = candidates[better], candidate_values[better]
+    return roots
+
+
+@lru_cache(maxsize=128)
+def polynomial_roots(func_str, variable='x'):
+    """
+    Todas las raíces (reales y complejas) de un polinomio, como valores propios de su
+    matriz compañera (np.roots) pulidos con Newton. Devuelve None si no es un polinomio.
+    """
+    coefficients = polynomial_coefficients(func_str, variable)
+    if coefficients is None:
+        return None
+    return tuple(complex(z) for z in polish_roots(coefficients, np.roots(coefficients)))
+
+
+def real_roots(func_str, a, b, variable='x'):
+    """
+    Raíces reales distintas del polinomio dentro de [a, b], ordenadas (los grupos de una
+    raíz múltiple se unen en un solo punto). Devuelve None si no es un polinomio.
+    """
+    roots = polynomial_roots(func_str, variable)
+    if roots is None:
+        return None
+    candidates = sorted(z.real for z in roots if abs(z.imag) <= REAL_TOLERANCE * max(1.0, abs(z)))
+    groups = []
+    for x in candidates:
+        if groups and x - groups[-1][-1] <= REAL_TOLERANCE * max(1.0, abs(x)):
+            groups[-1].append(x)
+        else:
+            groups.append([x])
+    return [sum(group) / len(group) for group in groups if a <= sum(group) / len(group) <= b]
+
+
+def polynomial_brackets(func_str, a, b):
+    """
+    Intervalos con exactamente una raíz real distinta del polinomio cada uno, en el formato
+    de scan_brackets: las raíces con cambio de signo se devuelven como (lo, hi) separadas
+    por los puntos medios entre raíces consecutivas y las de multiplicidad par como (x, x).
+    Devuelve None si la función no es un polinomio (o no se puede evaluar en [a, b]).
+    """
+    from function_evaluator import compile_function
+
+    roots = real_roots(func_str, a, b)
+    if roots is None:
+        return None
+    coefficients = polynomial_coefficients(func_str)
+    f = compile_function(func_str)
+    bounds = [a] + [(p + q) / 2 for p, q in zip(roots, roots[1:])] + [b]
+    brackets = []
+    try:
+        values = [f(x) for x in bounds]
+        for i, root in enumerate(roots):
+            if values[i] * values[i + 1] < 0:
+                brackets.append((float(bounds[i]), float(bounds[i + 1])))
+                continue
+            # Sin cambio de signo: se acepta si p(x) es cero dentro del error de Horner
+            bound = 2 * len(coefficients) * UNIT_ROUNDOFF * np.polyval(np.abs(coefficients), abs(root))
+            if abs(f(root)) <= bound:
+                brackets.append((float(root), float(root)))
+    except ValueError:
+        return None
+    return brackets
+
+
+if __name__ == "__main__":
+    import time
+
+    from root_scan import find_all_roots
+
+    for expression in ["x**3 - x - 2", "x^4 - 2x^2 + 1", "(x - 1)(x - 1.001)(x + 3)", "x^5 - x - 1", "sin(x) - x/2"]:
+        roots = polynomial_roots(expression)
+        if roots is None:
+            print(f"{expression}: no es un polinomio")
+            continue
+        start = time.perf_counter()
+        found, _ = find_all_roots(expression, -10, 10, 1e-10)
+        elapsed = (time.perf_counter() - start) * 1e3
+        print(f"{expression}: raíces {[complex(round(z.real, 6), round(z.imag, 6)) for z in roots]}")
+        print(f"  reales en [-10, 10] con bisección: {found} ({elapsed:.1f} ms)")
@@ -0,0 +1,300 @@
+# root_scan.py
+
+import numpy as np
+
+from adaptive_precision import compile_adaptive_function
+from function_evaluator import compile_function, vectorize_function
+from interval_arithmetic import ENTIRE, Interval, interval_function, mean_value_enclosure
+from iteration_trace import BISECTION_COLUMNS, IterationTrace
+from polynomial_roots import polynomial_brackets
+from vector_bisection import bisect_lockstep
+
+# Puntos de la malla inicial (independiente del ancho de [a, b])
+DEFAULT_SAMPLES = 512
+# Puntos que se agregan dentro de cada celda sospechosa en cada nivel de refinamiento
+SUBDIVISIONS = 16
+MAX_REFINEMENTS = 10
+# Máximo de evaluaciones adicionales (funciones con infinitas raíces, como sin(1/x) cerca de 0)
+MAX_EVALUATIONS = 100000
+# Búsqueda determinista de un intervalo: puntos del primer bloque y máximo de puntos
+SEARCH_INITIAL_SAMPLES = 64
+SEARCH_MAX_SAMPLES = 4096
+
+
+def _certify(F, lo, hi, dF=None):
+    """
+    Evalúa la envolvente de F sobre [lo, hi] (con la forma de valor medio si se da dF).
+    Devuelve None si f no está definida en la celda y ENTIRE si la envolvente no se pudo
+    calcular (la celda no se puede descartar).
+    """
+    try:
+        if dF is not None:
+            return mean_value_enclosure(F, dF, Interval(lo, hi))
+        return F(Interval(lo, hi))
+    except ValueError:
+        return None
+    except (ArithmeticError, TypeError):
+        return ENTIRE
+
+
+def _merge_zeros(points, flat_cells, gap):
+    """
+    Agrupa los puntos con f = 0 exacto unidos por celdas donde f es idénticamente 0 o
+    separados por menos de 'gap' (el ruido de redondeo alrededor de una raíz múltiple muy
+    plana, como tan(x) - x en 0) y devuelve un punto por grupo.
+    """
+    spans = sorted([(x, x) for x in points] + flat_cells)
+    groups = []
+    for lo, hi in spans:
+        if groups and lo <= groups[-1][1] + gap:
+            groups[-1][1] = max(groups[-1][1], hi)
+            groups[-1][2].append(lo)
+        else:
+            groups.append([lo, hi, [lo]])
+    return [(zeros[len(zeros) // 2],) * 2 for _, _, zeros in groups]
+
+
+def scan_brackets(func_str, a, b, min_width, samples=DEFAULT_SAMPLES, max_refinements=MAX_REFINEMENTS):
+    """
+    Muestrea f en una malla vectorizada sobre [a, b] y la refina solo donde puede haber
+    raíces ocultas. Cada celda de la malla se clasifica así:
+    - sin cambio de signo: se descarta si la aritmética de intervalos prueba que f no se anula;
+      si no, se subdivide (puede ocultar dos raíces muy próximas),
+    - con cambio de signo: es un intervalo válido si f' no se anula en ella (raíz única);
+      si no, se subdivide (puede haber tres raíces o más).
+    Todas las subdivisiones de un nivel se evalúan con una sola llamada vectorizada.
+    Los polinomios no se muestrean: sus raíces se obtienen de la matriz compañera.
+    Devuelve la lista ordenada de intervalos (lo, hi); las raíces exactas se devuelven como (x, x).
+    """
+    brackets = polynomial_brackets(func_str, a, b)
+    if brackets is not None:
+        return brackets
+
+    f = vectorize_function(func_str)
+    F = interval_function(func_str)
+    dF = interval_function(func_str, derivative=True)
+
+    x = np.linspace(a, b, samples)
+    y = f(x)
+    lo, hi, f_lo, f_hi = x[:-1], x[1:], y[:-1], y[1:]
+    zeros = list(x[y == 0])
+    flat_cells = []
+    brackets = []
+    budget = MAX_EVALUATIONS
+    offsets = np.linspace(0, 1, SUBDIVISIONS + 2)
+    for level in range(max_refinements + 1):
+        refine = []
+        for i in range(len(lo)):
+            if not (np.isfinite(f_lo[i]) and np.isfinite(f_hi[i])):
+                continue
+            if f_lo[i] == 0 and f_hi[i] == 0:
+                flat_cells.append((lo[i], hi[i]))
+                continue
+            small = hi[i] - lo[i] <= min_width or level == max_refinements
+            if f_lo[i] * f_hi[i] < 0:
+                if small:
+                    brackets.append((lo[i], hi[i]))
+                    continue
+                slope = _certify(dF, lo[i], hi[i])
+                if slope is not None and not slope.contains(0):
+                    brackets.append((lo[i], hi[i]))
+                else:
+                    refine.append(i)
+            elif not small:
+                enclosure = _certify(F, lo[i], hi[i], dF)
+                if enclosure is not None and enclosure.contains(0):
+                    refine.append(i)
+        if not refine:
+            break
+        budget -= len(refine) * SUBDIVISIONS
+        if budget < 0:
+            # Presupuesto agotado: se conservan los cambios de signo sin refinar
+            brackets.extend((lo[i], hi[i]) for i in refine if f_lo[i] * f_hi[i] < 0)
+            break
+        refine = np.array(refine)
+        points = lo[refine, None] + (hi[refine] - lo[refine])[:, None] * offsets
+        points[:, -1] = hi[refine]
+        values = np.empty_like(points)
+        values[:, 0], values[:, -1] = f_lo[refine], f_hi[refine]
+        values[:, 1:-1] = f(points[:, 1:-1].ravel()).reshape(len(refine), -1)
+        zeros.extend(points[:, 1:-1][values[:, 1:-1] == 0])
+        lo, hi = points[:, :-1].ravel(), points[:, 1:].ravel()
+        f_lo, f_hi = values[:, :-1].ravel(), values[:, 1:].ravel()
+
+    brackets = [(float(p), float(q)) for p, q in brackets]
+    brackets += [(float(p), float(q)) for p, q in _merge_zeros(zeros, flat_cells, SUBDIVISIONS * min_width)]
+    return sorted(brackets)
+
+
+def _is_continuous(F, lo, hi):
+    # Un cambio de signo con f no acotada en el intervalo es un polo, no una raíz
+    enclosure = _certify(F, lo, hi)
+    return enclosure is not None and enclosure.is_bounded()
+
+
+def polish_brackets(func_str, brackets, tol, max_iter=100, adaptive=False):
+    """
+    Aplica bisección a todos los intervalos a la vez con bisect_lockstep, así que cada raíz
+    coincide con la que daría bisection_method sobre su intervalo. Devuelve, ordenadas, las
+    raíces y su historial en el mismo formato. Los intervalos degenerados (x, x) (raíces de
+    multiplicidad par o con f(x) = 0 exacto) ya están convergidos: se devuelven tal cual,
+    con un historial de una sola fila. Los intervalos que encierran un polo (f no acotada,
+    como tan(x) en pi/2) y los que no convergen se descartan.
+    """
+    F = interval_function(func_str)
+    f = compile_adaptive_function(func_str) if adaptive else compile_function(func_str)
+    found = []
+    cells = []
+    for lo, hi in brackets:
+        if lo < hi:
+            if _is_continuous(F, lo, hi):
+                cells.append((lo, hi))
+            continue
+        # bisect_lockstep descartaría el intervalo (f(a)·f(b) > 0 salvo si f(x) = 0 exacto)
+        try:
+            value = f(lo)
+        except (ValueError, ArithmeticError, TypeError):
+            continue
+        history = IterationTrace(BISECTION_COLUMNS)
+        history.append(1, lo, hi, lo, value, None)
+        found.append((float(lo), history))
+    if cells:
+        roots, _, converged, histories = bisect_lockstep(
+            func_str, [lo for lo, _ in cells], [hi for _, hi in cells], tol, max_iter,
+            adaptive=adaptive, record_history=True)
+        found += [(float(roots[i]), histories[i]) for i in np.nonzero(converged)[0]]
+    found.sort(key=lambda item: item[0])
+    return [root for root, _ in found], [history for _, history in found]
+
+
+def van_der_corput(start, stop, base=2):
+    """
+    Términos start..stop-1 de la sucesión de van der Corput (la de Halton en una dimensión)
+    en [0, 1). Los primeros base^k términos forman una malla uniforme y cada bloque siguiente
+    la refina intercalando puntos nuevos, así que muestrear en bloques no repite evaluaciones.
+    """
+    indices = np.arange(start, stop)
+    points = np.zeros(len(indices))
+    scale = 1.0
+    while indices.any():
+        scale /= base
+        points += (indices % base) * scale
+        indices //= base
+    return points
+
+
+def _sign_changes(x, y):
+    # Celdas entre muestras consecutivas (ordenadas) con cambio de signo estricto; los ceros
+    # exactos se saltan, así que una raíz en un punto de la muestra queda dentro de una celda
+    order = np.argsort(x)
+    x, y = x[order], y[order]
+    keep = np.isfinite(y) & (y != 0)
+    x, y = x[keep], y[keep]
+    change = np.nonzero(y[:-1] * y[1:] < 0)[0]
+    return x[change], x[change + 1], np.abs(y[change]) + np.abs(y[change + 1])
+
+
+def _polynomial_cells(f, brackets, samples):
+    # Los intervalos de polynomial_brackets llegan hasta los puntos medios entre raíces (son
+    # los más anchos posibles): cada uno se muestrea con un bloque de van der Corput y se
+    # reemplaza por la celda con cambio de signo más estrecha, que contiene su única raíz
+    cells = []
+    for lo, hi in brackets:
+        if lo == hi:
+            continue
+        x = np.append(lo + (hi - lo) * van_der_corput(0, samples), hi)
+        cell_lo, cell_hi, residual = _sign_changes(x, f(x))
+        if not len(cell_lo):
+            cells.append((lo, hi, np.inf))
+            continue
+        i = np.lexsort((residual, cell_hi - cell_lo))[0]
+        cells.append((float(cell_lo[i]), float(cell_hi[i]), residual[i]))
+    cells.sort(key=lambda cell: (cell[1] - cell[0], cell[2]))
+    return [(lo, hi) for lo, hi, _ in cells]
+
+
+def sample_brackets(func_str, a, b, initial_samples=SEARCH_INITIAL_SAMPLES, max_samples=SEARCH_MAX_SAMPLES):
+    """
+    Busca de forma determinista intervalos con cambio de signo de f en [a, b]: evalúa f en
+    bloques de la sucesión de van der Corput (una llamada vectorizada por bloque) y duplica
+    los puntos hasta encontrar al menos un cambio de signo o llegar a max_samples. En los
+    polinomios se parte de sus raíces reales y se toma una celda de la muestra alrededor de
+    cada una. Devuelve los intervalos (lo, hi), lo < hi, del más estrecho al más ancho
+    (a igual ancho, primero el de menor |f(lo)| + |f(hi)|); los saltos de signo en un polo
+    (f no acotada) se descartan.
+    """
+    f = vectorize_function(func_str)
+    brackets = polynomial_brackets(func_str, a, b)
+    if brackets is not None:
+        return _polynomial_cells(f, brackets, initial_samples)
+
+    F = interval_function(func_str)
+    x = np.empty(0)
+    y = np.empty(0)
+    size = initial_samples
+    while True:
+        # Se agregan los puntos del nuevo bloque; b se incluye en el primero
+        new_x = a + (b - a) * van_der_corput(len(x), size)
+        if not len(x):
+            new_x = np.append(new_x, b)
+        x = np.concatenate([x, new_x])
+        y = np.concatenate([y, f(new_x)])
+        lo, hi, residual = _sign_changes(x, y)
+        candidates = [i for i in np.lexsort((residual, hi - lo)) if _is_continuous(F, lo[i], hi[i])]
+        if candidates or size >= max_samples:
+            return [(float(lo[i]), float(hi[i])) for i in candidates]
+        size *= 2
+
+
+def sample_start_pairs(func_str, a, b, initial_samples=SEARCH_INITIAL_SAMPLES, max_samples=SEARCH_MAX_SAMPLES):
+    """
+    Pares de puntos iniciales (x0, x1) para la secante, de forma determinista: los extremos
+    de los intervalos de sample_brackets y, si f no cambia de signo en [a, b], la muestra con
+    menor |f| junto con su vecina (con f distinta). Devuelve una lista, vacía si f no se
+    puede evaluar en ningún punto.
+    """
+    brackets = sample_brackets(func_str, a, b, initial_samples, max_samples)
+    if brackets:
+        return brackets
+    x = np.sort(np.append(a + (b - a) * van_der_corput(0, initial_samples), b))
+    y = vectorize_function(func_str)(x)
+    pairs = []
+    for i in np.argsort(np.where(np.isfinite(y), np.abs(y), np.inf)):
+        if not np.isfinite(y[i]):
+            break
+        for j in (i + 1, i - 1):
+            if 0 <= j < len(x) and np.isfinite(y[j]) and y[j] != y[i]:
+                pairs.append((float(x[i]), float(x[j])))
+                break
+    return pairs
+
+
+def find_all_roots(func_str, a, b, tol, max_iter=100, samples=DEFAULT_SAMPLES):
+    """
+    Encuentra todas las raíces de f en [a, b] con su historial de iteraciones
+    (formato de bisection_method). El costo depende del número de raíces, no del ancho
+    del intervalo: la malla inicial es fija y solo se refinan las celdas con posibles raíces.
+    """
+    brackets = scan_brackets(func_str, a, b, min_width=tol, samples=samples)
+    return polish_brackets(func_str, brackets, tol, max_iter)
+
+
+if __name__ == "__main__":
+    import time
+
+    for expression, a, b in [
+        ("sen(2*x)-log(x)", 0.1, 1000),
+        ("(x - 1)(x - 1.001)(x + 3)", -1000, 1000),
+        ("sin(x)", -100, 100),
+        ("tan(x) - x", -10, 10),
+    ]:
+        start = time.perf_counter()
+        roots, histories = find_all_roots(expression, a, b, 1e-8)
+        elapsed = (time.perf_counter() - start) * 1e3
+        print(f"{expression} en [{a}, {b}]: {len(roots)} raíces en {elapsed:.1f} ms -> {roots[:4]}")
+
+    # Búsqueda determinista de un intervalo para los ejercicios aleatorios
+    for expression in ["exp(-(x - 3.3)^2 * 400) - 0.5", "tan(x)", "x^2 + 1", "log(x) - 1"]:
+        brackets = sample_brackets(expression, -10, 10)
+        pairs = sample_start_pairs(expression, -10, 10)
+        print(f"{expression}: intervalo {brackets[0] if brackets else None}, secante {pairs[0] if pairs else None}")
@@ -0,0 +1,69 @@
+# solver_stream.py
+
+import threading
+import time
+
+# Tiempo máximo (segundos) que la interfaz dedica a iterar antes de devolver el control a Tk
+TK_SLICE_SECONDS = 0.015
+
+
+class CancellationToken:
+    """
+    Señal de cancelación que un generador de iteraciones consulta en cada paso. Se puede
+    cancelar desde otro hilo o desde la interfaz (botón Detener); con timeout se cancela
+    sola al vencer el plazo.
+    """
+
+    def __init__(self, timeout=None):
+        self._event = threading.Event()
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self._event.set()
+        return self._event.is_set()
+
+
+def is_cancelled(token):
+    return token is not None and token.cancelled
+
+
+def run_steps(steps, trace):
+    """
+    Consume un generador de iteraciones guardando cada registro en la traza y devuelve la
+    raíz con la que terminó. Es la base de las funciones que devuelven el historial completo.
+    """
+    while True:
+        try:
+            record = next(steps)
+        except StopIteration as stop:
+            if stop.value is None:
+                raise ValueError("El cálculo fue cancelado.")
+            return stop.value
+        trace.append(*record)
+
+
+def stream_to_tk(widget, steps, on_record, on_finish, on_error, slice_seconds=TK_SLICE_SECONDS):
+    """
+    Consume el generador dentro del bucle de Tk en bloques de slice_seconds, para que la
+    ventana siga respondiendo: on_record(registro) se llama por iteración, on_finish(raíz)
+    al terminar (raíz None si se canceló) y on_error(excepción) si el método falla.
+    """
+    def tick():
+        deadline = time.perf_counter() + slice_seconds
+        try:
+            while time.perf_counter() < deadline:
+                on_record(next(steps))
+        except StopIteration as stop:
+            on_finish(stop.value)
+            return
+        except Exception as e:
+            on_error(e)
+            return
+        widget.after(1, tick)
+
+    widget.after(0, tick)
@@ -0,0 +1,27 @@
+# conftest.py
+
+import os
+import sys
+
+import pytest
+
+# Los módulos de la aplicación están en la raíz del repositorio; las gráficas no necesitan pantalla
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import function_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    # Cada prueba usa su propia caché en disco, vacía
+    monkeypatch.setattr(function_cache, 'CACHE_DIR', str(tmp_path / 'function_cache'))
+    return tmp_path / 'function_cache'
+
+
+@pytest.fixture(scope='session')
+def busqueda():
+    # BúsquedaRaíces.PY no se puede importar con 'import' (extensión .PY)
+    from batch_solver import _load_module
+    return _load_module('BúsquedaRaíces')
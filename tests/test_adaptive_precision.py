@@ -0,0 +1,17 @@
+# test_adaptive_precision.py
+
+from adaptive_precision import compile_adaptive_function
+
+# (x-1)^7 expandido: cerca de x = 1 el signo en float64 no es confiable
+EXPANDED = "x^7 - 7x^6 + 21x^5 - 35x^4 + 35x^3 - 21x^2 + 7x - 1"
+
+
+def test_escalations_are_counted_per_run():
+    first = compile_adaptive_function(EXPANDED)
+    assert first(1.001) > 0 and first(0.999) < 0
+    assert first.escalations == 2
+
+    second = compile_adaptive_function(EXPANDED)
+    assert second.escalations == 0
+    second(3.0)
+    assert second.escalations == 0 and first.escalations == 2
@@ -0,0 +1,66 @@
+# test_batch_solver.py
+
+import math
+import signal
+import time
+
+import pytest
+
+import batch_solver
+from convergence import STOP_FAILURE, STOP_METHOD, STOP_TIMEOUT
+from batch_solver import solve_all
+
+
+def test_results_come_back_in_order_with_errors_reported():
+    jobs = [
+        ('biseccion', 'x^2 - 2', (0, 2, 1e-10)),
+        ('biseccion', 'x^2 + 1', (0, 2, 1e-10)),    # sin cambio de signo
+        ('metodo_inexistente', 'x', (0, 1)),
+        ('brent', 'x +* 2', (0, 2, 1e-10, 100)),     # expresión inválida
+        ('newton', 'x^3 - 2x - 5', (2.0, 1e-12)),
+        ('halley', 'x^3 - 2x - 5', (2.0, 1e-12)),
+        ('newton_seguro', 'atan(x)', (1.5, 1e-12)),
+    ]
+    results = solve_all(jobs, max_workers=1)
+    assert [result['index'] for result in results] == list(range(len(jobs)))
+
+    solved, no_sign_change, unknown, invalid, newton, halley, rtsafe = results
+    assert abs(solved['root'] - math.sqrt(2)) < 1e-9 and solved['error'] is None
+    assert solved['stop_reason'] == STOP_METHOD
+    for result in (no_sign_change, unknown, invalid):
+        assert result['root'] is None
+        assert result['error']
+        assert result['stop_reason'] == STOP_FAILURE
+    assert 'inexistente' in unknown['error']
+    assert abs(newton['root'] - 2.0945514815423265) < 1e-12
+    assert abs(halley['root'] - 2.0945514815423265) < 1e-12
+    assert abs(rtsafe['root']) < 1e-12
+
+
+@pytest.mark.skipif(not hasattr(signal, 'setitimer'), reason="el límite de tiempo usa SIGALRM")
+def test_timeout_is_not_reported_as_a_method_error(monkeypatch):
+    # Un método que, como los envoltorios del parser, convierte cualquier Exception en ValueError
+    def slow_solver(func, *params, monitor=None):
+        try:
+            time.sleep(5)
+        except Exception as e:
+            raise ValueError(f"Error en la expresión: {e}")
+
+    monkeypatch.setattr(batch_solver, 'resolve_method', lambda method: slow_solver)
+    previous = signal.signal(signal.SIGALRM, batch_solver._raise_timeout)
+    try:
+        start = time.perf_counter()
+        result = batch_solver._solve_one(0, 'lento', 'x', (), 0.05, False)
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+    assert time.perf_counter() - start < 2
+    assert result['error'] == "Tiempo límite excedido (0.05 s)."
+    assert result['stop_reason'] == STOP_TIMEOUT
+    assert result['root'] is None
+    # La alarma quedó desactivada
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+
+def test_history_is_included_on_request():
+    (result,) = solve_all([('secante', 'x^2 - 2', (1, 2, 1e-10, 100))], max_workers=1, include_history=True)
+    assert len(result['history']) == result['iterations']
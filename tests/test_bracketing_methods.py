@@ -0,0 +1,45 @@
+# test_bracketing_methods.py
+
+import math
+
+import pytest
+
+from convergence import ConvergenceMonitor
+
+CASES = [
+    ("x^3 - 2x - 5", 2, 3, 2.0945514815423265),
+    ("sen(2*x)-log(x)", 1, 2, 1.3994288680136228),
+    ("exp(-x) - x", 0, 1, 0.5671432904097838),
+    ("cos x - x", 0, 1, 0.7390851332151607),
+]
+
+
+@pytest.mark.parametrize('method', ['brent', 'itp', 'falsa_posicion'])
+@pytest.mark.parametrize('func, a, b, root', CASES)
+def test_bracketing_methods_find_the_root(busqueda, method, func, a, b, root):
+    found, iterations, history = getattr(busqueda, method)(func, a, b, 1e-10, 200)
+    assert abs(found - root) < 1e-8
+    assert iterations == len(history) > 0
+    # El intervalo de cada iteración sigue encerrando la raíz
+    for data in history:
+        assert data['a'] - 1e-12 <= root <= data['b'] + 1e-12
+
+
+@pytest.mark.parametrize('method', ['brent', 'itp'])
+def test_brent_and_itp_beat_bisection(busqueda, method):
+    # Bisección necesita unas 34 iteraciones para tol = 1e-10 en [2, 3]
+    _, iterations, _ = getattr(busqueda, method)("x^3 - 2x - 5", 2, 3, 1e-10, 200)
+    assert iterations < 34
+
+
+@pytest.mark.parametrize('method', ['brent', 'itp'])
+def test_missing_sign_change_raises(busqueda, method):
+    with pytest.raises(ValueError):
+        getattr(busqueda, method)("x^2 + 1", -1, 1, 1e-10, 100)
+
+
+def test_monitor_reports_the_stop_reason(busqueda):
+    monitor = ConvergenceMonitor()
+    busqueda.brent("x^3 - 2x - 5", 2, 3, 1e-10, 200, monitor=monitor)
+    assert monitor.converged
+    assert math.isfinite(monitor.iterates[-1])
@@ -0,0 +1,59 @@
+# test_convergence.py
+
+import pytest
+
+from Biseccion import bisection_method
+from convergence import (STOP_CYCLE, STOP_DIVERGENCE, STOP_EXACT, STOP_FAILURE, STOP_METHOD,
+                         STOP_TOLERANCE, ConvergenceMonitor, estimate_order)
+from function_evaluator import compile_value_and_derivative
+from Newton import newton_raphson
+
+
+def newton(func, x0, tol=1e-14):
+    monitor = ConvergenceMonitor()
+    try:
+        newton_raphson(compile_value_and_derivative(func), x0, tol, monitor=monitor)
+    except ValueError:
+        pass
+    return monitor
+
+
+def test_stop_reasons():
+    assert newton("x^3 - 2x + 2", 0.0).reason == STOP_CYCLE
+    assert newton("atan(x)", 1.5).reason == STOP_DIVERGENCE
+    assert newton("x^3 - 2x - 5", 2.0).reason in (STOP_METHOD, STOP_EXACT)
+    assert newton("x^2 - 4", 2.0).reason == STOP_EXACT
+    assert newton("x^2 + 1", 0.0).reason == STOP_FAILURE
+
+
+def test_failures_raise_with_the_reason():
+    with pytest.raises(ValueError, match="ciclo"):
+        newton_raphson(compile_value_and_derivative("x^3 - 2x + 2"), 0.0, 1e-14, monitor=ConvergenceMonitor())
+
+
+def test_linear_convergence_is_not_a_cycle():
+    # Newton en una raíz doble converge linealmente: no debe confundirse con un ciclo
+    monitor = newton("(x - 1)^2", 3.0, 1e-12)
+    assert monitor.converged
+
+
+def test_combined_tolerances():
+    monitor = ConvergenceMonitor(rtol=1e-6, ftol=1e-8, require_all=True)
+    root, iterations, _ = bisection_method("sen(2*x)-log(x)", 1, 2, 1e-15, monitor=monitor)
+    assert monitor.reason == STOP_TOLERANCE
+    assert iterations < 50
+
+
+@pytest.mark.parametrize('order', [1, 2, 3])
+def test_estimate_order(order):
+    # Iterados x_k = e_k con e_{k+1} = 0.5·e_k^q (raíz en 0)
+    iterates = [0.1]
+    while iterates[-1] > 1e-200 and len(iterates) < 40:
+        iterates.append(0.5 * iterates[-1] ** order)
+    estimated, constant = estimate_order(iterates)
+    assert abs(estimated - order) < 0.05
+
+
+def test_estimate_order_needs_three_decreasing_steps():
+    assert estimate_order([1.0, 2.0]) == (None, None)
+    assert estimate_order([1.0, 2.0, 1.0, 2.0]) == (None, None)
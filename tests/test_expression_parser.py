@@ -0,0 +1,32 @@
+# test_expression_parser.py
+
+import math
+
+import pytest
+
+from expression_parser import expression_hash, expression_key, parse_expression
+from function_evaluator import compile_function
+
+EXPRESSIONS = ["sen(2*x)-log(x)", "x^3 - 2x - 5", "exp(-x) - x", "-x^-2 + e^x", "2.5e-3*x^7 - 1",
+               "abs(x)/tan(x) + pi", "raiz(x + 2)", "ln(x) + log10(x) + log2(x)", "3x sin x"]
+
+
+@pytest.mark.parametrize('expression', EXPRESSIONS)
+def test_canonical_key_round_trip(expression):
+    # La clave se vuelve a analizar y da la misma clave y la misma función
+    key = expression_key(expression)
+    assert expression_key(key) == key
+    parse_expression(key)
+    for x in (0.3, 1.7, 2.9):
+        assert math.isclose(compile_function(key)(x), compile_function(expression)(x), rel_tol=1e-12)
+
+
+def test_equivalent_inputs_share_the_key():
+    assert expression_key('2x + sen(x)') == expression_key('sin(x) + 2*x')
+    assert expression_hash('x^2 - 5') == expression_hash('x**2-5')
+    assert expression_key('x^2 - 5') != expression_key('x^2 - 6')
+
+
+def test_invalid_expression_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_expression('x +* 2')
@@ -0,0 +1,42 @@
+# test_fixed_point.py
+
+import math
+
+import pytest
+
+from convergence import ConvergenceMonitor
+
+
+@pytest.mark.parametrize('g, fixed_point', [("cos x", 0.7390851332151607), ("exp(-x)", 0.5671432904097838), ("sqrt(x + 2)", 2.0)])
+def test_steffensen_needs_fewer_evaluations(busqueda, g, fixed_point):
+    plain_root, plain_iterations, plain = busqueda.punto_fijo(g, 1.0, 1e-10, 200)
+    root, iterations, accelerated = busqueda.steffensen(g, 1.0, 1e-10, 200)
+    assert abs(plain_root - fixed_point) < 1e-9 and abs(root - fixed_point) < 1e-9
+    # Dos evaluaciones de g por iteración de Steffensen y una en el método simple
+    assert accelerated[-1]['Evaluaciones'] == 2 * iterations
+    assert plain[-1]['Evaluaciones'] == plain_iterations
+    assert accelerated[-1]['Evaluaciones'] < plain[-1]['Evaluaciones']
+
+
+def test_steffensen_is_quadratic(busqueda):
+    monitor = ConvergenceMonitor()
+    busqueda.steffensen("cos x", 1.0, 1e-12, 100, monitor=monitor)
+    assert abs(monitor.order - 2) < 0.3
+    monitor = ConvergenceMonitor()
+    busqueda.punto_fijo("cos x", 1.0, 1e-12, 200, monitor=monitor)
+    assert abs(monitor.order - 1) < 0.1
+
+
+def test_steffensen_converges_where_plain_iteration_diverges(busqueda):
+    # g'(2) = -3: la iteración simple se aleja del punto fijo x = 2
+    with pytest.raises(ValueError):
+        busqueda.punto_fijo("6 - 2x", 1.9, 1e-10, 100)
+    root, _, _ = busqueda.steffensen("6 - 2x", 1.9, 1e-10, 100)
+    assert math.isclose(root, 2.0)
+
+
+def test_fixed_point_trace_columns(busqueda):
+    _, _, history = busqueda.punto_fijo("cos x", 1.0, 1e-6, 100)
+    first = history[0]
+    assert first['x'] == 1.0 and first['x_next'] == first['g(x)'] == math.cos(1.0)
+    assert first['g(g(x))'] is None
@@ -0,0 +1,77 @@
+# test_function_cache.py
+
+import glob
+import json
+
+import function_cache
+from expression_optimizer import generate_function_source, is_generated_source
+from expression_parser import canonical_expression
+from function_evaluator import generated_source
+
+
+def test_store_and_load_round_trip():
+    function_cache.store('test', ('x^2',), {'source': 'abc'})
+    assert function_cache.load('test', ('x^2',)) == {'source': 'abc'}
+    assert function_cache.load('test', ('x^3',)) is None
+
+
+def test_entries_from_other_parser_version_are_ignored(monkeypatch):
+    function_cache.store('test', ('x^2',), {'source': 'abc'})
+    monkeypatch.setattr(function_cache, '_parser_version', 'otra-version')
+    assert function_cache.load('test', ('x^2',)) is None
+
+
+def test_version_hash_covers_code_generators():
+    for name in ('expression_parser.py', 'expression_optimizer.py', 'expression_derivative.py',
+                 'function_evaluator.py', 'adaptive_precision.py'):
+        assert name in function_cache.SOURCE_MODULES
+
+
+def test_generated_sources_pass_validation():
+    for expression in ["sen(2*x)-log(x)", "-x^-2 + e^x", "abs(x)/tan(x) + pi", "log10(x) + acosh(x + 2)"]:
+        tree = canonical_expression(expression)
+        assert is_generated_source(generate_function_source(tree))
+        assert is_generated_source(generate_function_source([tree, tree]))
+
+
+def test_foreign_code_is_rejected():
+    for source in ["import os\ndef f(x):\n    return x",
+                   "def f(x):\n    return __import__('os').system('id')",
+                   "def f(x):\n    return x.__class__",
+                   "def f(x):\n    _t0 = open\n    return x",
+                   "def f(x, y=1):\n    return x",
+                   "def f(x):\n    return _t0",
+                   "def f(x):\n    return [x]"]:
+        assert not is_generated_source(source)
+
+
+def test_tampered_entry_is_regenerated(isolated_cache):
+    build = lambda: generate_function_source(canonical_expression('x^2 - 2'))
+    original = generated_source('function', 'x^2 - 2', ('x',), build)
+    (path,) = glob.glob(str(isolated_cache / '*.json'))
+    with open(path, encoding='utf-8') as file:
+        entry = json.load(file)
+    entry['data']['source'] = "def f(x):\n    return __import__('os').getpid()"
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(entry, file)
+
+    assert generated_source('function', 'x^2 - 2', ('x',), build) == original
+
+
+def test_store_does_not_rescan_the_directory(monkeypatch):
+    scans = []
+    listdir = function_cache.os.listdir
+    monkeypatch.setattr(function_cache.os, 'listdir', lambda path: scans.append(path) or listdir(path))
+    for i in range(20):
+        function_cache.store('test', (f'x^{i}',), {'source': 'abc'})
+    assert len(scans) == 1
+
+
+def test_store_evicts_when_the_limit_is_crossed(monkeypatch, isolated_cache):
+    function_cache.store('test', ('x^0',), {'source': 'abc'})
+    size = sum(path.stat().st_size for path in isolated_cache.iterdir())
+    monkeypatch.setattr(function_cache, 'MAX_CACHE_BYTES', 3 * size)
+    for i in range(1, 10):
+        function_cache.store('test', (f'x^{i}',), {'source': 'abc'})
+    assert sum(path.stat().st_size for path in isolated_cache.iterdir()) <= 3 * size
+    assert function_cache.load('test', ('x^9',)) == {'source': 'abc'}
@@ -0,0 +1,28 @@
+# test_iteration_trace.py
+
+import math
+
+from iteration_trace import BISECTION_COLUMNS, FIXED_POINT_COLUMNS, IterationTrace, decode_history, encode_trace
+
+
+def test_only_nullable_columns_read_nan_as_none():
+    trace = IterationTrace(BISECTION_COLUMNS)
+    trace.append(1, 700.0, 800.0, 750.0, math.nan, None)
+    row = trace[0]
+    assert row['relative_error'] is None
+    assert math.isnan(row['f(c)'])
+    # La fila se puede mostrar como en insert_iteration_row
+    assert f"{row['f(c)']:.6f}" == "nan"
+
+    trace = IterationTrace(FIXED_POINT_COLUMNS)
+    trace.append(1, 0.5, 0.6, 0.6, None, -0.1, 1)
+    assert trace[0]['g(g(x))'] is None and trace[0]['Evaluaciones'] == 1
+
+
+def test_compact_round_trip_keeps_nan_values():
+    trace = IterationTrace(BISECTION_COLUMNS)
+    trace.append(1, 0.0, 1.0, 0.5, math.nan, None)
+    trace.append(2, 0.5, 1.0, 0.75, 0.25, 33.3)
+    restored = decode_history(encode_trace(trace))
+    assert restored[0]['relative_error'] is None and math.isnan(restored[0]['f(c)'])
+    assert restored[1] == trace[1]
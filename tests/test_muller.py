@@ -0,0 +1,51 @@
+# test_muller.py
+
+import cmath
+
+import numpy as np
+import pytest
+
+from convergence import estimate_order
+from function_evaluator import compile_complex_function, vectorize_complex_function
+
+
+@pytest.mark.parametrize('func, points, root', [
+    ("x^2 + 1", (0, 0.5, 1), 1j),
+    ("exp x + 1", (0, 1, 2), cmath.pi * 1j),
+    ("x^3 - 2x - 5", (1, 2, 3), 2.0945514815423265),
+    ("x^4 + 4", (1 + 1j, 0, 1), 1 + 1j),
+])
+def test_muller_reaches_real_and_complex_roots(busqueda, func, points, root):
+    found, iterations, history = busqueda.muller(func, *points, 1e-12, 100)
+    assert abs(found - root) < 1e-10
+    assert history.columns == busqueda.MULLER_COLUMNS
+    last = history[-1]
+    assert complex(last['Re(x)'], last['Im(x)']) == found
+    assert last['|f(x)|'] < 1e-10
+
+
+def test_muller_is_superlinear(busqueda):
+    _, _, history = busqueda.muller("exp x + 1", 0, 1, 2, 1e-14, 100)
+    iterates = (history.column('Re(x)') + 1j * history.column('Im(x)')).tolist()
+    order, _ = estimate_order(iterates)
+    assert 1.5 < order < 2.2
+
+
+def test_repeated_points_raise(busqueda):
+    with pytest.raises(ValueError):
+        busqueda.muller("x^2 + 1", 1, 1, 2, 1e-12, 100)
+
+
+def test_parse_complex(busqueda):
+    assert busqueda.parse_complex(" 1 + 2i ") == 1 + 2j
+    assert busqueda.parse_complex("-i") == -1j
+    assert busqueda.parse_complex("3") == 3
+    with pytest.raises(ValueError):
+        busqueda.parse_complex("dos")
+
+
+def test_complex_evaluators():
+    assert compile_complex_function("sqrt(x) + ln(x)")(-1) == pytest.approx(1j + cmath.pi * 1j)
+    values = vectorize_complex_function("x^2 + 1")(np.array([[1j, 2], [0, -1j]]))
+    assert values.shape == (2, 2) and np.allclose(values, [[0, 5], [1, 0]])
+    assert vectorize_complex_function("3")(np.zeros(4)).tolist() == [3] * 4
@@ -0,0 +1,30 @@
+# test_newton_deflation.py
+
+import pytest
+
+from function_evaluator import compile_value_and_derivative
+from Newton import deflate, newton_deflation
+
+
+def test_deflation_finds_distinct_roots():
+    roots, history = newton_deflation(compile_value_and_derivative("x^5 - 5x^3 + 4x"), 0.3, 1e-12, 5)
+    assert sorted(round(r, 10) for r in roots) == [-2, -1, 0, 1, 2]
+    assert set(history.column('root_index').tolist()) == {1, 2, 3, 4, 5}
+
+
+def test_deflated_derivative_is_analytic():
+    f_and_prime = compile_value_and_derivative("x^3 - 6x^2 + 11x - 6")
+    value, slope = deflate(f_and_prime, [1.0])(2.5)
+    # f(x)/(x - 1) = x^2 - 5x + 6, con derivada 2x - 5
+    assert value == pytest.approx(2.5 ** 2 - 5 * 2.5 + 6)
+    assert slope == pytest.approx(2 * 2.5 - 5)
+
+
+def test_extraction_stops_when_no_more_roots():
+    roots, _ = newton_deflation(compile_value_and_derivative("x^2 - 2"), 1.0, 1e-12, 5)
+    assert sorted(roots) == pytest.approx([-2 ** 0.5, 2 ** 0.5])
+
+
+def test_first_failure_raises():
+    with pytest.raises(ValueError):
+        newton_deflation(compile_value_and_derivative("x^2 + 1"), 0.5, 1e-12, 2)
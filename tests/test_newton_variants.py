@@ -0,0 +1,53 @@
+# test_newton_variants.py
+
+import math
+
+import pytest
+
+from function_evaluator import compile_value_and_derivative, compile_value_and_derivatives
+from iteration_trace import NEWTON_COLUMNS, IterationTrace
+from Newton import bracket_around, halley_steps, newton_raphson, newton_steps, rtsafe_steps
+from solver_stream import run_steps
+
+ROOT = 2.0945514815423265  # x^3 - 2x - 5
+
+
+def run(steps):
+    history = IterationTrace(NEWTON_COLUMNS)
+    return run_steps(steps, history), history
+
+
+def test_halley_converges_faster_than_newton():
+    halley_root, halley_history = run(halley_steps(compile_value_and_derivatives("x^3 - 2x - 5", 2), 1.0, 1e-14))
+    newton_root, newton_history = run(newton_steps(compile_value_and_derivative("x^3 - 2x - 5"), 1.0, 1e-14))
+    assert abs(halley_root - ROOT) < 1e-14 and abs(newton_root - ROOT) < 1e-14
+    assert len(halley_history) < len(newton_history)
+
+
+@pytest.mark.parametrize('func, x0', [("atan(x)", 1.5), ("x^3 - 2x + 2", 0.0)])
+def test_rtsafe_converges_where_newton_fails(func, x0):
+    f_and_prime = compile_value_and_derivative(func)
+    with pytest.raises(ValueError):
+        newton_raphson(f_and_prime, x0, 1e-12, 100)
+    a, b = bracket_around(f_and_prime, x0)
+    root, history = run(rtsafe_steps(f_and_prime, x0, a, b, 1e-12))
+    assert abs(f_and_prime(root)[0]) < 1e-10
+    # Los iterados nunca salen del intervalo inicial
+    assert all(min(a, b) <= data['x_next'] <= max(a, b) for data in history)
+
+
+def test_rtsafe_requires_a_sign_change():
+    with pytest.raises(ValueError):
+        run(rtsafe_steps(compile_value_and_derivative("x^2 + 1"), 0.5, 0, 1, 1e-12))
+
+
+def test_halley_with_zero_derivative_raises():
+    # f' = f'' = 0 en x = 0: ni el paso de Halley ni el de Newton están definidos
+    with pytest.raises(ValueError):
+        run(halley_steps(compile_value_and_derivatives("x^3 + 1", 2), 0.0, 1e-12))
+
+
+def test_compiled_derivatives_are_memoized():
+    assert compile_value_and_derivatives("x^4 - 3", 2) is compile_value_and_derivatives("x^4 - 3", 2)
+    value, first, second = compile_value_and_derivatives("x^4 - 3", 2)(2.0)
+    assert (value, first, second) == (13.0, 32.0, 48.0)
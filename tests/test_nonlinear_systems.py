@@ -0,0 +1,55 @@
+# test_nonlinear_systems.py
+
+import numpy as np
+import pytest
+
+from nonlinear_systems import SYSTEM_METHODS, compile_system, parse_equation, solve_system
+
+
+@pytest.mark.parametrize('method', SYSTEM_METHODS)
+def test_circle_and_parabola(method):
+    root, iterations, history = solve_system(["x^2 + y^2 = 4", "y = x^2 - 1"], ('x', 'y'), (1, 1), method=method)
+    x, y = root
+    assert abs(x * x + y * y - 4) < 1e-10 and abs(y - (x * x - 1)) < 1e-10
+    assert iterations == len(history)
+    assert history.columns == ('iteration', 'x', 'y', 'residual', 'step')
+    assert history[-1]['residual'] < 1e-10
+
+
+@pytest.mark.parametrize('method', SYSTEM_METHODS)
+def test_tridiagonal_broyden_system(method):
+    n = 20
+    variables = tuple(f"x{i}" for i in range(1, n + 1))
+    equations = []
+    for i, name in enumerate(variables):
+        equation = f"(3 - 2*{name})*{name} + 1"
+        if i > 0:
+            equation += f" - {variables[i - 1]}"
+        if i < n - 1:
+            equation += f" - 2*{variables[i + 1]}"
+        equations.append(equation)
+    root, _, _ = solve_system(equations, variables, [-1.0] * n, method=method)
+    residual, _ = compile_system(tuple(equations), variables)
+    assert np.linalg.norm(residual(root)) < 1e-9
+
+
+def test_jacobian_matches_finite_differences():
+    residual, jacobian = compile_system(("x^2 + y^2 - 4", "exp(x) - y"), ('x', 'y'))
+    point = np.array([0.7, -0.3])
+    h = 1e-6
+    numeric = np.column_stack([(residual(point + h * e) - residual(point - h * e)) / (2 * h) for e in np.eye(2)])
+    assert np.allclose(jacobian(point), numeric, atol=1e-6)
+
+
+def test_invalid_input_raises():
+    with pytest.raises(ValueError):
+        parse_equation("x = y = 1", ('x', 'y'))
+    with pytest.raises(ValueError):
+        solve_system(["x + y"], ('x', 'y'), (0, 0))
+    with pytest.raises(ValueError):
+        solve_system(["x + y", "x - y"], ('x', 'y'), (0,))
+    with pytest.raises(ValueError):
+        solve_system(["x + y", "x - y"], ('x', 'y'), (0, 0), method="Gauss")
+    # Jacobiana singular
+    with pytest.raises(ValueError):
+        solve_system(["x + y - 1", "2x + 2y - 1"], ('x', 'y'), (0, 0))
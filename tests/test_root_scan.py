@@ -0,0 +1,40 @@
+# test_root_scan.py
+
+import pytest
+
+from Biseccion import BiseccionApp
+from function_evaluator import compile_function
+from polynomial_roots import polynomial_brackets
+from root_scan import SEARCH_INITIAL_SAMPLES, find_all_roots, sample_brackets
+
+
+def test_double_root_without_exact_zero_is_kept():
+    func = "(x-1)^2*(x+2)"
+    double = [lo for lo, hi in polynomial_brackets(func, -10, 10) if lo == hi]
+    # El punto del intervalo degenerado no anula f exactamente
+    assert len(double) == 1 and (double[0] - 1) ** 2 * (double[0] + 2) != 0
+
+    roots, histories = find_all_roots(func, -10, 10, 1e-10)
+    assert len(roots) == 2
+    assert abs(roots[0] + 2) < 1e-9 and abs(roots[1] - 1) < 1e-6
+    assert len(histories[1]) == 1
+    row = histories[1][0]
+    assert row['iteration'] == 1 and row['a'] == row['b'] == row['c'] == roots[1]
+    assert row['relative_error'] is None
+
+
+def test_bisection_app_reports_double_root():
+    roots, histories = BiseccionApp.find_all_roots(None, "(x-1)^2*(x+2)", -10, 10, 1e-10)
+    assert len(roots) == 2 and abs(roots[1] - 1) < 1e-6
+    assert [h[-1]['iteration'] for h in histories][1] == 1
+
+
+@pytest.mark.parametrize('func', ["x^5 - x - 1", "x^2 - 5", "x^3 - x"])
+def test_polynomial_search_brackets_are_tight(func):
+    f = compile_function(func)
+    brackets = sample_brackets(func, -10, 10)
+    assert brackets
+    widths = [hi - lo for lo, hi in brackets]
+    assert widths == sorted(widths) and max(widths) <= 20 / SEARCH_INITIAL_SAMPLES
+    for lo, hi in brackets:
+        assert f(lo) * f(hi) < 0
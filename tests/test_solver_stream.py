@@ -0,0 +1,54 @@
+# test_solver_stream.py
+
+import time
+
+import pytest
+
+from Biseccion import bisection_steps
+from convergence import STOP_CANCELLED, ConvergenceMonitor, monitored_steps
+from iteration_trace import BISECTION_COLUMNS, IterationTrace
+from solver_stream import CancellationToken, is_cancelled, run_steps
+
+
+def test_cancelled_generator_returns_none():
+    token = CancellationToken()
+    steps = bisection_steps("x^2 - 2", 0, 2, 1e-15, 100, token=token)
+    first = next(steps)
+    assert first[0] == 1
+    token.cancel()
+    with pytest.raises(StopIteration) as stop:
+        next(steps)
+    assert stop.value.value is None
+
+
+def test_run_steps_reports_cancellation():
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(ValueError, match="cancelado"):
+        run_steps(bisection_steps("x^2 - 2", 0, 2, 1e-15, 100, token=token), IterationTrace(BISECTION_COLUMNS))
+
+
+def test_token_with_timeout_cancels_itself():
+    token = CancellationToken(timeout=0.01)
+    assert not token.cancelled
+    time.sleep(0.02)
+    assert token.cancelled and is_cancelled(token)
+    assert not is_cancelled(None)
+
+
+def test_monitor_records_cancellation():
+    token = CancellationToken()
+    monitor = ConvergenceMonitor()
+    steps = monitored_steps(bisection_steps("x^2 - 2", 0, 2, 1e-15, 100, token=token), monitor, BISECTION_COLUMNS)
+    next(steps)
+    token.cancel()
+    with pytest.raises(StopIteration):
+        next(steps)
+    assert monitor.reason == STOP_CANCELLED
+
+
+def test_streamed_records_match_the_full_run():
+    history = IterationTrace(BISECTION_COLUMNS)
+    root = run_steps(bisection_steps("x^2 - 2", 0, 2, 1e-10, 100), history)
+    assert abs(root - 2 ** 0.5) < 1e-10
+    assert [data['iteration'] for data in history] == list(range(1, len(history) + 1))
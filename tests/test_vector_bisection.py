@@ -0,0 +1,46 @@
+# test_vector_bisection.py
+
+import random
+
+import numpy as np
+import pytest
+
+from Biseccion import bisection_method
+from function_evaluator import compile_function
+from vector_bisection import bisect_lockstep
+
+
+@pytest.mark.parametrize('func', ["sen(2*x)-log(x)", "x^3 - 2x - 5", "exp(-x) - x"])
+@pytest.mark.parametrize('tol', [1e-6, 1e-15])
+def test_lockstep_matches_scalar_bisection(func, tol):
+    f = compile_function(func)
+    rng = random.Random(7)
+    lows, highs = [], []
+    while len(lows) < 200:
+        lo, hi = sorted((rng.uniform(0.05, 4), rng.uniform(0.05, 4)))
+        if f(lo) * f(hi) <= 0:
+            lows.append(lo)
+            highs.append(hi)
+
+    roots, iterations, converged, _ = bisect_lockstep(func, lows, highs, tol)
+    for lo, hi, root, count, ok in zip(lows, highs, roots, iterations, converged):
+        try:
+            expected, expected_count, _ = bisection_method(func, lo, hi, tol)
+        except (ValueError, ArithmeticError):
+            assert not ok
+            continue
+        assert ok
+        assert root == expected and count == expected_count
+
+
+def test_failed_lanes_do_not_stop_the_rest():
+    roots, iterations, converged, histories = bisect_lockstep("x^2 - 2", [0, 2, -3], [2, 3, 0], 1e-12, record_history=True)
+    assert converged.tolist() == [True, False, True]
+    assert np.isnan(roots[1])
+    assert abs(roots[0] - 2 ** 0.5) < 1e-12 and abs(roots[2] + 2 ** 0.5) < 1e-12
+    assert len(histories[0]) == iterations[0]
+
+
+def test_mismatched_endpoints_raise():
+    with pytest.raises(ValueError):
+        bisect_lockstep("x", [0, 1], [1], 1e-6)